@@ -14,6 +14,12 @@ class Settings(BaseSettings):
     # Select backend: 'faster-whisper' (CTranslate2) or 'whisper' (OpenAI PyTorch)
     WHISPER_BACKEND: str = "faster-whisper"
     CHUNK_SECONDS: int = 900
+    # Reuse a source that is already a 16 kHz mono pcm_s16le WAV instead of re-encoding it
+    FFMPEG_SKIP_IF_COMPLIANT: bool = True
+    # Cut the transcription chunks in the same ffmpeg run that writes audio_16k.wav (one decode, no re-read)
+    FFMPEG_FUSED_CHUNKING: bool = False
+    # Pipe yt-dlp straight into ffmpeg so the transcode overlaps the download (no raw.m4a on disk)
+    AUDIO_STREAMING_DOWNLOAD: bool = False
     MAX_PARALLEL_JOBS: int = 1
     ROCM: bool = True
     # Force GPU usage for faster-whisper; if true, we will try GPU backends only and fail otherwise
@@ -69,6 +75,10 @@ class Settings(BaseSettings):
     YTDLP_RETRY_SLEEP: float = 1.0
     # Additional extractor args (space-separated, applied to all clients)
     YTDLP_EXTRA_ARGS: str = ""
+    # Pause before each HTTP request inside one yt-dlp run (--sleep-requests); 0 disables
+    YTDLP_SLEEP_REQUESTS: float = 1.0
+    # Minimum gap between yt-dlp launches from this process (seconds); 0 disables
+    YTDLP_MIN_REQUEST_GAP_S: float = 0.0
 
     # Retry and backoff configuration for YouTube requests
     YTDLP_MAX_RETRY_ATTEMPTS: int = 3  # Maximum retry attempts for transient failures
@@ -77,6 +87,8 @@ class Settings(BaseSettings):
     YTDLP_BACKOFF_JITTER: bool = True  # Add random jitter to backoff delays
     YTDLP_REQUEST_TIMEOUT: float = 120.0  # Timeout per request attempt in seconds
     YTDLP_RATE_LIMIT_COOLDOWN_SECONDS: int = 3600  # Pause YouTube caption ingest after rate-limit detection
+    CAPTION_CACHE_DIR: str = ""  # On-disk cache for downloaded caption payloads; empty disables
+    CAPTION_CACHE_MAX_MB: int = 512  # Size bound for CAPTION_CACHE_DIR (least recently used evicted first)
 
     # Circuit breaker configuration for YouTube requests
     YTDLP_CIRCUIT_BREAKER_ENABLED: bool = True  # Enable circuit breaker
@@ -182,12 +194,24 @@ class Settings(BaseSettings):
     WHISPER_TEMPERATURE: float = 0.0  # Temperature for sampling (0.0-1.0, 0.0 = greedy)
     WHISPER_VAD_FILTER: bool = False  # Voice Activity Detection filter (faster-whisper only)
     WHISPER_WORD_TIMESTAMPS: bool = True  # Extract word-level timestamps
+    WHISPER_BATCH_SIZE: int = 8  # 30s windows decoded per forward pass by transcribe_chunks (faster-whisper only)
+    # Transcribe all chunks of a video in one transcribe_chunks call. The batch is decoded in a single
+    # language, so this only applies when WHISPER_LANGUAGE (or the job's language) is set; otherwise
+    # chunks are still transcribed one at a time with per-chunk language detection.
+    WHISPER_BATCH_CHUNKS: bool = False
+    # PyTorch ('whisper') backend only. Fused flash/memory-efficient SDPA kernels are off by default
+    # because some ROCm drivers fault on them; enable on CUDA hosts for faster attention.
+    WHISPER_TORCH_FUSED_ATTENTION: bool = False
+    WHISPER_TORCH_COMPILE: bool = False  # torch.compile the audio encoder on load (first chunk pays compile cost)
     # Speaker diarization assigns anonymous labels like "Speaker 1"/"Speaker 2".
     # It does not identify real people without a separate voice-enrollment system.
     ENABLE_DIARIZATION: bool = False
     # Run inside transcription worker; false lets separate diarization worker handle it.
     DIARIZATION_INLINE: bool = False
     DIARIZATION_DEVICE: str = "cpu"  # 'cpu', 'cuda', or 'auto'. Separate worker can safely use cuda on GTX 1080.
+    # Autocast pyannote inference to float16 when it runs on CUDA. Leave off on Pascal cards (GTX 1080),
+    # whose float16 throughput is lower than float32.
+    DIARIZATION_FP16: bool = False
     DIARIZATION_MODEL: str = "pyannote/speaker-diarization-community-1"
     DIARIZATION_FALLBACK_MODEL: str = "pyannote/speaker-diarization"
     DIARIZATION_POLL_INTERVAL: int = 10
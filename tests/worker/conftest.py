@@ -1,8 +1,13 @@
 """Pytest configuration for worker tests."""
 
+import gc
 import sys
+import types
+from dataclasses import dataclass
 from unittest.mock import MagicMock, Mock
 
+import pytest
+
 # Mock heavy dependencies for worker unit tests
 # These should be mocked before the modules are imported
 
@@ -26,3 +31,86 @@ sys.modules["faster_whisper"] = Mock()
 sys.modules["whisper"] = Mock()
 sys.modules["pyannote"] = Mock()
 sys.modules["pyannote.audio"] = Mock()
+
+
+@dataclass(slots=True)
+class FakeSegment:
+    """Lightweight stand-in for a faster-whisper ``Segment``."""
+
+    start: float
+    end: float
+    text: str
+    avg_logprob: float
+    temperature: float
+    tokens: tuple
+    no_speech_prob: float | None = None
+
+
+class FakeModel:
+    """Minimal faster-whisper model whose ``transcribe`` returns canned segments."""
+
+    def __init__(self, segments, info=None):
+        self._segments = segments
+        self._info = info if info is not None else object()
+
+    def transcribe(self, *args, **kwargs):
+        return self._segments, self._info
+
+
+class FakeResponse:
+    """Minimal stand-in for the ``urlopen()`` context manager: ``read()`` returns a fixed payload."""
+
+    def __init__(self, payload: bytes, headers: dict | None = None):
+        self.payload = payload
+        self.headers = headers or {}
+
+    def read(self) -> bytes:
+        return self.payload
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def wr_settings(monkeypatch):
+    """Replace ``worker.whisper_runner.settings`` with a plain namespace of defaults."""
+    from worker import whisper_runner
+
+    ns = types.SimpleNamespace(
+        WHISPER_BACKEND="faster-whisper",
+        WHISPER_MODEL="medium",
+        FORCE_GPU=False,
+        GPU_DEVICE_PREFERENCE="cuda",
+        GPU_COMPUTE_TYPES="float16",
+        GPU_MODEL_FALLBACKS="medium",
+        WHISPER_BEAM_SIZE=5,
+        WHISPER_TEMPERATURE=0.0,
+        WHISPER_WORD_TIMESTAMPS=False,
+        WHISPER_LANGUAGE="",
+        WHISPER_VAD_FILTER=False,
+        WHISPER_BATCH_SIZE=8,
+        WHISPER_TORCH_FUSED_ATTENTION=False,
+        WHISPER_TORCH_COMPILE=False,
+    )
+    monkeypatch.setattr(whisper_runner, "settings", ns)
+    return ns
+
+
+@pytest.fixture(scope="session")
+def dummy_wav(tmp_path_factory):
+    """Empty WAV path shared by tests whose model never reads the audio."""
+    path = tmp_path_factory.mktemp("wav") / "test.wav"
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _freeze_gc():
+    """Move objects created by imports and collection out of the cyclic collector's view."""
+    gc.collect()
+    gc.freeze()
+    yield
+    gc.unfreeze()
@@ -1,15 +1,34 @@
 """Tests for worker.audio module."""
 
+import subprocess
+import sys
+import wave
 from pathlib import Path
-from unittest.mock import patch
-
-from worker.audio import Chunk, chunk_audio, download_audio, ensure_wav_16k, get_duration_seconds
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from worker.audio import (
+    _STDERR_TAIL_LINES,
+    Chunk,
+    _pipe_to_wav,
+    _run_ffmpeg,
+    _run_with_stderr_tail,
+    chunk_audio,
+    download_audio,
+    download_audio_many,
+    download_audio_to_wav,
+    ensure_wav_16k,
+    ensure_wav_16k_chunked,
+    get_duration_seconds,
+)
+from worker.youtube_resilience import YouTubeAuthError
 
 
 class TestDownloadAudio:
     """Tests for download_audio function."""
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_download_audio_success(self, mock_run, tmp_path):
         """Test successful audio download."""
         from unittest.mock import MagicMock
@@ -34,7 +53,7 @@ class TestDownloadAudio:
         assert "-f" in first_call_args
         assert "bestaudio" in first_call_args
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_download_audio_command_structure(self, mock_run, tmp_path):
         """Test that download command includes required flags."""
         from unittest.mock import MagicMock
@@ -58,11 +77,200 @@ class TestDownloadAudio:
         assert url in call_args
 
 
+def fake_process(returncode=0, stderr=""):
+    proc = MagicMock(returncode=returncode)
+    proc.stderr.__iter__.return_value = iter(stderr.splitlines(keepends=True))
+    proc.communicate.return_value = (None, stderr)
+    return proc
+
+
+class TestDownloadAudioToWav:
+    """Tests for download_audio_to_wav function."""
+
+    @patch("worker.audio.subprocess.Popen")
+    def test_streams_ytdlp_into_ffmpeg(self, mock_popen, tmp_path):
+        """Test yt-dlp stdout is piped straight into ffmpeg's stdin."""
+        ytdlp, ffmpeg = fake_process(), fake_process()
+        mock_popen.side_effect = [ytdlp, ffmpeg]
+
+        result = download_audio_to_wav("https://www.youtube.com/watch?v=abc", tmp_path)
+
+        assert result == tmp_path / "audio_16k.wav"
+        ytdlp_cmd = mock_popen.call_args_list[0][0][0]
+        assert ytdlp_cmd[0] == "yt-dlp"
+        assert ytdlp_cmd[ytdlp_cmd.index("-o") + 1] == "-"
+        ffmpeg_cmd = mock_popen.call_args_list[1][0][0]
+        assert ffmpeg_cmd[0] == "ffmpeg"
+        assert ffmpeg_cmd[ffmpeg_cmd.index("-i") + 1] == "pipe:0"
+        assert ffmpeg_cmd[-1] == str(tmp_path / "audio_16k.wav")
+        assert mock_popen.call_args_list[1][1]["stdin"] is ytdlp.stdout
+        ytdlp.stdout.close.assert_called_once()
+
+    @patch("worker.audio.ensure_wav_16k")
+    @patch("worker.audio.download_audio")
+    @patch("worker.audio.subprocess.Popen")
+    def test_falls_back_to_two_step_download(self, mock_popen, mock_download, mock_ensure_wav, tmp_path):
+        """Test a failed streaming attempt falls back to download_audio + ensure_wav_16k."""
+        mock_popen.side_effect = [fake_process(returncode=1, stderr="ERROR: pipe unsupported"), fake_process()]
+        mock_download.return_value = tmp_path / "raw.m4a"
+        mock_ensure_wav.return_value = tmp_path / "audio_16k.wav"
+
+        result = download_audio_to_wav("https://www.youtube.com/watch?v=abc", tmp_path)
+
+        assert result == tmp_path / "audio_16k.wav"
+        mock_download.assert_called_once_with("https://www.youtube.com/watch?v=abc", tmp_path)
+        mock_ensure_wav.assert_called_once_with(tmp_path / "raw.m4a")
+
+    @patch("worker.audio.download_audio")
+    @patch("worker.audio.subprocess.Popen")
+    def test_terminal_error_is_raised_without_fallback(self, mock_popen, mock_download, tmp_path):
+        """Test an unavailable video is reported straight away instead of being fetched again."""
+        mock_popen.side_effect = [
+            fake_process(returncode=1, stderr="ERROR: [youtube] abc: Video unavailable"),
+            fake_process(returncode=1, stderr="pipe:0: Invalid data found when processing input"),
+        ]
+
+        with pytest.raises(subprocess.CalledProcessError):
+            download_audio_to_wav("https://www.youtube.com/watch?v=abc", tmp_path)
+
+        mock_download.assert_not_called()
+
+    @patch("worker.audio.download_audio")
+    @patch("worker.audio.subprocess.Popen")
+    def test_auth_error_raises_youtube_auth_error(self, mock_popen, mock_download, tmp_path):
+        """Test a cookie/auth failure while streaming raises YouTubeAuthError without falling back."""
+        mock_popen.side_effect = [
+            fake_process(returncode=1, stderr="ERROR: Sign in to confirm you're not a bot"),
+            fake_process(),
+        ]
+
+        with pytest.raises(YouTubeAuthError):
+            download_audio_to_wav("https://www.youtube.com/watch?v=abc", tmp_path)
+
+        mock_download.assert_not_called()
+
+    @patch("worker.audio.download_audio")
+    @patch("worker.audio.subprocess.Popen")
+    @patch("worker.audio.get_circuit_breaker")
+    def test_open_circuit_breaker_skips_streaming(self, mock_get_breaker, mock_popen, mock_download, tmp_path):
+        """Test an open youtube_download breaker stops the attempt before yt-dlp is launched."""
+        mock_get_breaker.return_value.call.side_effect = RuntimeError("Circuit breaker 'youtube_download' is open")
+
+        with pytest.raises(RuntimeError, match="is open"):
+            download_audio_to_wav("https://www.youtube.com/watch?v=abc", tmp_path)
+
+        mock_get_breaker.assert_called_once_with("youtube_download")
+        mock_popen.assert_not_called()
+        mock_download.assert_not_called()
+
+    @patch("worker.audio.time.monotonic", side_effect=[1000.0, 1100.0])
+    @patch("worker.audio.subprocess.Popen")
+    def test_ytdlp_wait_gets_remaining_time(self, mock_popen, mock_monotonic, tmp_path):
+        """Test yt-dlp is only given what is left of the per-attempt timeout after ffmpeg finishes."""
+        ytdlp, ffmpeg = fake_process(), fake_process()
+        mock_popen.side_effect = [ytdlp, ffmpeg]
+
+        with patch("worker.audio.settings") as mock_settings:
+            mock_settings.YTDLP_REQUEST_TIMEOUT = 120.0
+            _pipe_to_wav(["yt-dlp", "-o", "-", "https://www.youtube.com/watch?v=abc"], tmp_path / "audio_16k.wav")
+
+        ffmpeg.communicate.assert_called_once_with(timeout=120.0)
+        ytdlp.wait.assert_called_once_with(timeout=20.0)
+
+    def test_reports_ffmpeg_error_when_it_exits_first(self, tmp_path):
+        """Test an ffmpeg failure is reported over yt-dlp's broken pipe, with only a tail of yt-dlp stderr."""
+        ytdlp_script = (
+            "import sys\n"
+            f"for i in range({_STDERR_TAIL_LINES * 5}): print(f'progress {{i}}', file=sys.stderr)\n"
+            "try:\n"
+            "    while True: sys.stdout.buffer.write(b'x' * 65536); sys.stdout.flush()\n"
+            "except BrokenPipeError:\n"
+            "    print('ERROR: Broken pipe', file=sys.stderr)\n"
+            "    sys.exit(1)"
+        )
+        ffmpeg_script = (
+            "import sys; sys.stdin.buffer.read(1); print('pipe:0: Invalid data', file=sys.stderr); sys.exit(1)"
+        )
+        real_popen = subprocess.Popen
+
+        def popen(cmd, **kwargs):
+            if cmd[0] == "ffmpeg":
+                cmd = [sys.executable, "-c", ffmpeg_script]
+            return real_popen(cmd, **kwargs)
+
+        with patch("worker.audio.subprocess.Popen", side_effect=popen):
+            with pytest.raises(subprocess.CalledProcessError) as exc_info:
+                _pipe_to_wav([sys.executable, "-c", ytdlp_script], tmp_path / "audio_16k.wav")
+
+        stderr = exc_info.value.stderr
+        assert exc_info.value.cmd[0] == "ffmpeg"
+        assert stderr.startswith("pipe:0: Invalid data")
+        assert "ERROR: Broken pipe" in stderr
+        assert "progress 0\n" not in stderr
+
+
+class TestDownloadAudioMany:
+    """Tests for download_audio_many function."""
+
+    @patch("worker.audio.download_audio")
+    def test_failures_do_not_cancel_other_downloads(self, mock_download, tmp_path):
+        """Test each item gets its own result, in order, with failures returned as exceptions."""
+        error = subprocess.CalledProcessError(1, "yt-dlp", stderr="Error")
+
+        def fake_download(url, dest_dir):
+            if url.endswith("bad"):
+                raise error
+            return dest_dir / "raw.m4a"
+
+        mock_download.side_effect = fake_download
+        items = [(f"https://www.youtube.com/watch?v={vid}", tmp_path / vid) for vid in ("a", "bad", "c")]
+
+        results = download_audio_many(items, max_workers=2)
+
+        assert results == [tmp_path / "a" / "raw.m4a", error, tmp_path / "c" / "raw.m4a"]
+        assert mock_download.call_count == 3
+
+
+class TestRunWithStderrTail:
+    """Tests for _run_with_stderr_tail helper."""
+
+    def test_keeps_only_stderr_tail_on_failure(self):
+        """Test a failing command raises with just the last stderr lines."""
+        script = (
+            "import sys\n"
+            f"for i in range({_STDERR_TAIL_LINES * 5}): print(f'line {{i}}', file=sys.stderr)\n"
+            "sys.exit(3)"
+        )
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            _run_with_stderr_tail([sys.executable, "-c", script], timeout=30)
+
+        lines = exc_info.value.stderr.splitlines()
+        assert exc_info.value.returncode == 3
+        assert len(lines) == _STDERR_TAIL_LINES
+        assert lines[-1] == f"line {_STDERR_TAIL_LINES * 5 - 1}"
+
+    def test_success_returns_completed_process(self):
+        """Test a successful command returns its stderr and discards stdout."""
+        script = "import sys; print('out'); print('warn', file=sys.stderr)"
+
+        result = _run_with_stderr_tail([sys.executable, "-c", script], timeout=30)
+
+        assert result.returncode == 0
+        assert result.stdout == ""
+        assert result.stderr == "warn\n"
+
+    def test_timeout_kills_process(self):
+        """Test the child is killed when the timeout expires."""
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run_with_stderr_tail([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+
+
 class TestEnsureWav16k:
     """Tests for ensure_wav_16k function."""
 
-    @patch("worker.audio.subprocess.check_call")
-    def test_ensure_wav_16k_conversion(self, mock_check_call, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_ensure_wav_16k_conversion(self, mock_ffmpeg, tmp_path):
         """Test successful WAV conversion to 16kHz mono."""
         src = tmp_path / "raw.m4a"
         src.touch()
@@ -74,7 +282,7 @@ class TestEnsureWav16k:
         assert result == expected_wav
 
         # Verify ffmpeg command
-        call_args = mock_check_call.call_args[0][0]
+        call_args = mock_ffmpeg.call_args[0][0]
         assert call_args[0] == "ffmpeg"
         assert "-i" in call_args
         assert str(src) in call_args
@@ -84,21 +292,69 @@ class TestEnsureWav16k:
         assert "16000" in call_args  # 16kHz
         assert str(expected_wav) in call_args
 
-    @patch("worker.audio.subprocess.check_call")
-    def test_ensure_wav_16k_parameters(self, mock_check_call, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_ensure_wav_16k_parameters(self, mock_ffmpeg, tmp_path):
         """Test that conversion includes all required parameters."""
         src = tmp_path / "input.mp3"
         src.touch()
 
         ensure_wav_16k(src)
 
-        call_args = mock_check_call.call_args[0][0]
+        call_args = mock_ffmpeg.call_args[0][0]
         # Check for critical parameters
         assert "-ac" in call_args
         assert "-ar" in call_args
         assert "-c:a" in call_args
         assert "pcm_s16le" in call_args
 
+    @patch("worker.audio._run_ffmpeg")
+    @patch("worker.audio.subprocess.check_output")
+    def test_ensure_wav_16k_links_compliant_wav(self, mock_check_output, mock_ffmpeg, tmp_path):
+        """Test a source that is already 16 kHz mono PCM WAV is linked instead of re-encoded."""
+        src = tmp_path / "input.wav"
+        src.write_bytes(b"RIFF")
+        mock_check_output.return_value = (
+            b'{"streams": [{"codec_name": "pcm_s16le", "sample_rate": "16000", "channels": 1}],'
+            b' "format": {"format_name": "wav"}}'
+        )
+
+        result = ensure_wav_16k(src)
+
+        assert result == tmp_path / "audio_16k.wav"
+        assert result.read_bytes() == b"RIFF"
+        mock_ffmpeg.assert_not_called()
+
+    @patch("worker.audio._run_ffmpeg")
+    @patch("worker.audio.subprocess.check_output")
+    def test_ensure_wav_16k_reencodes_other_wav(self, mock_check_output, mock_ffmpeg, tmp_path):
+        """Test a WAV at another sample rate is still converted, and non-WAV sources are not probed."""
+        src = tmp_path / "input.wav"
+        src.touch()
+        mock_check_output.return_value = (
+            b'{"streams": [{"codec_name": "pcm_s16le", "sample_rate": "44100", "channels": 2}],'
+            b' "format": {"format_name": "wav"}}'
+        )
+
+        ensure_wav_16k(src)
+        ensure_wav_16k(tmp_path / "raw.m4a")
+
+        assert mock_ffmpeg.call_count == 2
+        assert mock_check_output.call_count == 1
+
+
+class TestRunFfmpeg:
+    """Tests for _run_ffmpeg helper."""
+
+    def test_failure_carries_stderr(self):
+        """Test a failing command raises with its stderr and leaves stdout out of it."""
+        script = "import sys; print('progress'); print('Invalid data found', file=sys.stderr); sys.exit(1)"
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            _run_ffmpeg([sys.executable, "-c", script])
+
+        assert exc_info.value.stderr == "Invalid data found\n"
+        assert exc_info.value.stdout is None
+
 
 class TestGetDurationSeconds:
     """Tests for get_duration_seconds function."""
@@ -141,13 +397,91 @@ class TestGetDurationSeconds:
 
         assert duration == 42.5
 
+    @patch("worker.audio.subprocess.check_output")
+    def test_pcm_wav_duration_read_from_header(self, mock_check_output, tmp_path):
+        """Test a PCM WAV's duration comes from its header without running ffprobe."""
+        test_file = tmp_path / "audio_16k.wav"
+        with wave.open(str(test_file), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x00\x00" * 24000)
+
+        assert get_duration_seconds(test_file) == 1.5
+        mock_check_output.assert_not_called()
+
+    @patch("worker.audio.subprocess.check_output")
+    def test_wav_header_overrunning_file_falls_back_to_ffprobe(self, mock_check_output, tmp_path):
+        """Test a header claiming more data than the file holds is not trusted."""
+        test_file = tmp_path / "audio_16k.wav"
+        with wave.open(str(test_file), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x00\x00" * 16000)
+        with test_file.open("r+b") as f:
+            f.truncate(1000)
+        mock_check_output.return_value = b"0.03\n"
+
+        assert get_duration_seconds(test_file) == 0.03
+        mock_check_output.assert_called_once()
+
+    @patch("worker.audio.subprocess.check_output")
+    def test_get_duration_seconds_cached_until_file_changes(self, mock_check_output, tmp_path):
+        """Test repeat calls reuse the probed duration until the file is rewritten."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_bytes(b"a")
+        mock_check_output.return_value = b"12.5\n"
+
+        assert get_duration_seconds(test_file) == 12.5
+        assert get_duration_seconds(test_file) == 12.5
+        assert mock_check_output.call_count == 1
+
+        test_file.write_bytes(b"longer")
+        mock_check_output.return_value = b"30.0\n"
+
+        assert get_duration_seconds(test_file) == 30.0
+        assert mock_check_output.call_count == 2
+
+    @patch("worker.audio.os.setxattr", side_effect=OSError("not supported"))
+    @patch("worker.audio.os.getxattr", side_effect=OSError("not supported"))
+    @patch("worker.audio.subprocess.check_output")
+    def test_get_duration_seconds_sidecar_without_xattrs(self, mock_check_output, _getxattr, _setxattr, tmp_path):
+        """Test the duration falls back to a sidecar file when xattrs are unavailable."""
+        test_file = tmp_path / "test.wav"
+        test_file.write_bytes(b"a")
+        mock_check_output.return_value = b"7.25\n"
+
+        assert get_duration_seconds(test_file) == 7.25
+        assert get_duration_seconds(test_file) == 7.25
+
+        assert mock_check_output.call_count == 1
+        assert (tmp_path / "test.wav.duration").exists()
+
+
+def fake_segmenter(duration, chunk_seconds):
+    """Build a _run_ffmpeg side effect that writes the CSV segment list ffmpeg would produce."""
+
+    def _run(cmd):
+        segment_list = Path(cmd[cmd.index("-segment_list") + 1])
+        lines = []
+        start, idx = 0.0, 0
+        while start < duration:
+            end = min(start + chunk_seconds, duration)
+            lines.append(f"chunk_{idx:04d}.wav,{start:.6f},{end:.6f}\n")
+            start, idx = end, idx + 1
+        segment_list.write_text("".join(lines))
+        return 0
+
+    return _run
+
 
 class TestChunkAudio:
     """Tests for chunk_audio function."""
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_single_no_chunking(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_single_no_chunking(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test audio shorter than chunk size returns single chunk."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
@@ -161,16 +495,17 @@ class TestChunkAudio:
         assert chunks[0].path == wav
         assert chunks[0].offset == 0.0
         # Should not call ffmpeg for splitting
-        mock_check_call.assert_not_called()
+        mock_ffmpeg.assert_not_called()
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_multiple_chunks(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_multiple_chunks(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test audio longer than chunk size gets split."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
         mock_duration.return_value = 1800.0  # 30 minutes
         chunk_seconds = 900  # 15 minutes
+        mock_ffmpeg.side_effect = fake_segmenter(1800.0, chunk_seconds)
 
         chunks = chunk_audio(wav, chunk_seconds)
 
@@ -180,17 +515,18 @@ class TestChunkAudio:
         assert chunks[0].offset == 0.0
         assert chunks[1].path == tmp_path / "chunk_0001.wav"
         assert chunks[1].offset == 900.0
-        # Should call ffmpeg twice
-        assert mock_check_call.call_count == 2
+        # All chunks come from a single ffmpeg pass
+        assert mock_ffmpeg.call_count == 1
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_offset_calculation(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_offset_calculation(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test correct offset calculation for chunks."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
         mock_duration.return_value = 2700.0  # 45 minutes
         chunk_seconds = 900  # 15 minutes
+        mock_ffmpeg.side_effect = fake_segmenter(2700.0, chunk_seconds)
 
         chunks = chunk_audio(wav, chunk_seconds)
 
@@ -201,30 +537,29 @@ class TestChunkAudio:
         assert chunks[2].offset == 1800.0
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_ffmpeg_commands(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_ffmpeg_commands(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test ffmpeg commands for chunking."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
         mock_duration.return_value = 1000.0
         chunk_seconds = 600
+        mock_ffmpeg.side_effect = fake_segmenter(1000.0, chunk_seconds)
 
         chunk_audio(wav, chunk_seconds)
 
-        # Verify ffmpeg was called with correct parameters
-        calls = mock_check_call.call_args_list
-        assert len(calls) == 2
-
-        # First chunk: 0-600s
-        first_call = calls[0][0][0]
-        assert "ffmpeg" in first_call
-        assert "-ss" in first_call
-        assert "-to" in first_call
-        assert str(wav) in first_call
+        # Verify a single segmenting ffmpeg pass with stream copy
+        cmd = mock_ffmpeg.call_args[0][0]
+        assert cmd[0] == "ffmpeg"
+        assert str(wav) in cmd
+        assert cmd[cmd.index("-f") + 1] == "segment"
+        assert cmd[cmd.index("-segment_time") + 1] == "600"
+        assert cmd[cmd.index("-c") + 1] == "copy"
+        assert cmd[-1] == str(tmp_path / "chunk_%04d.wav")
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_boundary_case(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_boundary_case(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test chunking at exact boundary."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
@@ -236,16 +571,17 @@ class TestChunkAudio:
         # Should return single chunk (not > chunk_seconds)
         assert len(chunks) == 1
         assert chunks[0].offset == 0.0
-        mock_check_call.assert_not_called()
+        mock_ffmpeg.assert_not_called()
 
     @patch("worker.audio.get_duration_seconds")
-    @patch("worker.audio.subprocess.check_call")
-    def test_chunk_audio_small_remainder(self, mock_check_call, mock_duration, tmp_path):
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_small_remainder(self, mock_ffmpeg, mock_duration, tmp_path):
         """Test chunking with small remainder."""
         wav = tmp_path / "audio_16k.wav"
         wav.touch()
         mock_duration.return_value = 950.0  # 15:50
         chunk_seconds = 900  # 15:00
+        mock_ffmpeg.side_effect = fake_segmenter(950.0, chunk_seconds)
 
         chunks = chunk_audio(wav, chunk_seconds)
 
@@ -254,6 +590,68 @@ class TestChunkAudio:
         assert chunks[0].offset == 0.0
         assert chunks[1].offset == 900.0
 
+    @patch("worker.audio.get_duration_seconds")
+    @patch("worker.audio._run_ffmpeg")
+    def test_chunk_audio_uses_segment_list_offsets(self, mock_ffmpeg, mock_duration, tmp_path):
+        """Test offsets come from ffmpeg's segment list, and stale chunks and the list are ignored/removed."""
+        wav = tmp_path / "audio_16k.wav"
+        wav.touch()
+        (tmp_path / "chunk_0002.wav").touch()  # left over from an earlier, longer run
+        mock_duration.return_value = 1000.0
+
+        def segment(cmd):
+            # Real cuts land on packet boundaries, slightly after the nominal segment time
+            Path(cmd[cmd.index("-segment_list") + 1]).write_text(
+                "chunk_0000.wav,0.000000,600.032000\nchunk_0001.wav,600.032000,1000.000000\n"
+            )
+
+        mock_ffmpeg.side_effect = segment
+
+        chunks = chunk_audio(wav, 600)
+
+        assert [(c.path.name, c.offset) for c in chunks] == [("chunk_0000.wav", 0.0), ("chunk_0001.wav", 600.032)]
+        assert not (tmp_path / "chunks.csv").exists()
+
+
+class TestEnsureWav16kChunked:
+    """Tests for ensure_wav_16k_chunked function."""
+
+    @patch("worker.audio._run_ffmpeg")
+    def test_one_ffmpeg_run_writes_wav_and_chunks(self, mock_ffmpeg, tmp_path):
+        """Test the WAV and the chunk files come from a single ffmpeg invocation."""
+        src = tmp_path / "raw.m4a"
+        src.touch()
+        mock_ffmpeg.side_effect = fake_segmenter(1800.0, 900)
+
+        wav, chunks = ensure_wav_16k_chunked(src, 900)
+
+        assert wav == tmp_path / "audio_16k.wav"
+        assert chunks == [
+            Chunk(path=tmp_path / "chunk_0000.wav", offset=0.0),
+            Chunk(path=tmp_path / "chunk_0001.wav", offset=900.0),
+        ]
+        mock_ffmpeg.assert_called_once()
+        cmd = mock_ffmpeg.call_args[0][0]
+        assert cmd.count(str(src)) == 1
+        assert str(wav) in cmd
+        assert cmd[-1] == str(tmp_path / "chunk_%04d.wav")
+        assert "copy" not in cmd
+        assert not (tmp_path / "chunks.csv").exists()
+
+    @patch("worker.audio._run_ffmpeg")
+    def test_single_segment_uses_wav_itself(self, mock_ffmpeg, tmp_path):
+        """Test audio that fits in one chunk is transcribed from the WAV, as chunk_audio does."""
+        src = tmp_path / "raw.m4a"
+        src.touch()
+        only_chunk = tmp_path / "chunk_0000.wav"
+        only_chunk.touch()
+        mock_ffmpeg.side_effect = fake_segmenter(600.0, 900)
+
+        wav, chunks = ensure_wav_16k_chunked(src, 900)
+
+        assert chunks == [Chunk(path=wav, offset=0.0)]
+        assert not only_chunk.exists()
+
 
 class TestChunkDataclass:
     """Tests for Chunk dataclass."""
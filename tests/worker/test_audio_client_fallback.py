@@ -5,14 +5,18 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from worker import audio
 from worker.audio import (
     ClientStrategy,
+    _build_base_cmd,
     _build_client_strategies,
     _classify_error,
     _get_user_agent,
+    _parse_extra_args,
     _yt_dlp_cmd,
     download_audio,
 )
+from worker.ytdlp_client_utils import get_client_extractor_args
 
 
 class TestUserAgent:
@@ -117,6 +121,25 @@ class TestBuildClientStrategies:
         strategy = strategies[0]
         assert "youtube:player_client=tv_embedded" in " ".join(strategy.extractor_args)
 
+    @patch.dict("worker.audio._strategies_cache", clear=True)
+    @patch("worker.ytdlp_client_utils.get_client_extractor_args", wraps=get_client_extractor_args)
+    @patch("worker.audio.settings")
+    def test_strategies_built_once_per_configuration(self, mock_settings, mock_extractor_args):
+        """Test strategies are cached per client settings and rebuilt when they change."""
+        mock_settings.YTDLP_CLIENT_ORDER = "ios,android,mweb"
+        mock_settings.YTDLP_CLIENTS_DISABLED = "android"
+
+        first = _build_client_strategies()
+        second = _build_client_strategies()
+
+        assert first == second
+        assert first is not second  # callers get their own list
+        assert mock_extractor_args.call_count == 2
+
+        mock_settings.YTDLP_CLIENTS_DISABLED = ""
+        assert [s.name for s in _build_client_strategies()] == ["ios", "android", "mweb"]
+        assert mock_extractor_args.call_count == 5
+
 
 class TestClassifyError:
     """Tests for _classify_error function."""
@@ -170,6 +193,8 @@ class TestYtDlpCmd:
         """Test basic command structure without strategy."""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
 
         out = tmp_path / "raw.m4a"
         url = "https://www.youtube.com/watch?v=test"
@@ -187,6 +212,8 @@ class TestYtDlpCmd:
         """Test command includes strategy extractor args and headers."""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
 
         strategy = ClientStrategy(
             name="test",
@@ -204,6 +231,27 @@ class TestYtDlpCmd:
         assert "--user-agent" in cmd
         assert "TestAgent" in cmd
 
+    @patch("worker.audio.settings")
+    def test_command_with_strategy_and_po_tokens(self, mock_settings, tmp_path):
+        """Test strategy args come first and PO tokens follow as their own extractor args."""
+        mock_settings.YTDLP_COOKIES_PATH = ""
+        mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+
+        strategy = ClientStrategy(
+            name="ios",
+            extractor_args=["--extractor-args", "youtube:player_client=ios"],
+            headers=[],
+            description="iOS client",
+        )
+
+        url = "https://www.youtube.com/watch?v=test"
+        cmd = _yt_dlp_cmd(tmp_path / "raw.m4a", url, strategy, {"player": "P1", "gvs": "G1"})
+
+        extractor_values = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "--extractor-args"]
+        assert extractor_values == ["youtube:player_client=ios", "youtube:po_token=player:P1;po_token=gvs:G1"]
+        assert cmd[-1] == url
+
     @patch("worker.audio.settings")
     def test_command_with_cookies(self, mock_settings, tmp_path):
         """Test command includes cookies when configured."""
@@ -212,6 +260,8 @@ class TestYtDlpCmd:
 
         mock_settings.YTDLP_COOKIES_PATH = str(cookies_file)
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
 
         out = tmp_path / "raw.m4a"
         url = "https://www.youtube.com/watch?v=test"
@@ -220,11 +270,24 @@ class TestYtDlpCmd:
         assert "--cookies" in cmd
         assert str(cookies_file) in cmd
 
+    @patch("worker.audio.settings")
+    def test_cookies_skipped_when_path_is_not_a_file(self, mock_settings, tmp_path):
+        """Test a missing or directory cookies path is not passed to yt-dlp."""
+        mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        url = "https://www.youtube.com/watch?v=test"
+
+        for cookies_path in (tmp_path / "missing.txt", tmp_path):
+            mock_settings.YTDLP_COOKIES_PATH = str(cookies_path)
+            assert "--cookies" not in _yt_dlp_cmd(tmp_path / "raw.m4a", url)
+
     @patch("worker.audio.settings")
     def test_command_with_extra_args(self, mock_settings, tmp_path):
         """Test command includes extra args from settings."""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = "--proxy http://proxy:8080 --geo-bypass"
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
 
         out = tmp_path / "raw.m4a"
         url = "https://www.youtube.com/watch?v=test"
@@ -234,12 +297,79 @@ class TestYtDlpCmd:
         assert "http://proxy:8080" in cmd
         assert "--geo-bypass" in cmd
 
+    def test_extra_args_parsing(self):
+        """Test extra args honour shell quoting and fall back to whitespace split on bad quoting."""
+        assert _parse_extra_args('--user-agent "Mozilla/5.0 (X11)" --geo-bypass') == (
+            "--user-agent",
+            "Mozilla/5.0 (X11)",
+            "--geo-bypass",
+        )
+        assert _parse_extra_args('--proxy "http://proxy') == ("--proxy", '"http://proxy')
+
+    @patch("worker.audio.settings")
+    def test_sleep_requests_can_be_disabled(self, mock_settings, tmp_path):
+        """Test --sleep-requests follows YTDLP_SLEEP_REQUESTS and is omitted at 0."""
+        mock_settings.YTDLP_COOKIES_PATH = ""
+        mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        url = "https://www.youtube.com/watch?v=test"
+
+        mock_settings.YTDLP_SLEEP_REQUESTS = 0.5
+        cmd = _yt_dlp_cmd(tmp_path / "raw.m4a", url)
+        assert cmd[cmd.index("--sleep-requests") + 1] == "0.5"
+
+        mock_settings.YTDLP_SLEEP_REQUESTS = 0
+        assert "--sleep-requests" not in _yt_dlp_cmd(tmp_path / "raw.m4a", url)
+
+
+class TestPaceRequest:
+    """Tests for _pace_request launch pacing."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        monkeypatch.setattr(audio.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(audio.time, "sleep", sleep)
+        monkeypatch.setattr(audio, "_last_launch_monotonic", float("-inf"))
+        return now, sleeps
+
+    @patch("worker.audio.settings")
+    def test_sleeps_only_remaining_gap(self, mock_settings, clock):
+        """Test launches are spaced by the gap, minus any time already idle."""
+        now, sleeps = clock
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 2.0
+
+        audio._pace_request()
+        now[0] += 0.5
+        audio._pace_request()
+        now[0] += 10.0
+        audio._pace_request()
+
+        assert sleeps == [1.5]
+
+    @patch("worker.audio.settings")
+    def test_disabled_by_default(self, mock_settings, clock):
+        """Test no pacing happens when the gap is 0."""
+        _, sleeps = clock
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+
+        audio._pace_request()
+        audio._pace_request()
+
+        assert sleeps == []
+
 
 class TestDownloadAudio:
     """Tests for download_audio function with client fallback."""
 
     @patch("worker.audio.settings")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_success_on_first_client(self, mock_run, mock_settings, tmp_path):
         """Test successful download on first client attempt."""
         mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios,android,tv"
@@ -248,6 +378,8 @@ class TestDownloadAudio:
         mock_settings.YTDLP_RETRY_SLEEP = 0.1
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
 
         # Mock successful subprocess run
         mock_run.return_value = MagicMock(returncode=0)
@@ -263,7 +395,7 @@ class TestDownloadAudio:
         assert mock_run.call_count == 1
 
     @patch("worker.audio.settings")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_fallback_to_second_client(self, mock_run, mock_settings, tmp_path):
         """Test fallback to second client after first fails."""
         mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios,android"
@@ -272,6 +404,11 @@ class TestDownloadAudio:
         mock_settings.YTDLP_RETRY_SLEEP = 0.1
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        mock_settings.YTDLP_BACKOFF_BASE_DELAY = 0.01
+        mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
+        mock_settings.YTDLP_BACKOFF_JITTER = True
 
         # First client fails, second succeeds
         mock_run.side_effect = [
@@ -290,7 +427,7 @@ class TestDownloadAudio:
         assert mock_run.call_count == 2
 
     @patch("worker.audio.settings")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_all_clients_fail(self, mock_run, mock_settings, tmp_path):
         """Test exception raised when all clients fail."""
         mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios"
@@ -299,6 +436,11 @@ class TestDownloadAudio:
         mock_settings.YTDLP_RETRY_SLEEP = 0.1
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        mock_settings.YTDLP_BACKOFF_BASE_DELAY = 0.01
+        mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
+        mock_settings.YTDLP_BACKOFF_JITTER = True
 
         # All clients fail
         mock_run.side_effect = subprocess.CalledProcessError(1, "yt-dlp", stderr="Error")
@@ -313,8 +455,36 @@ class TestDownloadAudio:
         # Should try both clients once each
         assert mock_run.call_count == 2
 
+    @patch("worker.audio.time.sleep")
+    @patch("worker.audio.settings")
+    @patch("worker.audio._run_with_stderr_tail")
+    def test_backs_off_between_clients(self, mock_run, mock_settings, mock_sleep, tmp_path):
+        """Test an exponentially growing pause before each fallback client, none after the last."""
+        mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios,android"
+        mock_settings.YTDLP_CLIENTS_DISABLED = ""
+        mock_settings.YTDLP_TRIES_PER_CLIENT = 1
+        mock_settings.YTDLP_COOKIES_PATH = ""
+        mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        mock_settings.YTDLP_CIRCUIT_BREAKER_ENABLED = False
+        mock_settings.YTDLP_BACKOFF_BASE_DELAY = 1.0
+        mock_settings.YTDLP_BACKOFF_MAX_DELAY = 60.0
+        mock_settings.YTDLP_BACKOFF_JITTER = False
+
+        mock_run.side_effect = subprocess.CalledProcessError(1, "yt-dlp", stderr="Error")
+
+        dest_dir = tmp_path / "video"
+        dest_dir.mkdir()
+
+        with pytest.raises(subprocess.CalledProcessError):
+            download_audio("https://www.youtube.com/watch?v=test", dest_dir)
+
+        assert mock_run.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
     @patch("worker.audio.settings")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_retry_within_client(self, mock_run, mock_settings, tmp_path):
         """Test retries within same client strategy."""
         mock_settings.YTDLP_CLIENT_ORDER = "web_safari"
@@ -324,6 +494,8 @@ class TestDownloadAudio:
         mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_CIRCUIT_BREAKER_ENABLED = False  # Disable circuit breaker for this test
         mock_settings.YTDLP_REQUEST_TIMEOUT = 30.0
 
@@ -345,7 +517,69 @@ class TestDownloadAudio:
         assert mock_run.call_count == 3
 
     @patch("worker.audio.settings")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
+    def test_base_command_built_once_across_attempts(self, mock_run, mock_settings, tmp_path):
+        """Test invariant yt-dlp arguments are built once and extra args stay before the URL."""
+        mock_settings.YTDLP_CLIENT_ORDER = "web_safari,tv"
+        mock_settings.YTDLP_CLIENTS_DISABLED = ""
+        mock_settings.YTDLP_TRIES_PER_CLIENT = 1
+        mock_settings.YTDLP_BACKOFF_BASE_DELAY = 0.01
+        mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
+        mock_settings.YTDLP_COOKIES_PATH = ""
+        mock_settings.YTDLP_EXTRA_ARGS = "--geo-bypass"
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        mock_settings.YTDLP_CIRCUIT_BREAKER_ENABLED = False
+        mock_settings.YTDLP_REQUEST_TIMEOUT = 30.0
+
+        mock_run.side_effect = [
+            subprocess.CalledProcessError(1, "yt-dlp", stderr="Error"),
+            MagicMock(returncode=0),
+        ]
+
+        url = "https://www.youtube.com/watch?v=test"
+        dest_dir = tmp_path / "video"
+        dest_dir.mkdir()
+
+        with patch("worker.audio._build_base_cmd", wraps=_build_base_cmd) as mock_base:
+            download_audio(url, dest_dir)
+
+        assert mock_base.call_count == 1
+        for call in mock_run.call_args_list:
+            cmd = call.args[0]
+            assert cmd[-2:] == ["--geo-bypass", url]
+
+    @patch("worker.audio.settings")
+    @patch("worker.audio._run_with_stderr_tail")
+    def test_unavailable_video_skips_remaining_clients(self, mock_run, mock_settings, tmp_path):
+        """Test a video-unavailable error stops the fallback instead of trying every client."""
+        mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios,android,tv"
+        mock_settings.YTDLP_CLIENTS_DISABLED = ""
+        mock_settings.YTDLP_TRIES_PER_CLIENT = 2
+        mock_settings.YTDLP_BACKOFF_BASE_DELAY = 0.01
+        mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
+        mock_settings.YTDLP_COOKIES_PATH = ""
+        mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
+        mock_settings.YTDLP_CIRCUIT_BREAKER_ENABLED = False
+        mock_settings.YTDLP_REQUEST_TIMEOUT = 30.0
+
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, "yt-dlp", stderr="ERROR: [youtube] test: Video unavailable. This video has been removed"
+        )
+
+        url = "https://www.youtube.com/watch?v=test"
+        dest_dir = tmp_path / "video"
+        dest_dir.mkdir()
+
+        with pytest.raises(subprocess.CalledProcessError):
+            download_audio(url, dest_dir)
+
+        assert mock_run.call_count == 1
+
+    @patch("worker.audio.settings")
+    @patch("worker.audio._run_with_stderr_tail")
     def test_respects_disabled_clients(self, mock_run, mock_settings, tmp_path):
         """Test that disabled clients are skipped."""
         mock_settings.YTDLP_CLIENT_ORDER = "web_safari,ios,android,tv"
@@ -355,6 +589,8 @@ class TestDownloadAudio:
         mock_settings.YTDLP_BACKOFF_MAX_DELAY = 0.1
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_CIRCUIT_BREAKER_ENABLED = False  # Disable circuit breaker for this test
         mock_settings.YTDLP_REQUEST_TIMEOUT = 30.0
 
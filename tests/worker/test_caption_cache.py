@@ -0,0 +1,88 @@
+"""Tests for worker.caption_cache module."""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import worker.youtube.service  # noqa: F401  # import the package first to avoid a circular import
+from tests.worker.conftest import FakeResponse
+from worker import caption_cache
+from worker.youtube_captions import YouTubeCaptionFetchError, fetch_youtube_auto_captions
+
+_TRACK = {"url": "http://example.com/captions.json3", "language": "en", "kind": "auto", "ext": "json3"}
+_PAYLOAD = json.dumps({"events": [{"tStartMs": 0, "dDurationMs": 1000, "segs": [{"utf8": "Hi"}]}]}).encode()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        caption_cache, "settings", SimpleNamespace(CAPTION_CACHE_DIR=str(tmp_path), CAPTION_CACHE_MAX_MB=1)
+    )
+    return tmp_path
+
+
+def test_disabled_without_cache_dir(monkeypatch):
+    monkeypatch.setattr(caption_cache, "settings", SimpleNamespace(CAPTION_CACHE_DIR="", CAPTION_CACHE_MAX_MB=1))
+
+    caption_cache.put("abc", _TRACK, _PAYLOAD)
+
+    assert caption_cache.get("abc") is None
+
+
+def test_round_trip(cache_dir):
+    caption_cache.put("abc", _TRACK, _PAYLOAD)
+
+    assert caption_cache.get("abc") == (_TRACK, _PAYLOAD)
+    assert caption_cache.get("other") is None
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_corrupt_entry_is_discarded(cache_dir):
+    caption_cache.put("abc", _TRACK, _PAYLOAD)
+    path = next(cache_dir.iterdir())
+    path.write_bytes(b"not json\npayload")
+
+    assert caption_cache.get("abc") is None
+    assert not path.exists()
+
+
+def test_evicts_least_recently_used(cache_dir):
+    big = b"x" * (600 * 1024)
+    caption_cache.put("old", _TRACK, big)
+    old_path = next(cache_dir.iterdir())
+    os.utime(old_path, (0, 0))
+
+    caption_cache.put("new", _TRACK, big)
+
+    assert caption_cache.get("old") is None
+    assert caption_cache.get("new") == (_TRACK, big)
+
+
+@patch("worker.youtube_captions.urlopen")
+@patch("worker.youtube_captions._yt_dlp_json")
+def test_fetch_uses_cache_on_repeat(mock_yt_dlp, mock_urlopen, cache_dir):
+    mock_yt_dlp.return_value = {"automatic_captions": {"en": [{"ext": "json3", "url": _TRACK["url"]}]}}
+    mock_urlopen.return_value = FakeResponse(_PAYLOAD)
+
+    first = fetch_youtube_auto_captions("abc")
+    second = fetch_youtube_auto_captions("abc")
+
+    assert first == second
+    assert [s.text for s in second[1]] == ["Hi"]
+    mock_yt_dlp.assert_called_once()
+    mock_urlopen.assert_called_once()
+
+
+@patch("worker.youtube_captions.urlopen")
+@patch("worker.youtube_captions._yt_dlp_json")
+def test_fetch_does_not_cache_unparseable_payload(mock_yt_dlp, mock_urlopen, cache_dir):
+    mock_yt_dlp.return_value = {"automatic_captions": {"en": [{"ext": "json3", "url": _TRACK["url"]}]}}
+    mock_urlopen.return_value = FakeResponse(b"invalid json")
+
+    with pytest.raises(YouTubeCaptionFetchError):
+        fetch_youtube_auto_captions("abc")
+
+    assert caption_cache.get("abc") is None
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 from app.settings import settings
 from worker.caption_ingest import CaptionIngestionResult, ingest_available_captions
 from worker.youtube.service import YouTubeCaptionResult, YouTubeService
-from worker.youtube_captions import YouTubeCaptionRateLimitError
+from worker.youtube_captions import YouTubeCaptionRateLimitError, YTSegment
 
 
 def test_caption_ingestion_result_dataclass_fields():
@@ -58,7 +58,7 @@ def test_ingest_available_captions_can_use_service_seam(mock_video_repo_cls):
     fake_service = Mock(spec=YouTubeService)
     fake_service.fetch_auto_captions.return_value = YouTubeCaptionResult(
         track=Mock(language="en", kind="auto", url="http://example.com/captions.json3"),
-        segments=[Mock(start=0.0, end=5.0, text="Test caption")],
+        segments=[YTSegment(start_ms=0, end_ms=5000, text="Test caption")],
         source="direct",
     )
 
@@ -1,8 +1,12 @@
 """Tests for worker.diarize module."""
 
+import contextlib
+import wave
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import numpy as np
+
 from worker import diarize
 
 
@@ -219,6 +223,78 @@ class TestDiarizeAndAlign:
         assert result[0]["speaker"] in ["Speaker 1", "Speaker 2"]
 
 
+class TestMatchTurns:
+    """Tests for _match_turns interval lookup."""
+
+    def test_matches_first_running_turn_with_inclusive_bounds(self):
+        """Test each time maps to the earliest-starting turn containing it."""
+        diar_list = [(0.0, 10.0, "A"), (2.0, 4.0, "B"), (12.0, 15.0, "C")]
+
+        result = diarize._match_turns(diar_list, [0.0, 3.0, 10.0, 11.0, 12.0, 15.0, 16.0])
+
+        assert result.tolist() == [0, 0, 0, -1, 2, 2, -1]
+
+    def test_long_earlier_turn_still_matches_after_short_later_turn(self):
+        """Test a time past a short turn's end still finds an earlier turn that covers it."""
+        diar_list = [(0.0, 20.0, "A"), (5.0, 6.0, "B")]
+
+        assert diarize._match_turns(diar_list, [8.0]).tolist() == [0]
+
+    def test_empty_inputs(self):
+        """Test no turns or no times produce no matches."""
+        assert diarize._match_turns([], [1.0, 2.0]).tolist() == [-1, -1]
+        assert diarize._match_turns([(0.0, 1.0, "A")], []).tolist() == []
+
+
+class TestReadPcm16Wav:
+    """Tests for the stdlib WAV fast path used to preload diarization audio."""
+
+    def test_reads_pcm16_as_scaled_float32_channels_first(self, tmp_path):
+        """Test 16-bit PCM decodes to a (channels, samples) float32 array scaled like torchaudio."""
+        path = tmp_path / "audio_16k.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(np.array([0, -32768, 16384, 32767], dtype="<i2").tobytes())
+
+        samples, sample_rate = diarize._read_pcm16_wav(path)
+
+        assert sample_rate == 16000
+        assert samples.dtype == np.float32
+        assert samples.flags["C_CONTIGUOUS"]
+        assert samples.tolist() == [[0.0, 0.5], [-1.0, 32767 / 32768]]
+
+    def test_returns_none_for_other_sample_widths_and_non_wav(self, tmp_path):
+        """Test formats other than 16-bit PCM WAV are left to the torchaudio fallback."""
+        path = tmp_path / "audio_8bit.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(1)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x80\x80")
+        not_wav = tmp_path / "audio.m4a"
+        not_wav.write_bytes(b"not a wav file")
+
+        assert diarize._read_pcm16_wav(path) is None
+        assert diarize._read_pcm16_wav(not_wav) is None
+
+
+class TestInferenceContext:
+    """Tests for the float16 autocast switch around pyannote inference."""
+
+    @patch("worker.diarize.settings")
+    def test_no_autocast_unless_enabled_on_cuda(self, mock_settings, monkeypatch):
+        """Test inference runs without autocast when FP16 is off or the pipeline is not on CUDA."""
+        mock_settings.DIARIZATION_FP16 = False
+        monkeypatch.setattr(diarize, "_pipeline_device", "cuda")
+        assert isinstance(diarize._inference_context(), contextlib.nullcontext)
+
+        mock_settings.DIARIZATION_FP16 = True
+        monkeypatch.setattr(diarize, "_pipeline_device", None)
+        assert isinstance(diarize._inference_context(), contextlib.nullcontext)
+
+
 class TestGetPipeline:
     """Tests for _get_pipeline function."""
 
@@ -11,9 +11,12 @@ Tests cover:
 - Edge cases and multilingual support
 """
 
+import re
+
 import pytest
 
-from worker.formatter import TranscriptFormatter, format_transcript
+from app.settings import settings
+from worker.formatter import TranscriptFormatter, _trie_alternation, format_transcript
 
 
 class TestTextNormalization:
@@ -174,6 +177,31 @@ class TestFillerRemoval:
         assert "well" not in result[0]["text"].lower()
         assert "okay" not in result[0]["text"].lower()
 
+    def test_filler_pattern_compiled_once_per_level(self):
+        """Test the filler pattern is built once and reused across segments."""
+        formatter = TranscriptFormatter(config={"filler_level": 1})
+
+        assert formatter._remove_fillers("um hello") == "hello"
+        pattern = formatter._filler_re_cache[1]
+        assert formatter._remove_fillers("uh there") == "there"
+        assert formatter._filler_re_cache[1] is pattern
+
+        formatter.config["filler_level"] = 2
+        assert formatter._remove_fillers("so like hello") == "hello"
+        assert set(formatter._filler_re_cache) == {1, 2}
+
+    def test_trie_alternation_matches_plain_alternation(self):
+        """Test the prefix-trie pattern matches the same words as a plain longest-first alternation."""
+        words = ["so", "sort of", "soon", "you know", "you see", "um", "uh"]
+        trie = re.compile(r"\b(" + _trie_alternation(words) + r")\b", re.IGNORECASE)
+        plain = re.compile(
+            r"\b(" + "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)) + r")\b", re.IGNORECASE
+        )
+
+        text = "So sort of soon you know, you see um uh sorted sown young"
+        assert trie.findall(text) == plain.findall(text)
+        assert trie.findall(text) == ["So", "sort of", "soon", "you know", "you see", "um", "uh"]
+
     def test_no_filler_removal(self):
         """Test filler removal disabled."""
         config = {
@@ -351,6 +379,19 @@ class TestSegmentation:
         assert "Short Also short" in result[0]["text"]
         assert result[0]["end"] == 1100
 
+    def test_merge_run_of_short_segments(self):
+        """Test a long run of short segments merges until the run reaches the minimum length."""
+        formatter = TranscriptFormatter(config={"min_segment_length_ms": 1000, "max_gap_for_merge_ms": 500})
+
+        segments = [{"text": f"w{i}", "start": i * 300, "end": i * 300 + 250} for i in range(7)]
+        original = [seg.copy() for seg in segments]
+
+        result = formatter._merge_short_segments(segments)
+
+        assert [seg["text"] for seg in result] == ["w0 w1 w2 w3", "w4 w5 w6"]
+        assert [(seg["start"], seg["end"]) for seg in result] == [(0, 1150), (1200, 2050)]
+        assert segments == original
+
     def test_dont_merge_different_speakers(self):
         """Test that segments with different speakers are not merged."""
         config = {
@@ -556,6 +597,17 @@ class TestHallucinationDetection:
 class TestConfigurationToggles:
     """Tests for configuration flag toggling."""
 
+    def test_instances_get_independent_copies_of_default_config(self):
+        """Test overrides on one formatter do not leak into the shared defaults or other formatters."""
+        first = TranscriptFormatter(config={"filler_level": 3})
+        second = TranscriptFormatter()
+
+        first.config["enabled"] = False
+
+        assert second.config["filler_level"] == settings.CLEANUP_FILLER_LEVEL
+        assert second.config["enabled"] == settings.CLEANUP_ENABLED
+        assert TranscriptFormatter().config == second.config
+
     def test_disabled_formatter(self):
         """Test that formatter is no-op when disabled."""
         config = {"enabled": False}
@@ -34,7 +34,7 @@ class TestYtdlpMetrics:
 class TestDownloadAudioObservability:
     """Tests for download_audio observability."""
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio._get_po_tokens")
     def test_download_logs_structured_fields(self, mock_get_tokens, mock_run, tmp_path, caplog):
         """Test that download operations log structured fields."""
@@ -66,7 +66,7 @@ class TestDownloadAudioObservability:
         log_messages = " ".join([r.getMessage() for r in log_records])
         assert "client" in log_messages.lower() or found_structured
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio._get_po_tokens")
     def test_download_increments_metrics_on_success(self, mock_get_tokens, mock_run, tmp_path):
         """Test that successful downloads increment success metrics."""
@@ -96,7 +96,7 @@ class TestDownloadAudioObservability:
         # Verify metrics increased
         assert after_attempts > before_attempts
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio._get_po_tokens")
     def test_download_increments_error_metrics_on_failure(self, mock_get_tokens, mock_run, tmp_path):
         """Test that failed downloads increment failure metrics."""
@@ -115,7 +115,7 @@ class TestDownloadAudioObservability:
 
         # Get metric values before
         before_failures = ytdlp_operation_attempts_total.labels(
-            operation="download", client="web_safari", result="failure"
+            operation="download", client="default", result="failure"
         )._value.get()
 
         # Attempt download (should fail)
@@ -124,13 +124,13 @@ class TestDownloadAudioObservability:
 
         # Get metric values after
         after_failures = ytdlp_operation_attempts_total.labels(
-            operation="download", client="web_safari", result="failure"
+            operation="download", client="default", result="failure"
         )._value.get()
 
         # Verify failure metrics increased
         assert after_failures > before_failures
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio._get_po_tokens")
     def test_download_tracks_token_usage(self, mock_get_tokens, mock_run, tmp_path):
         """Test that token usage is tracked in metrics."""
@@ -259,7 +259,7 @@ class TestTokenRedaction:
         assert "token2" not in redacted
         assert "***REDACTED***" in redacted
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio._get_po_tokens")
     def test_download_logs_do_not_leak_tokens(self, mock_get_tokens, mock_run, tmp_path, caplog):
         """Test that download logs do not contain actual token values."""
@@ -403,6 +403,9 @@ class TestProcessVideo:
         mock_settings.CHUNK_SECONDS = 900
         mock_settings.WHISPER_MODEL = "medium"
         mock_settings.CLEANUP_AFTER_PROCESS = False
+        mock_settings.AUDIO_STREAMING_DOWNLOAD = False
+        mock_settings.WHISPER_BATCH_CHUNKS = False
+        mock_settings.FFMPEG_FUSED_CHUNKING = False
 
         # Mock database queries
         mock_video = {
@@ -482,6 +485,9 @@ class TestProcessVideo:
         mock_settings.CHUNK_SECONDS = 900
         mock_settings.WHISPER_MODEL = "medium"
         mock_settings.CLEANUP_AFTER_PROCESS = False
+        mock_settings.AUDIO_STREAMING_DOWNLOAD = False
+        mock_settings.WHISPER_BATCH_CHUNKS = False
+        mock_settings.FFMPEG_FUSED_CHUNKING = False
         mock_video = {"id": video_id, "youtube_id": "test123", "job_id": job_id}
         mock_conn = Mock()
         mock_conn.execute.return_value.mappings.return_value.first.return_value = mock_video
@@ -571,6 +577,9 @@ class TestTranscriptBlockCrud:
         mock_settings.CHUNK_SECONDS = 900
         mock_settings.WHISPER_MODEL = "medium"
         mock_settings.CLEANUP_AFTER_PROCESS = True
+        mock_settings.AUDIO_STREAMING_DOWNLOAD = False
+        mock_settings.WHISPER_BATCH_CHUNKS = False
+        mock_settings.FFMPEG_FUSED_CHUNKING = False
         mock_settings.CLEANUP_DELETE_RAW = True
         mock_settings.CLEANUP_DELETE_WAV = True
         mock_settings.CLEANUP_DELETE_CHUNKS = True
@@ -640,6 +649,9 @@ class TestTranscriptBlockCrud:
         mock_settings.CHUNK_SECONDS = 900
         mock_settings.WHISPER_MODEL = "medium"
         mock_settings.CLEANUP_AFTER_PROCESS = False
+        mock_settings.AUDIO_STREAMING_DOWNLOAD = False
+        mock_settings.WHISPER_BATCH_CHUNKS = False
+        mock_settings.FFMPEG_FUSED_CHUNKING = False
 
         mock_video = {"id": video_id, "youtube_id": "test123", "job_id": uuid.uuid4()}
 
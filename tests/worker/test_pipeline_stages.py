@@ -126,6 +126,9 @@ class _Settings:
     CLEANUP_DELETE_WAV: bool = False
     CLEANUP_DELETE_RAW: bool = False
     CLEANUP_DELETE_DIR_IF_EMPTY: bool = False
+    AUDIO_STREAMING_DOWNLOAD: bool = False
+    WHISPER_BATCH_CHUNKS: bool = False
+    FFMPEG_FUSED_CHUNKING: bool = False
 
 
 def _mock_engine_with_video(video_row):
@@ -165,6 +168,63 @@ def test_download_and_transcode_stage_updates_video_state(tmp_path: Path):
     assert any("state='transcribing'" in str(call.args[0]) for call in conn.execute.call_args_list)
 
 
+def test_streaming_download_stage_skips_separate_transcode(tmp_path: Path):
+    video_id = uuid.uuid4()
+    job_id = uuid.uuid4()
+    engine, conn = _mock_engine_with_video({"id": video_id, "youtube_id": "abc123", "job_id": job_id})
+    ctx = VideoPipelineContext(engine=engine, video={"id": video_id, "youtube_id": "abc123", "job_id": job_id}, work_dir=tmp_path)
+
+    wav_path = tmp_path / "audio_16k.wav"
+    download_audio_to_wav_mock = Mock(return_value=wav_path)
+    ensure_wav_16k_mock = Mock()
+    deps = NativePipelineDependencies(
+        settings=_Settings(AUDIO_STREAMING_DOWNLOAD=True),
+        logger=Mock(),
+        download_audio=Mock(),
+        ensure_wav_16k=ensure_wav_16k_mock,
+        download_audio_to_wav=download_audio_to_wav_mock,
+    )
+
+    _download_and_transcode(ctx, deps)
+
+    assert ctx.wav_path == wav_path
+    download_audio_to_wav_mock.assert_called_once_with("https://www.youtube.com/watch?v=abc123", tmp_path)
+    ensure_wav_16k_mock.assert_not_called()
+    assert any("state='transcribing'" in str(call.args[0]) for call in conn.execute.call_args_list)
+
+
+def test_fused_chunking_cuts_chunks_during_transcode(tmp_path: Path):
+    video_id = uuid.uuid4()
+    job_id = uuid.uuid4()
+    engine, _ = _mock_engine_with_video({"id": video_id, "youtube_id": "abc123", "job_id": job_id})
+    ctx = VideoPipelineContext(engine=engine, video={"id": video_id, "youtube_id": "abc123", "job_id": job_id}, work_dir=tmp_path)
+
+    raw_path = tmp_path / "raw.m4a"
+    wav_path = tmp_path / "audio_16k.wav"
+    chunks = [Chunk(path=tmp_path / "chunk_0000.wav", offset=0.0), Chunk(path=tmp_path / "chunk_0001.wav", offset=900.0)]
+    ensure_wav_16k_chunked_mock = Mock(return_value=(wav_path, chunks))
+    ensure_wav_16k_mock = Mock()
+    chunk_audio_mock = Mock()
+    deps = NativePipelineDependencies(
+        settings=_Settings(FFMPEG_FUSED_CHUNKING=True),
+        logger=Mock(),
+        download_audio=Mock(return_value=raw_path),
+        ensure_wav_16k=ensure_wav_16k_mock,
+        ensure_wav_16k_chunked=ensure_wav_16k_chunked_mock,
+        chunk_audio=chunk_audio_mock,
+        transcribe_chunk=Mock(return_value=([], None)),
+    )
+
+    _download_and_transcode(ctx, deps)
+    _transcribe_chunks(ctx, deps)
+
+    ensure_wav_16k_chunked_mock.assert_called_once_with(raw_path, 900)
+    ensure_wav_16k_mock.assert_not_called()
+    chunk_audio_mock.assert_not_called()
+    assert ctx.wav_path == wav_path
+    assert ctx.chunks == chunks
+
+
 def test_transcribe_stage_offsets_segments_and_detects_language(tmp_path: Path):
     video_id = uuid.uuid4()
     engine, _ = _mock_engine_with_video({"id": video_id, "youtube_id": "abc123", "job_id": uuid.uuid4()})
@@ -198,6 +258,68 @@ def test_transcribe_stage_offsets_segments_and_detects_language(tmp_path: Path):
     assert transcribe_chunk_mock.call_count == 2
 
 
+def test_transcribe_stage_batches_chunks_when_enabled(tmp_path: Path):
+    ctx = VideoPipelineContext(
+        engine=Mock(),
+        video={"id": uuid.uuid4(), "youtube_id": "abc123", "job_id": uuid.uuid4()},
+        work_dir=tmp_path,
+        wav_path=tmp_path / "audio_16k.wav",
+    )
+    chunks = [Chunk(path=tmp_path / "chunk_0000.wav", offset=0.0), Chunk(path=tmp_path / "chunk_0001.wav", offset=900.0)]
+    transcribe_chunks_mock = Mock(
+        return_value=[
+            ([{"start": 0.0, "end": 1.0, "text": "first"}], {"language": "en", "language_probability": 0.9}),
+            ([{"start": 2.0, "end": 3.0, "text": "second"}], {"language": "en", "language_probability": 0.9}),
+        ]
+    )
+    transcribe_chunk_mock = Mock()
+    deps = NativePipelineDependencies(
+        settings=_Settings(WHISPER_BATCH_CHUNKS=True, WHISPER_LANGUAGE="en"),
+        logger=Mock(),
+        chunk_audio=Mock(return_value=chunks),
+        transcribe_chunk=transcribe_chunk_mock,
+        transcribe_chunks=transcribe_chunks_mock,
+    )
+
+    _transcribe_chunks(ctx, deps)
+
+    transcribe_chunks_mock.assert_called_once()
+    assert transcribe_chunks_mock.call_args.args[0] == [c.path for c in chunks]
+    transcribe_chunk_mock.assert_not_called()
+    assert [s["start"] for s in ctx.all_segments] == [0.0, 902.0]
+    assert ctx.detected_language == "en"
+
+
+def test_transcribe_stage_batch_falls_back_to_per_chunk_without_language(tmp_path: Path):
+    ctx = VideoPipelineContext(
+        engine=Mock(),
+        video={"id": uuid.uuid4(), "youtube_id": "abc123", "job_id": uuid.uuid4()},
+        work_dir=tmp_path,
+        wav_path=tmp_path / "audio_16k.wav",
+    )
+    chunks = [Chunk(path=tmp_path / "chunk_0000.wav", offset=0.0), Chunk(path=tmp_path / "chunk_0001.wav", offset=900.0)]
+    transcribe_chunk_mock = Mock(
+        side_effect=[
+            ([{"start": 0.0, "end": 1.0, "text": "first"}], {"language": "en", "language_probability": 0.9}),
+            ([{"start": 2.0, "end": 3.0, "text": "segundo"}], {"language": "es", "language_probability": 0.8}),
+        ]
+    )
+    transcribe_chunks_mock = Mock()
+    deps = NativePipelineDependencies(
+        settings=_Settings(WHISPER_BATCH_CHUNKS=True),
+        logger=Mock(),
+        chunk_audio=Mock(return_value=chunks),
+        transcribe_chunk=transcribe_chunk_mock,
+        transcribe_chunks=transcribe_chunks_mock,
+    )
+
+    _transcribe_chunks(ctx, deps)
+
+    transcribe_chunks_mock.assert_not_called()
+    assert transcribe_chunk_mock.call_count == 2
+    assert [s["start"] for s in ctx.all_segments] == [0.0, 902.0]
+
+
 def test_persist_stage_finalizes_video_and_refreshes_job(tmp_path: Path):
     video_id = uuid.uuid4()
     job_id = uuid.uuid4()
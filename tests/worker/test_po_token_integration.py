@@ -12,7 +12,7 @@ from worker.po_token_manager import TokenType
 class TestAudioTokenIntegration:
     """Tests for PO token integration in audio downloads."""
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio.get_token_manager")
     @patch("worker.audio.settings")
     def test_audio_download_with_tokens(self, mock_settings, mock_get_manager, mock_run, tmp_path):
@@ -25,6 +25,8 @@ class TestAudioTokenIntegration:
         mock_settings.YTDLP_CLIENTS_DISABLED = ""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_TRIES_PER_CLIENT = 1
 
         # Mock token manager to return tokens
@@ -65,7 +67,7 @@ class TestAudioTokenIntegration:
                     break
         assert found_token_args, "Token args not found in command"
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio.get_token_manager")
     @patch("worker.audio.settings")
     def test_audio_download_without_tokens_when_disabled(self, mock_settings, mock_get_manager, mock_run, tmp_path):
@@ -78,6 +80,8 @@ class TestAudioTokenIntegration:
         mock_settings.YTDLP_CLIENTS_DISABLED = ""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_TRIES_PER_CLIENT = 1
 
         # Mock token manager (should not be called)
@@ -99,7 +103,7 @@ class TestAudioTokenIntegration:
         # Verify token manager was not called
         mock_manager.get_token.assert_not_called()
 
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio.get_token_manager")
     @patch("worker.audio.settings")
     def test_audio_download_marks_token_invalid_on_error(self, mock_settings, mock_get_manager, mock_run, tmp_path):
@@ -112,6 +116,8 @@ class TestAudioTokenIntegration:
         mock_settings.YTDLP_CLIENTS_DISABLED = ""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_TRIES_PER_CLIENT = 1
         mock_settings.YTDLP_RETRY_SLEEP = 0.1
 
@@ -299,7 +305,7 @@ class TestTokenLoggingSafety:
     """Tests to ensure token values are never logged."""
 
     @patch("worker.audio.logger")
-    @patch("worker.audio.subprocess.run")
+    @patch("worker.audio._run_with_stderr_tail")
     @patch("worker.audio.get_token_manager")
     @patch("worker.audio.settings")
     def test_audio_logs_do_not_contain_token_values(
@@ -314,6 +320,8 @@ class TestTokenLoggingSafety:
         mock_settings.YTDLP_CLIENTS_DISABLED = ""
         mock_settings.YTDLP_COOKIES_PATH = ""
         mock_settings.YTDLP_EXTRA_ARGS = ""
+        mock_settings.YTDLP_SLEEP_REQUESTS = 1.0
+        mock_settings.YTDLP_MIN_REQUEST_GAP_S = 0.0
         mock_settings.YTDLP_TRIES_PER_CLIENT = 1
 
         # Mock token manager with sensitive tokens
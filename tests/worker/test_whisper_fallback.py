@@ -10,7 +10,9 @@ Tests cover:
 - Model fallback chain (GPU_MODEL_FALLBACKS)
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
+
+import pytest
 
 from worker import whisper_runner
 
@@ -18,24 +20,21 @@ from worker import whisper_runner
 class TestErrorClassification:
     """Tests for ROCm error pattern detection and classification."""
 
-    def test_detect_memory_access_fault(self):
-        """Test detection of Memory access fault errors."""
-        error_msg = "RuntimeError: Memory access fault by GPU node-1"
-        
-        # Verify this error pattern would trigger fallback
-        assert "Memory access fault" in error_msg
-        
-    def test_detect_hip_error(self):
-        """Test detection of hipError patterns."""
-        error_msg = "RuntimeError: hipErrorLaunchFailure: hipError..."
-        
-        assert "hipError" in error_msg
-        
-    def test_detect_hsa_status_error(self):
-        """Test detection of HSA_STATUS_ERROR patterns."""
-        error_msg = "RuntimeError: HSA_STATUS_ERROR: operation failed"
-        
-        assert "HSA_STATUS_ERROR" in error_msg
+    @pytest.mark.parametrize(
+        "error_msg",
+        [
+            "RuntimeError: Memory access fault by GPU node-1",
+            "RuntimeError: hipErrorLaunchFailure: hipError...",
+            "RuntimeError: HSA_STATUS_ERROR: operation failed",
+        ],
+    )
+    def test_detects_rocm_fault(self, error_msg):
+        """Test that known ROCm fault signatures trigger the CT2 fallback."""
+        assert whisper_runner._ROCM_FAULT_RE.search(error_msg)
+
+    def test_ignores_other_errors(self):
+        """Test that unrelated errors are not treated as ROCm faults."""
+        assert whisper_runner._ROCM_FAULT_RE.search("ValueError: Invalid parameter") is None
 
 
 class TestCT2FallbackLoading:
@@ -65,10 +64,11 @@ class TestCT2FallbackLoading:
     @patch('worker.whisper_runner._try_load_ct2')
     def test_fallback_tries_medium_on_primary_failure(self, mock_load_ct2, mock_lazy):
         """Test fallback to 'medium' model when primary fails."""
-        # First call fails, second succeeds
+        # Quantized and float32 loads of the primary model fail, medium succeeds
         mock_model = MagicMock()
         mock_load_ct2.side_effect = [
             RuntimeError("Primary model load failed"),
+            RuntimeError("Primary model float32 load failed"),
             mock_model,
         ]
         
@@ -81,10 +81,10 @@ class TestCT2FallbackLoading:
             result = whisper_runner._get_ct2_fallback_model()
             
             # Should have tried both models
-            assert mock_load_ct2.call_count == 2
-            # Second call should be medium
-            second_call = mock_load_ct2.call_args_list[1]
-            assert second_call[0][0] == "medium"
+            assert mock_load_ct2.call_count == 3
+            # Last call should be medium
+            last_call = mock_load_ct2.call_args_list[2]
+            assert last_call[0][0] == "medium"
             assert result == mock_model
 
     @patch('worker.whisper_runner._lazy_imports')
@@ -125,168 +125,132 @@ class TestCT2FallbackLoading:
             assert result1 == result2 == mock_model
 
 
-class TestGPUDevicePreference:
-    """Tests for GPU device preference iteration."""
+@pytest.fixture
+def whisper_env():
+    """Patch settings and the CT2 loader for ``_get_model`` load-order tests."""
+    whisper_runner._get_model_cached.cache_clear()
+    with (
+        patch("worker.whisper_runner._lazy_imports"),
+        patch("worker.whisper_runner._try_load_ct2") as mock_load_ct2,
+        patch("worker.whisper_runner.settings") as mock_settings,
+    ):
+        mock_settings.WHISPER_BACKEND = "faster-whisper"
+        yield {"settings": mock_settings, "load_ct2": mock_load_ct2}
+    whisper_runner._get_model_cached.cache_clear()
 
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_iterates_through_device_preferences(self, mock_load_ct2, mock_lazy):
-        """Test that model loading tries devices in preference order."""
-        mock_model = MagicMock()
-        # Fail first two attempts, succeed on third
-        mock_load_ct2.side_effect = [
-            RuntimeError("Device 0 failed"),
-            RuntimeError("Device 1 failed"),
-            mock_model,
-        ]
-        
-        # Reset global state
-        whisper_runner._model = None
-        
-        with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "medium"
-            mock_settings.FORCE_GPU = True
-            mock_settings.GPU_DEVICE_PREFERENCE = "cuda:0,cuda:1,auto"
-            mock_settings.GPU_COMPUTE_TYPES = "float16"
-            mock_settings.GPU_MODEL_FALLBACKS = "medium,small"
-            
-            result = whisper_runner._get_model()
-            
-            # Should have tried devices in order
-            assert mock_load_ct2.call_count == 3
-            calls = mock_load_ct2.call_args_list
-            assert calls[0][1]['device'] == "cuda:0"
-            assert calls[1][1]['device'] == "cuda:1"
-            assert calls[2][1]['device'] == "auto"
-            assert result == mock_model
 
+def _failures(count):
+    return [RuntimeError(f"Simulated failure {i}") for i in range(count)]
 
-class TestComputeTypeFallback:
-    """Tests for compute type fallback behavior."""
 
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_tries_multiple_compute_types(self, mock_load_ct2, mock_lazy):
-        """Test that loading tries multiple compute types."""
-        mock_model = MagicMock()
-        # Fail float16, succeed on int8
-        mock_load_ct2.side_effect = [
-            RuntimeError("float16 failed"),
-            mock_model,
-        ]
-        
-        # Reset global state
-        whisper_runner._model = None
-        
-        with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "small"
-            mock_settings.FORCE_GPU = True
-            mock_settings.GPU_DEVICE_PREFERENCE = "cuda:0"
-            mock_settings.GPU_COMPUTE_TYPES = "float16,int8"
-            mock_settings.GPU_MODEL_FALLBACKS = "small"
-            
-            result = whisper_runner._get_model()
-            
-            # Should have tried both compute types
-            assert mock_load_ct2.call_count == 2
-            calls = mock_load_ct2.call_args_list
-            assert calls[0][1]['compute_type'] == "float16"
-            assert calls[1][1]['compute_type'] == "int8"
-            assert result == mock_model
+class TestModelLoadOrder:
+    """Tests for device preference, compute type and GPU_MODEL_FALLBACKS ordering."""
 
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_float16_to_float32_fallback_no_force_gpu(self, mock_load_ct2, mock_lazy):
-        """Test automatic fallback from float16 to float32 when FORCE_GPU is false."""
+    @pytest.mark.parametrize(
+        "settings_kwargs,failures,expected_calls",
+        [
+            pytest.param(
+                {
+                    "WHISPER_MODEL": "medium",
+                    "FORCE_GPU": True,
+                    "GPU_DEVICE_PREFERENCE": "cuda:0,cuda:1,auto",
+                    "GPU_COMPUTE_TYPES": "float16",
+                    "GPU_MODEL_FALLBACKS": "medium",
+                },
+                2,
+                [
+                    call("medium", device="cuda:0", compute_type="float16"),
+                    call("medium", device="cuda:1", compute_type="float16"),
+                    call("medium", device="auto", compute_type="float16"),
+                ],
+                id="device_preferences",
+            ),
+            pytest.param(
+                {
+                    "WHISPER_MODEL": "small",
+                    "FORCE_GPU": True,
+                    "GPU_DEVICE_PREFERENCE": "cuda:0",
+                    "GPU_COMPUTE_TYPES": "float16,int8",
+                    "GPU_MODEL_FALLBACKS": "small",
+                },
+                1,
+                [
+                    call("small", device="cuda:0", compute_type="float16"),
+                    call("small", device="cuda:0", compute_type="int8"),
+                ],
+                id="multiple_compute_types",
+            ),
+            pytest.param(
+                {"WHISPER_MODEL": "base", "FORCE_GPU": False},
+                1,
+                [
+                    call("base", device="auto", compute_type="float16"),
+                    call("base", device="auto", compute_type="float32"),
+                ],
+                id="float16_to_float32_no_force_gpu",
+            ),
+            pytest.param(
+                {
+                    "WHISPER_MODEL": "large-v3",
+                    "FORCE_GPU": True,
+                    "GPU_DEVICE_PREFERENCE": "cuda:0",
+                    "GPU_COMPUTE_TYPES": "float16",
+                    "GPU_MODEL_FALLBACKS": "large-v2,medium",
+                },
+                2,
+                [
+                    call("large-v3", device="cuda:0", compute_type="float16"),
+                    call("large-v2", device="cuda:0", compute_type="float16"),
+                    call("medium", device="cuda:0", compute_type="float16"),
+                ],
+                id="fallback_models_in_order",
+            ),
+            pytest.param(
+                {
+                    "WHISPER_MODEL": "medium",
+                    "FORCE_GPU": True,
+                    "GPU_DEVICE_PREFERENCE": "cuda:0",
+                    "GPU_COMPUTE_TYPES": "float16",
+                    # Medium is in fallbacks too, but should not be tried twice
+                    "GPU_MODEL_FALLBACKS": "medium,small,base",
+                },
+                0,
+                [call("medium", device="cuda:0", compute_type="float16")],
+                id="primary_model_tried_first",
+            ),
+            pytest.param(
+                {
+                    "WHISPER_MODEL": "large",
+                    "FORCE_GPU": True,
+                    "GPU_DEVICE_PREFERENCE": "cuda:0,cuda:1",
+                    "GPU_COMPUTE_TYPES": "float16,int8",
+                    "GPU_MODEL_FALLBACKS": "medium",
+                },
+                5,
+                # Devices are the outer loop, then models, then compute types; no jitter.
+                [
+                    call("large", device="cuda:0", compute_type="float16"),
+                    call("large", device="cuda:0", compute_type="int8"),
+                    call("medium", device="cuda:0", compute_type="float16"),
+                    call("medium", device="cuda:0", compute_type="int8"),
+                    call("large", device="cuda:1", compute_type="float16"),
+                    call("large", device="cuda:1", compute_type="int8"),
+                ],
+                id="deterministic_order",
+            ),
+        ],
+    )
+    def test_load_order(self, whisper_env, settings_kwargs, failures, expected_calls):
+        """Test that model loading walks the configured fallbacks in a fixed order."""
+        for name, value in settings_kwargs.items():
+            setattr(whisper_env["settings"], name, value)
         mock_model = MagicMock()
-        # First call (float16) fails, second (float32) succeeds
-        mock_load_ct2.side_effect = [
-            RuntimeError("float16 not supported"),
-            mock_model,
-        ]
-        
-        # Reset global state
-        whisper_runner._model = None
-        
-        with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "base"
-            mock_settings.FORCE_GPU = False
-            
-            result = whisper_runner._get_model()
-            
-            # Should have tried float16 first, then float32
-            assert mock_load_ct2.call_count == 2
-            calls = mock_load_ct2.call_args_list
-            assert calls[0][1]['compute_type'] == "float16"
-            assert calls[1][1]['compute_type'] == "float32"
-            assert result == mock_model
+        whisper_env["load_ct2"].side_effect = [*_failures(failures), mock_model]
 
+        result = whisper_runner._get_model()
 
-class TestModelFallbackChain:
-    """Tests for GPU_MODEL_FALLBACKS behavior."""
-
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_tries_fallback_models_in_order(self, mock_load_ct2, mock_lazy):
-        """Test that fallback models are tried in configured order."""
-        mock_model = MagicMock()
-        # Fail primary and first fallback, succeed on second fallback
-        mock_load_ct2.side_effect = [
-            RuntimeError("large-v3 failed"),
-            RuntimeError("large-v2 failed"),
-            mock_model,
-        ]
-        
-        # Reset global state
-        whisper_runner._model = None
-        
-        with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "large-v3"
-            mock_settings.FORCE_GPU = True
-            mock_settings.GPU_DEVICE_PREFERENCE = "cuda:0"
-            mock_settings.GPU_COMPUTE_TYPES = "float16"
-            mock_settings.GPU_MODEL_FALLBACKS = "large-v2,medium"
-            
-            result = whisper_runner._get_model()
-            
-            # Should have tried models in order
-            assert mock_load_ct2.call_count == 3
-            calls = mock_load_ct2.call_args_list
-            # Primary model is always tried first
-            assert calls[0][0][0] == "large-v3"
-            assert calls[1][0][0] == "large-v2"
-            assert calls[2][0][0] == "medium"
-            assert result == mock_model
-
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_primary_model_tried_first_even_if_in_fallbacks(self, mock_load_ct2, mock_lazy):
-        """Test that primary model is always tried first, even if listed in fallbacks."""
-        mock_model = MagicMock()
-        mock_load_ct2.return_value = mock_model
-        
-        # Reset global state
-        whisper_runner._model = None
-        
-        with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "medium"
-            mock_settings.FORCE_GPU = True
-            mock_settings.GPU_DEVICE_PREFERENCE = "cuda:0"
-            mock_settings.GPU_COMPUTE_TYPES = "float16"
-            # Medium is in fallbacks too, but should not be tried twice
-            mock_settings.GPU_MODEL_FALLBACKS = "medium,small,base"
-            
-            result = whisper_runner._get_model()
-            
-            # Should only be called once (medium succeeds on first try)
-            assert mock_load_ct2.call_count == 1
-            assert mock_load_ct2.call_args_list[0][0][0] == "medium"
-            assert result == mock_model
+        assert whisper_env["load_ct2"].call_args_list == expected_calls
+        assert result is mock_model
 
 
 class TestPyTorchROCmFallback:
@@ -325,6 +289,8 @@ class TestPyTorchROCmFallback:
             mock_settings.WHISPER_TEMPERATURE = 0.0
             mock_settings.WHISPER_WORD_TIMESTAMPS = False
             mock_settings.WHISPER_LANGUAGE = None
+            mock_settings.WHISPER_TORCH_FUSED_ATTENTION = False
+            mock_settings.WHISPER_TORCH_COMPILE = False
             
             # Call transcribe_chunk
             segments, lang_info = whisper_runner.transcribe_chunk("/tmp/test.wav")
@@ -359,6 +325,8 @@ class TestPyTorchROCmFallback:
             mock_settings.WHISPER_TEMPERATURE = 0.0
             mock_settings.WHISPER_WORD_TIMESTAMPS = False
             mock_settings.WHISPER_LANGUAGE = None
+            mock_settings.WHISPER_TORCH_FUSED_ATTENTION = False
+            mock_settings.WHISPER_TORCH_COMPILE = False
             
             whisper_runner.transcribe_chunk("/tmp/test.wav")
             
@@ -378,57 +346,32 @@ class TestPyTorchROCmFallback:
             mock_settings.WHISPER_TEMPERATURE = 0.0
             mock_settings.WHISPER_WORD_TIMESTAMPS = False
             mock_settings.WHISPER_LANGUAGE = None
+            mock_settings.WHISPER_TORCH_FUSED_ATTENTION = False
+            mock_settings.WHISPER_TORCH_COMPILE = False
             
             # Should raise ValueError, not trigger fallback
             with pytest.raises(ValueError, match="Invalid parameter"):
                 whisper_runner.transcribe_chunk("/tmp/test.wav")
 
+    @patch('worker.whisper_runner._sdp_context')
+    @patch('worker.whisper_runner._get_model')
+    def test_fused_attention_flag_selects_fused_sdp_context(self, mock_get_model, mock_sdp_context):
+        """Test WHISPER_TORCH_FUSED_ATTENTION=True asks for the fused SDPA kernels."""
+        mock_pytorch_model = MagicMock()
+        mock_pytorch_model.transcribe.return_value = {"language": "en", "segments": []}
+        mock_get_model.return_value = mock_pytorch_model
 
-class TestDeterministicBehavior:
-    """Tests for deterministic behavior of fallback mechanisms."""
-
-    @patch('worker.whisper_runner._lazy_imports')
-    @patch('worker.whisper_runner._try_load_ct2')
-    def test_fallback_order_is_deterministic(self, mock_load_ct2, mock_lazy):
-        """Test that fallback attempts are deterministic (no random jitter)."""
-        call_order = []
-        
-        def track_calls(model, device, compute_type):
-            call_order.append((model, device, compute_type))
-            if len(call_order) < 6:
-                raise RuntimeError("Simulated failure")
-            return MagicMock()
-        
-        mock_load_ct2.side_effect = track_calls
-        
-        # Reset global state
-        whisper_runner._model = None
-        
         with patch('worker.whisper_runner.settings') as mock_settings:
-            mock_settings.WHISPER_BACKEND = "faster-whisper"
-            mock_settings.WHISPER_MODEL = "large"
-            mock_settings.FORCE_GPU = True
-            mock_settings.GPU_DEVICE_PREFERENCE = "cuda:0,cuda:1"
-            mock_settings.GPU_COMPUTE_TYPES = "float16,int8"
-            mock_settings.GPU_MODEL_FALLBACKS = "medium"
-            
-            whisper_runner._get_model()
-            
-            # Verify deterministic order:
-            # 1. large, cuda:0, float16
-            # 2. large, cuda:0, int8
-            # 3. large, cuda:1, float16
-            # 4. large, cuda:1, int8
-            # 5. medium, cuda:0, float16
-            # 6. medium, cuda:0, int8 (succeeds)
-            
-            expected = [
-                ("large", "cuda:0", "float16"),
-                ("large", "cuda:0", "int8"),
-                ("large", "cuda:1", "float16"),
-                ("large", "cuda:1", "int8"),
-                ("medium", "cuda:0", "float16"),
-                ("medium", "cuda:0", "int8"),
-            ]
-            
-            assert call_order == expected
+            mock_settings.WHISPER_BACKEND = "whisper"
+            mock_settings.WHISPER_BEAM_SIZE = 5
+            mock_settings.WHISPER_TEMPERATURE = 0.0
+            mock_settings.WHISPER_WORD_TIMESTAMPS = False
+            mock_settings.WHISPER_LANGUAGE = None
+            mock_settings.WHISPER_TORCH_FUSED_ATTENTION = True
+            mock_settings.WHISPER_TORCH_COMPILE = False
+
+            whisper_runner.transcribe_chunk("/tmp/test.wav")
+
+        mock_sdp_context.assert_called_once_with(True)
+        mock_sdp_context.return_value.assert_called_once()
+        mock_pytorch_model.transcribe.assert_called_once()
@@ -1,118 +1,67 @@
 """Tests for worker.whisper_runner module."""
 
-from unittest.mock import Mock, patch
+import sys
+from unittest.mock import Mock, call, patch
 
+import numpy as np
 import pytest
 
+from tests.worker.conftest import FakeModel, FakeSegment
 from worker import whisper_runner
 
+# Stand-in for faster-whisper's TranscriptionInfo; the runner reads its language fields via getattr defaults
+_INFO = object()
+
+SEGMENT_FIELDS = {"start", "end", "text", "avg_logprob", "temperature", "token_count", "confidence"}
+
+# (case id, [(start, end, raw text, expected text, no_speech_prob), ...])
+FASTER_WHISPER_CASES = [
+    ("single", [(0.0, 5.0, " Hello world", "Hello world", 0.01)]),
+    ("multi", [(i * 5.0, (i + 1) * 5.0, f" Segment {i}", f"Segment {i}", 0.02) for i in range(3)]),
+    ("strip", [(0.0, 5.0, "  Text with spaces  ", "Text with spaces", None)]),
+    # faster-whisper's usual single leading space, plus edge cases a prefix-slice shortcut would miss
+    (
+        "strip_edges",
+        [
+            (0.0, 1.0, " Leading space only", "Leading space only", None),
+            (1.0, 2.0, " Trailing newline\n", "Trailing newline", None),
+            (2.0, 3.0, "No leading space", "No leading space", None),
+            (3.0, 4.0, " ", "", None),
+        ],
+    ),
+    ("fields", [(10.5, 15.25, " Test", "Test", 0.05)]),
+]
+
 
 class TestTranscribeChunkFasterWhisper:
     """Tests for transcribe_chunk with faster-whisper backend."""
 
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_faster_whisper_success(self, mock_settings, mock_get_model, tmp_path):
-        """Test successful transcription with faster-whisper."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-
-        # Create mock model and segments
-        mock_segment = Mock()
-        mock_segment.start = 0.0
-        mock_segment.end = 5.0
-        mock_segment.text = " Hello world"
-        mock_segment.avg_logprob = -0.5
-        mock_segment.temperature = 0.0
-        mock_segment.tokens = [1, 2, 3, 4]
-        mock_segment.no_speech_prob = 0.01
-
-        mock_model = Mock()
-        mock_model.transcribe.return_value = ([mock_segment], Mock())
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
-
-        result = whisper_runner.transcribe_chunk(wav_path)
-
-        assert len(result) == 1
-        assert result[0]["start"] == 0.0
-        assert result[0]["end"] == 5.0
-        assert result[0]["text"] == "Hello world"
-        assert result[0]["avg_logprob"] == -0.5
-        assert result[0]["temperature"] == 0.0
-        assert result[0]["token_count"] == 4
-        assert result[0]["confidence"] == 0.01
-
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_faster_whisper_multiple_segments(self, mock_settings, mock_get_model, tmp_path):
-        """Test transcription with multiple segments."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-
-        # Create multiple mock segments
-        segments = []
-        for i in range(3):
-            seg = Mock()
-            seg.start = float(i * 5)
-            seg.end = float((i + 1) * 5)
-            seg.text = f" Segment {i}"
-            seg.avg_logprob = -0.3
-            seg.temperature = 0.0
-            seg.tokens = [1, 2]
-            seg.no_speech_prob = 0.02
-            segments.append(seg)
-
-        mock_model = Mock()
-        mock_model.transcribe.return_value = (segments, Mock())
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
-
-        result = whisper_runner.transcribe_chunk(wav_path)
-
-        assert len(result) == 3
-        for i, seg in enumerate(result):
-            assert seg["text"] == f"Segment {i}"
-            assert seg["start"] == i * 5
-            assert seg["end"] == (i + 1) * 5
-
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_faster_whisper_strips_whitespace(self, mock_settings, mock_get_model, tmp_path):
-        """Test that text is stripped of leading/trailing whitespace."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-
-        mock_segment = Mock()
-        mock_segment.start = 0.0
-        mock_segment.end = 5.0
-        mock_segment.text = "  Text with spaces  "
-        mock_segment.avg_logprob = -0.5
-        mock_segment.temperature = 0.0
-        mock_segment.tokens = [1, 2]
-        mock_segment.no_speech_prob = None
-
-        mock_model = Mock()
-        mock_model.transcribe.return_value = ([mock_segment], Mock())
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
+    @pytest.mark.parametrize("name,rows", FASTER_WHISPER_CASES, ids=[case[0] for case in FASTER_WHISPER_CASES])
+    def test_transcribe_chunk_faster_whisper(self, wr_settings, monkeypatch, dummy_wav, name, rows):
+        """Test faster-whisper segments are converted to the segment schema."""
+        segments = [FakeSegment(start, end, text, -0.5, 0.0, (1, 2, 3, 4), prob) for start, end, text, _, prob in rows]
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: FakeModel(segments, _INFO))
 
-        result = whisper_runner.transcribe_chunk(wav_path)
+        result, _ = whisper_runner.transcribe_chunk(dummy_wav)
 
-        assert result[0]["text"] == "Text with spaces"
+        assert len(result) == len(rows)
+        for seg, (start, end, _, expected_text, prob) in zip(result, rows, strict=True):
+            assert set(seg) == SEGMENT_FIELDS
+            assert seg["start"] == start
+            assert seg["end"] == end
+            assert seg["text"] == expected_text
+            assert seg["avg_logprob"] == -0.5
+            assert seg["temperature"] == 0.0
+            assert seg["token_count"] == 4
+            assert seg["confidence"] == prob
 
 
 class TestTranscribeChunkPyTorch:
     """Tests for transcribe_chunk with PyTorch whisper backend."""
 
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_pytorch_success(self, mock_settings, mock_get_model, tmp_path):
+    def test_transcribe_chunk_pytorch_success(self, wr_settings, monkeypatch, dummy_wav):
         """Test successful transcription with PyTorch whisper."""
-        mock_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_BACKEND = "whisper"
 
         mock_model = Mock()
         mock_model.transcribe.return_value = {
@@ -127,12 +76,9 @@ class TestTranscribeChunkPyTorch:
                 }
             ]
         }
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: mock_model)
 
-        result = whisper_runner.transcribe_chunk(wav_path)
+        result, _ = whisper_runner.transcribe_chunk(dummy_wav)
 
         assert len(result) == 1
         assert result[0]["start"] == 0.0
@@ -142,154 +88,129 @@ class TestTranscribeChunkPyTorch:
         assert result[0]["token_count"] == 3
         assert result[0]["confidence"] is None  # PyTorch doesn't provide confidence
 
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_pytorch_sdp_context(self, mock_settings, mock_get_model, tmp_path):
-        """Test PyTorch transcription uses SDP kernel context."""
-        mock_settings.WHISPER_BACKEND = "whisper"
+    @pytest.mark.parametrize(
+        "fused,backend_names",
+        [(False, ["MATH"]), (True, ["FLASH_ATTENTION", "EFFICIENT_ATTENTION", "MATH"])],
+        ids=["math_only", "fused"],
+    )
+    def test_transcribe_chunk_pytorch_sdp_context(self, wr_settings, monkeypatch, dummy_wav, fused, backend_names):
+        """Test PyTorch transcription runs inside the configured SDP kernel context."""
+        wr_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_TORCH_FUSED_ATTENTION = fused
+        attention = sys.modules["torch.nn.attention"]
+        attention.sdpa_kernel.reset_mock()
 
         mock_model = Mock()
         mock_model.transcribe.return_value = {"segments": []}
-        mock_get_model.return_value = mock_model
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: mock_model)
 
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
-
-        whisper_runner.transcribe_chunk(wav_path)
+        whisper_runner.transcribe_chunk(dummy_wav)
 
         # Verify transcribe was called with fp16=False
         call_kwargs = mock_model.transcribe.call_args[1]
         assert call_kwargs.get("fp16") is False
+        attention.sdpa_kernel.assert_called_once_with([getattr(attention.SDPBackend, n) for n in backend_names])
+        attention.sdpa_kernel.return_value.__enter__.assert_called_once()
 
-    @patch("worker.whisper_runner._get_ct2_fallback_model")
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_pytorch_rocm_fault_fallback(
-        self, mock_settings, mock_get_model, mock_ct2_fallback, tmp_path
-    ):
+    def test_transcribe_chunk_pytorch_rocm_fault_fallback(self, wr_settings, monkeypatch, dummy_wav):
         """Test fallback to CT2 on ROCm memory fault."""
-        mock_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_BACKEND = "whisper"
 
         # Simulate ROCm fault
         mock_model = Mock()
         mock_model.transcribe.side_effect = RuntimeError("Memory access fault by GPU node")
-        mock_get_model.return_value = mock_model
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: mock_model)
 
         # Setup CT2 fallback
-        mock_segment = Mock()
-        mock_segment.start = 0.0
-        mock_segment.end = 5.0
-        mock_segment.text = " Fallback text"
-        mock_segment.avg_logprob = -0.3
-        mock_segment.temperature = 0.0
-        mock_segment.tokens = [1, 2]
-
-        mock_ct2 = Mock()
-        mock_ct2.transcribe.return_value = ([mock_segment], Mock())
-        mock_ct2_fallback.return_value = mock_ct2
+        segment = FakeSegment(0.0, 5.0, " Fallback text", -0.3, 0.0, (1, 2))
+        mock_ct2_fallback = Mock(return_value=FakeModel([segment], _INFO))
+        monkeypatch.setattr(whisper_runner, "_get_ct2_fallback_model", mock_ct2_fallback)
 
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
-
-        result = whisper_runner.transcribe_chunk(wav_path)
+        result, _ = whisper_runner.transcribe_chunk(dummy_wav)
 
         # Should have fallen back to CT2
         assert len(result) == 1
         assert result[0]["text"] == "Fallback text"
         mock_ct2_fallback.assert_called_once()
 
-    @patch("worker.whisper_runner._get_ct2_fallback_model")
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_pytorch_hip_error_fallback(
-        self, mock_settings, mock_get_model, mock_ct2_fallback, tmp_path
-    ):
+    def test_transcribe_chunk_pytorch_hip_error_fallback(self, wr_settings, monkeypatch, dummy_wav):
         """Test fallback to CT2 on hipError."""
-        mock_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_BACKEND = "whisper"
 
         mock_model = Mock()
         mock_model.transcribe.side_effect = RuntimeError("hipErrorInvalidValue")
-        mock_get_model.return_value = mock_model
-
-        mock_segment = Mock()
-        mock_segment.start = 0.0
-        mock_segment.end = 5.0
-        mock_segment.text = " HIP fallback"
-        mock_segment.avg_logprob = -0.3
-        mock_segment.temperature = 0.0
-        mock_segment.tokens = [1]
-
-        mock_ct2 = Mock()
-        mock_ct2.transcribe.return_value = ([mock_segment], Mock())
-        mock_ct2_fallback.return_value = mock_ct2
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: mock_model)
 
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
+        segment = FakeSegment(0.0, 5.0, " HIP fallback", -0.3, 0.0, (1,))
+        monkeypatch.setattr(whisper_runner, "_get_ct2_fallback_model", lambda: FakeModel([segment], _INFO))
 
-        result = whisper_runner.transcribe_chunk(wav_path)
+        result, _ = whisper_runner.transcribe_chunk(dummy_wav)
 
         assert len(result) == 1
         assert result[0]["text"] == "HIP fallback"
 
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_transcribe_chunk_pytorch_non_rocm_error_raises(self, mock_settings, mock_get_model, tmp_path):
+    def test_transcribe_chunk_pytorch_non_rocm_error_raises(self, wr_settings, monkeypatch, dummy_wav):
         """Test non-ROCm errors are re-raised."""
-        mock_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_BACKEND = "whisper"
 
         mock_model = Mock()
         mock_model.transcribe.side_effect = RuntimeError("Some other error")
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: mock_model)
 
         with pytest.raises(RuntimeError, match="Some other error"):
-            whisper_runner.transcribe_chunk(wav_path)
+            whisper_runner.transcribe_chunk(dummy_wav)
 
 
-class TestSegmentFormatting:
-    """Tests for segment output schema validation."""
+class TestTranscribeChunksBatched:
+    """Tests for batched multi-chunk transcription."""
 
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_segment_formatting_all_fields(self, mock_settings, mock_get_model, tmp_path):
-        """Test segment includes all expected fields."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
+    @pytest.mark.parametrize("batch", [1, 4, 8])
+    def test_transcribe_chunks_single_batched_call(self, wr_settings, monkeypatch, batch):
+        """Test N chunks are decoded by one batched pipeline call and split back per chunk."""
+        chunk_seconds = 40
+        paths = [f"chunk_{i}.wav" for i in range(batch)]
+        # One segment per chunk, timed on the concatenated timeline
+        segments = [
+            FakeSegment(i * chunk_seconds + 1.0, i * chunk_seconds + 3.0, f" Chunk {i}", -0.2, 0.0, (1, 2), 0.01)
+            for i in range(batch)
+        ]
+        pipeline = Mock(wraps=FakeModel(segments, Mock(language="en", language_probability=0.9)))
+        audio = np.zeros(chunk_seconds * whisper_runner.SAMPLE_RATE, dtype=np.float32)
+        monkeypatch.setattr(whisper_runner, "_get_model", Mock)
+        monkeypatch.setattr(whisper_runner, "_decode_audio", lambda path: audio)
+        monkeypatch.setattr(whisper_runner, "_batched_pipeline", lambda model: pipeline)
+
+        results = whisper_runner.transcribe_chunks(paths, batch_size=batch)
+
+        pipeline.transcribe.assert_called_once()
+        kwargs = pipeline.transcribe.call_args.kwargs
+        assert kwargs["batch_size"] == batch
+        # Each 40s chunk becomes a 30s and a 10s window
+        assert len(kwargs["clip_timestamps"]) == 2 * batch
+        assert len(results) == batch
+        for i, (segs, lang_info) in enumerate(results):
+            assert [seg["text"] for seg in segs] == [f"Chunk {i}"]
+            assert segs[0]["start"] == 1.0
+            assert segs[0]["end"] == 3.0
+            assert lang_info == {"language": "en", "language_probability": 0.9}
+
+    def test_transcribe_chunks_pytorch_falls_back_per_chunk(self, wr_settings, monkeypatch):
+        """Test the PyTorch backend transcribes each chunk separately."""
+        wr_settings.WHISPER_BACKEND = "whisper"
+        mock_transcribe = Mock(return_value=([], {"language": None, "language_probability": None}))
+        monkeypatch.setattr(whisper_runner, "transcribe_chunk", mock_transcribe)
+
+        results = whisper_runner.transcribe_chunks(["a.wav", "b.wav"])
+
+        assert len(results) == 2
+        assert mock_transcribe.call_count == 2
 
-        mock_segment = Mock()
-        mock_segment.start = 10.5
-        mock_segment.end = 15.25
-        mock_segment.text = " Test"
-        mock_segment.avg_logprob = -0.6
-        mock_segment.temperature = 0.2
-        mock_segment.tokens = [1, 2, 3, 4, 5]
-        mock_segment.no_speech_prob = 0.05
 
-        mock_model = Mock()
-        mock_model.transcribe.return_value = ([mock_segment], Mock())
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
-
-        result = whisper_runner.transcribe_chunk(wav_path)
-
-        segment = result[0]
-        assert "start" in segment
-        assert "end" in segment
-        assert "text" in segment
-        assert "avg_logprob" in segment
-        assert "temperature" in segment
-        assert "token_count" in segment
-        assert "confidence" in segment
-
-    @patch("worker.whisper_runner._get_model")
-    @patch("worker.whisper_runner.settings")
-    def test_segment_formatting_missing_no_speech_prob(self, mock_settings, mock_get_model, tmp_path):
-        """Test segment handles missing no_speech_prob gracefully."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
+class TestSegmentFormatting:
+    """Tests for segment output schema validation."""
 
+    def test_segment_formatting_missing_no_speech_prob(self, wr_settings, monkeypatch, dummy_wav):
+        """Test segment handles missing no_speech_prob gracefully."""
         mock_segment = Mock(spec=["start", "end", "text", "avg_logprob", "temperature", "tokens"])
         mock_segment.start = 0.0
         mock_segment.end = 5.0
@@ -299,14 +220,9 @@ class TestSegmentFormatting:
         mock_segment.tokens = [1, 2]
         # Explicitly ensure no_speech_prob doesn't exist by not adding it to spec
 
-        mock_model = Mock()
-        mock_model.transcribe.return_value = ([mock_segment], Mock())
-        mock_get_model.return_value = mock_model
-
-        wav_path = tmp_path / "test.wav"
-        wav_path.touch()
+        monkeypatch.setattr(whisper_runner, "_get_model", lambda: FakeModel([mock_segment], _INFO))
 
-        result = whisper_runner.transcribe_chunk(wav_path)
+        result, _ = whisper_runner.transcribe_chunk(dummy_wav)
 
         # Should handle gracefully - getattr with None default
         assert "confidence" in result[0]
@@ -315,16 +231,11 @@ class TestSegmentFormatting:
 class TestModelLoading:
     """Tests for model loading logic."""
 
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_model_faster_whisper_auto(self, mock_settings, mock_try_load):
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_model_faster_whisper_auto(self, mock_try_load, wr_settings):
         """Test loading faster-whisper model with auto device."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-        mock_settings.WHISPER_MODEL = "medium"
-        mock_settings.FORCE_GPU = False
-
-        # Reset global model
-        whisper_runner._model = None
+        # Reset cached model
+        whisper_runner._get_model_cached.cache_clear()
 
         mock_model = Mock()
         mock_try_load.return_value = mock_model
@@ -332,21 +243,30 @@ class TestModelLoading:
         result = whisper_runner._get_model()
 
         assert result == mock_model
-        # Should try float16 first
-        mock_try_load.assert_called()
+        # float16 on device=auto succeeds without touching the FORCE_GPU search
+        mock_try_load.assert_called_once_with("medium", device="auto", compute_type="float16")
+
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_model_loads_once(self, mock_try_load, wr_settings):
+        """Test the model is loaded once and reused across calls."""
+        whisper_runner._get_model_cached.cache_clear()
 
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_model_force_gpu_fallback(self, mock_settings, mock_try_load):
+        first = whisper_runner._get_model()
+        second = whisper_runner._get_model()
+
+        assert first is second
+        mock_try_load.assert_called_once()
+
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_model_force_gpu_fallback(self, mock_try_load, wr_settings):
         """Test GPU model fallback logic."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-        mock_settings.WHISPER_MODEL = "large-v3"
-        mock_settings.FORCE_GPU = True
-        mock_settings.GPU_DEVICE_PREFERENCE = "cuda,hip"
-        mock_settings.GPU_COMPUTE_TYPES = "float16,float32"
-        mock_settings.GPU_MODEL_FALLBACKS = "medium,small"
+        wr_settings.WHISPER_MODEL = "large-v3"
+        wr_settings.FORCE_GPU = True
+        wr_settings.GPU_DEVICE_PREFERENCE = "cuda,hip"
+        wr_settings.GPU_COMPUTE_TYPES = "float16,float32"
+        wr_settings.GPU_MODEL_FALLBACKS = "medium,small"
 
-        whisper_runner._model = None
+        whisper_runner._get_model_cached.cache_clear()
 
         # First attempts fail, last succeeds
         mock_try_load.side_effect = [
@@ -361,33 +281,29 @@ class TestModelLoading:
         assert result is not None
         assert mock_try_load.call_count == 4
 
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_model_force_gpu_all_fail(self, mock_settings, mock_try_load):
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_model_force_gpu_all_fail(self, mock_try_load, wr_settings):
         """Test FORCE_GPU raises when all configs fail."""
-        mock_settings.WHISPER_BACKEND = "faster-whisper"
-        mock_settings.WHISPER_MODEL = "large-v3"
-        mock_settings.FORCE_GPU = True
-        mock_settings.GPU_DEVICE_PREFERENCE = "cuda"
-        mock_settings.GPU_COMPUTE_TYPES = "float16"
-        mock_settings.GPU_MODEL_FALLBACKS = "large-v3"
+        wr_settings.WHISPER_MODEL = "large-v3"
+        wr_settings.FORCE_GPU = True
+        wr_settings.GPU_DEVICE_PREFERENCE = "cuda"
+        wr_settings.GPU_COMPUTE_TYPES = "float16"
+        wr_settings.GPU_MODEL_FALLBACKS = "large-v3"
 
-        whisper_runner._model = None
+        whisper_runner._get_model_cached.cache_clear()
 
         mock_try_load.side_effect = RuntimeError("GPU not available")
 
         with pytest.raises(RuntimeError, match="no GPU configuration succeeded"):
             whisper_runner._get_model()
 
-    @patch("worker.whisper_runner._try_load_torch")
-    @patch("worker.whisper_runner.settings")
-    def test_get_model_pytorch_backend(self, mock_settings, mock_try_load):
+    @patch.object(whisper_runner, "_try_load_torch")
+    def test_get_model_pytorch_backend(self, mock_try_load, wr_settings):
         """Test loading PyTorch whisper model."""
-        mock_settings.WHISPER_BACKEND = "whisper"
-        mock_settings.WHISPER_MODEL = "base"
-        mock_settings.FORCE_GPU = False
+        wr_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_MODEL = "base"
 
-        whisper_runner._model = None
+        whisper_runner._get_model_cached.cache_clear()
 
         mock_model = Mock()
         mock_try_load.return_value = mock_model
@@ -397,15 +313,36 @@ class TestModelLoading:
         assert result == mock_model
         mock_try_load.assert_called_once_with("base", False)
 
+    @pytest.mark.parametrize("compile_enabled", [False, True])
+    def test_try_load_torch_compiles_encoder(self, wr_settings, monkeypatch, compile_enabled):
+        """Test the openai-whisper encoder is wrapped with torch.compile only when enabled."""
+        wr_settings.WHISPER_BACKEND = "whisper"
+        wr_settings.WHISPER_TORCH_COMPILE = compile_enabled
+        mock_torch = Mock()
+        mock_torch_whisper = Mock()
+        encoder = mock_torch_whisper.load_model.return_value.encoder
+        monkeypatch.setattr(whisper_runner, "torch", mock_torch)
+        monkeypatch.setattr(whisper_runner, "_torch_whisper", mock_torch_whisper)
+
+        model = whisper_runner._try_load_torch("base", False)
+
+        if compile_enabled:
+            mock_torch.compile.assert_called_once_with(encoder)
+            assert model.encoder is mock_torch.compile.return_value
+        else:
+            mock_torch.compile.assert_not_called()
+            assert model.encoder is encoder
+
 
 class TestCT2FallbackModel:
     """Tests for CT2 fallback model loading."""
 
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_ct2_fallback_model_success(self, mock_settings, mock_try_load):
-        """Test successful CT2 fallback model loading."""
-        mock_settings.WHISPER_MODEL = "large-v3"
+    @pytest.mark.parametrize("device_count,compute_type", [(1, "int8_float16"), (0, "int8")], ids=["gpu", "cpu"])
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_ct2_fallback_model_success(self, mock_try_load, wr_settings, monkeypatch, device_count, compute_type):
+        """Test successful CT2 fallback model loading uses a quantized compute type."""
+        wr_settings.WHISPER_MODEL = "large-v3"
+        monkeypatch.setattr(whisper_runner, "_ct2_cuda_device_count", lambda: device_count)
 
         whisper_runner._fallback_ct2_model = None
 
@@ -415,33 +352,33 @@ class TestCT2FallbackModel:
         result = whisper_runner._get_ct2_fallback_model()
 
         assert result == mock_model
-        mock_try_load.assert_called_once_with("large-v3", device="auto", compute_type="float32")
+        mock_try_load.assert_called_once_with("large-v3", device="auto", compute_type=compute_type)
 
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_ct2_fallback_model_medium_fallback(self, mock_settings, mock_try_load):
-        """Test fallback to medium model."""
-        mock_settings.WHISPER_MODEL = "large-v3"
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_ct2_fallback_model_medium_fallback(self, mock_try_load, wr_settings, monkeypatch):
+        """Test fallback to float32 and then the medium model."""
+        wr_settings.WHISPER_MODEL = "large-v3"
+        monkeypatch.setattr(whisper_runner, "_ct2_cuda_device_count", lambda: 1)
 
         whisper_runner._fallback_ct2_model = None
 
-        # First load fails, second succeeds
+        # Quantized and float32 loads fail, medium succeeds
         mock_model = Mock()
-        mock_try_load.side_effect = [RuntimeError("Failed"), mock_model]
+        mock_try_load.side_effect = [RuntimeError("Failed"), RuntimeError("Failed"), mock_model]
 
         result = whisper_runner._get_ct2_fallback_model()
 
         assert result == mock_model
-        assert mock_try_load.call_count == 2
-        # Second call should be for medium model
-        second_call = mock_try_load.call_args_list[1]
-        assert second_call[0][0] == "medium"
-
-    @patch("worker.whisper_runner._try_load_ct2")
-    @patch("worker.whisper_runner.settings")
-    def test_get_ct2_fallback_model_all_fail(self, mock_settings, mock_try_load):
+        assert mock_try_load.call_args_list == [
+            call("large-v3", device="auto", compute_type="int8_float16"),
+            call("large-v3", device="auto", compute_type="float32"),
+            call("medium", device="auto", compute_type="float32"),
+        ]
+
+    @patch.object(whisper_runner, "_try_load_ct2")
+    def test_get_ct2_fallback_model_all_fail(self, mock_try_load, wr_settings):
         """Test exception when all fallback attempts fail."""
-        mock_settings.WHISPER_MODEL = "large-v3"
+        wr_settings.WHISPER_MODEL = "large-v3"
 
         whisper_runner._fallback_ct2_model = None
 
@@ -10,12 +10,13 @@ Tests cover:
 """
 
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from http.client import HTTPMessage
 from urllib.error import HTTPError, URLError
 
 import pytest
 
+from tests.worker.conftest import FakeResponse
 from worker.youtube_captions import (
     YouTubeCaptionFetchError,
     YTCaptionTrack,
@@ -175,11 +176,7 @@ class TestJSON3Parsing:
             ]
         }
         
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(json3_data).encode()
-        mock_response.__enter__.return_value = mock_response
-        mock_response.__exit__.return_value = False
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(json.dumps(json3_data).encode())
         
         result = fetch_youtube_auto_captions("test_video_id")
         
@@ -231,11 +228,7 @@ class TestJSON3Parsing:
             ]
         }
         
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(json3_data).encode()
-        mock_response.__enter__.return_value = mock_response
-        mock_response.__exit__.return_value = False
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(json.dumps(json3_data).encode())
         
         result = fetch_youtube_auto_captions("test_video_id")
         
@@ -259,11 +252,7 @@ class TestJSON3Parsing:
         }
         
         # Invalid JSON
-        mock_response = MagicMock()
-        mock_response.read.return_value = b"invalid json {"
-        mock_response.__enter__.return_value = mock_response
-        mock_response.__exit__.return_value = False
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(b"invalid json {")
         
         with pytest.raises(YouTubeCaptionFetchError):
             fetch_youtube_auto_captions("test_video_id")
@@ -403,11 +392,7 @@ Second line
 
 """
         
-        mock_response = MagicMock()
-        mock_response.read.return_value = vtt_content
-        mock_response.__enter__.return_value = mock_response
-        mock_response.__exit__.return_value = False
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(vtt_content)
         
         result = fetch_youtube_auto_captions("test_video_id")
         
@@ -500,7 +485,7 @@ class TestDataclasses:
 
     def test_yt_segment_creation(self):
         """Test YTSegment dataclass creation."""
-        segment = YTSegment(start=1.5, end=3.5, text="Test text")
+        segment = YTSegment(start_ms=1500, end_ms=3500, text="Test text")
         
         assert segment.start == 1.5
         assert segment.end == 3.5
@@ -1,29 +1,140 @@
 """Tests for worker.youtube_captions module."""
 
+import gzip
 import json
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
+from tests.worker.conftest import FakeResponse
 from worker.youtube_captions import (
+    SegmentTable,
     YouTubeCaptionFetchError,
     YTCaptionTrack,
     YTSegment,
+    _parse_json3_to_segments,
     _parse_vtt_to_segments,
     _pick_auto_caption,
     _yt_dlp_json,
     fetch_youtube_auto_captions,
+    fetch_youtube_auto_captions_many,
 )
 
+_JSON3_PAYLOAD = json.dumps(
+    {
+        "events": [
+            {"tStartMs": 0, "dDurationMs": 5000, "segs": [{"utf8": "Hello "}, {"utf8": "world"}]},
+            {"tStartMs": 5000, "dDurationMs": 3000, "segs": [{"utf8": "Test"}]},
+        ]
+    }
+).encode()
+_JSON3_EMPTY_PAYLOAD = b'{"events": []}'
+_JSON3_UTF8_PAYLOAD = json.dumps(
+    {"events": [{"tStartMs": 1500, "dDurationMs": 500, "segs": [{"utf8": "Café"}]}]}, ensure_ascii=False
+).encode()
+
+# yt-dlp metadata with a single English auto-caption track (read-only, shared across tests)
+_EN_JSON3_META = {"automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}}
+_EN_VTT_META = {"automatic_captions": {"en": [{"ext": "vtt", "url": "http://example.com/captions.vtt"}]}}
+
+# VTT payloads for the parser and fetch tests
+_VTT_SINGLE_CUE = b"""WEBVTT
+
+00:00:00.000 --> 00:00:05.000
+Caption text
+"""
+_VTT_BASIC = b"""WEBVTT
+
+00:00:00.000 --> 00:00:05.000
+First segment
+
+00:00:05.000 --> 00:00:10.000
+Second segment
+"""
+
+_VTT_CUE_IDS = b"""WEBVTT
+
+1
+00:00:00.000 --> 00:00:05.000
+First segment
+
+2
+00:00:05.000 --> 00:00:10.000
+Second segment
+"""
+
+_VTT_MULTILINE = b"""WEBVTT
+
+00:00:00.000 --> 00:00:05.000
+First line
+Second line
+Third line
+"""
+
+_VTT_WITHOUT_HEADER = b"""00:00:00.000 --> 00:00:02.000
+First segment
+
+00:00:02.000 --> 00:00:04.000
+Second segment"""
+
+_VTT_UTF8_AND_CRLF = "WEBVTT\r\n\r\n00:00:00.000 --> 00:00:01.000\r\nCafé\r\nnaïve\r\n".encode()
+
+_VTT_EMPTY_CUES = b"""WEBVTT
+
+00:00:00.000 --> 00:00:05.000
+Valid segment
+
+00:00:05.000 --> 00:00:10.000
+
+00:00:10.000 --> 00:00:15.000
+Another valid segment
+"""
+
+_VTT_MALFORMED_TIMING = b"""WEBVTT
+
+00:00:00.000 --> 00:00:05.000
+Valid segment
+
+INVALID TIMING
+This should be skipped
+
+00:00:10.000 --> 00:00:15.000
+Another valid segment
+"""
+
+_VTT_METADATA = b"""WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:05.000
+First segment
+"""
+
+
+@pytest.fixture
+def patched_fetch(monkeypatch):
+    """Replace yt-dlp metadata lookup and urlopen; returns (mock_yt_dlp, mock_urlopen)."""
+    mock_yt_dlp, mock_urlopen = Mock(), Mock()
+    monkeypatch.setattr("worker.youtube_captions._yt_dlp_json", mock_yt_dlp)
+    monkeypatch.setattr("worker.youtube_captions.urlopen", mock_urlopen)
+    return mock_yt_dlp, mock_urlopen
+
+
+@pytest.fixture
+def mock_executor(monkeypatch):
+    """Replace YtDlpExecutor; returns the executor instance mock."""
+    mock_executor_cls = Mock()
+    monkeypatch.setattr("worker.youtube_captions.YtDlpExecutor", mock_executor_cls)
+    return mock_executor_cls.return_value
+
 
 class TestYTDlpJson:
     """Tests for _yt_dlp_json function."""
 
-    @patch("worker.youtube_captions.YtDlpExecutor")
-    def test_yt_dlp_json_success(self, mock_executor_cls):
+    def test_yt_dlp_json_success(self, mock_executor):
         """Test successful yt-dlp JSON extraction."""
         test_data = {"id": "test123", "title": "Test Video"}
-        mock_executor = mock_executor_cls.return_value
         mock_executor.run_json.return_value = test_data
 
         result = _yt_dlp_json("https://www.youtube.com/watch?v=test123")
@@ -33,10 +144,8 @@ class TestYTDlpJson:
         call_args = mock_executor.run_json.call_args[0][0]
         assert "-J" in call_args
 
-    @patch("worker.youtube_captions.YtDlpExecutor")
-    def test_yt_dlp_json_command_structure(self, mock_executor_cls):
+    def test_yt_dlp_json_command_structure(self, mock_executor):
         """Test yt-dlp command structure includes client strategy."""
-        mock_executor = mock_executor_cls.return_value
         mock_executor.run_json.return_value = {"id": "test"}
         url = "https://www.youtube.com/watch?v=abc"
 
@@ -52,81 +161,67 @@ class TestYTDlpJson:
 class TestPickAutoCaption:
     """Tests for _pick_auto_caption function."""
 
-    def test_pick_auto_caption_english_json3_preferred(self):
-        """Test English json3 captions are preferred."""
-        data = {
-            "automatic_captions": {
-                "en": [
-                    {"ext": "json3", "url": "http://example.com/en.json3"},
-                    {"ext": "vtt", "url": "http://example.com/en.vtt"},
-                ],
-                "es": [{"ext": "json3", "url": "http://example.com/es.json3"}],
-            }
-        }
-
-        result = _pick_auto_caption(data)
-
-        assert result is not None
-        assert result.language == "en"
-        assert result.ext == "json3"
-        assert result.kind == "auto"
-
-    def test_pick_auto_caption_english_us_preferred(self):
-        """Test en-US is preferred over other languages."""
-        data = {
-            "automatic_captions": {
-                "en-US": [{"ext": "json3", "url": "http://example.com/en-us.json3"}],
-                "fr": [{"ext": "json3", "url": "http://example.com/fr.json3"}],
-            }
-        }
-
-        result = _pick_auto_caption(data)
-
-        assert result is not None
-        assert result.language == "en-US"
-
-    def test_pick_auto_caption_vtt_fallback(self):
-        """Test VTT is used when json3 unavailable."""
-        data = {
-            "automatic_captions": {
-                "en": [{"ext": "vtt", "url": "http://example.com/en.vtt"}],
-            }
-        }
-
-        result = _pick_auto_caption(data)
-
-        assert result is not None
-        assert result.ext == "vtt"
-
-    def test_pick_auto_caption_non_english_fallback(self):
-        """Test non-English captions used as last resort."""
-        data = {
-            "automatic_captions": {
-                "de": [{"ext": "json3", "url": "http://example.com/de.json3"}],
-            }
-        }
-
-        result = _pick_auto_caption(data)
-
-        assert result is not None
-        assert result.language == "de"
-        assert result.ext == "json3"
-
-    def test_pick_auto_caption_no_captions(self):
-        """Test returns None when no captions available."""
-        data = {"automatic_captions": {}}
-
-        result = _pick_auto_caption(data)
-
-        assert result is None
-
-    def test_pick_auto_caption_missing_key(self):
-        """Test returns None when automatic_captions key missing."""
-        data = {}
-
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            pytest.param(
+                {
+                    "automatic_captions": {
+                        "en": [
+                            {"ext": "json3", "url": "http://example.com/en.json3"},
+                            {"ext": "vtt", "url": "http://example.com/en.vtt"},
+                        ],
+                        "es": [{"ext": "json3", "url": "http://example.com/es.json3"}],
+                    }
+                },
+                ("en", "json3"),
+                id="english_json3_preferred",
+            ),
+            pytest.param(
+                {
+                    "automatic_captions": {
+                        "en-US": [{"ext": "json3", "url": "http://example.com/en-us.json3"}],
+                        "fr": [{"ext": "json3", "url": "http://example.com/fr.json3"}],
+                    }
+                },
+                ("en-US", "json3"),
+                id="english_us_preferred",
+            ),
+            pytest.param(
+                {
+                    "automatic_captions": {
+                        "en": [{"ext": "vtt", "url": "http://example.com/en.vtt"}],
+                        "en-GB": [{"ext": "json3", "url": "http://example.com/en-gb.json3"}],
+                        "fr": [{"ext": "json3", "url": "http://example.com/fr.json3"}],
+                        "en-US": [{"ext": "json3", "url": "http://example.com/en-us.json3"}],
+                    }
+                },
+                ("en-US", "json3"),
+                id="ranks_ext_then_language",
+            ),
+            pytest.param(
+                {"automatic_captions": {"en": [{"ext": "vtt", "url": "http://example.com/en.vtt"}]}},
+                ("en", "vtt"),
+                id="vtt_fallback",
+            ),
+            pytest.param(
+                {"automatic_captions": {"de": [{"ext": "json3", "url": "http://example.com/de.json3"}]}},
+                ("de", "json3"),
+                id="non_english_fallback",
+            ),
+            pytest.param({"automatic_captions": {}}, None, id="no_captions"),
+            pytest.param({}, None, id="missing_key"),
+            pytest.param({"automatic_captions": {"en": [{"ext": "json3"}]}}, None, id="missing_url"),
+        ],
+    )
+    def test_pick_auto_caption(self, data, expected):
+        """Test track selection: json3 over vtt, then English variants, else the first available."""
         result = _pick_auto_caption(data)
 
-        assert result is None
+        if expected is None:
+            assert result is None
+        else:
+            assert (result.language, result.ext, result.kind) == (*expected, "auto")
 
     def test_pick_auto_caption_unsupported_format(self):
         """Test unsupported formats raise a fetch error."""
@@ -139,33 +234,13 @@ class TestPickAutoCaption:
         with pytest.raises(YouTubeCaptionFetchError):
             _pick_auto_caption(data)
 
-    def test_pick_auto_caption_missing_url(self):
-        """Test tracks without URLs are skipped."""
-        data = {
-            "automatic_captions": {
-                "en": [{"ext": "json3"}],  # No URL
-            }
-        }
-
-        result = _pick_auto_caption(data)
-
-        assert result is None
-
 
 class TestParseVttToSegments:
     """Tests for _parse_vtt_to_segments function."""
 
     def test_parse_vtt_basic(self):
         """Test parsing basic VTT format."""
-        vtt_content = b"""WEBVTT
-
-00:00:00.000 --> 00:00:05.000
-First segment
-
-00:00:05.000 --> 00:00:10.000
-Second segment
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_BASIC)
 
         assert len(result) == 2
         assert result[0].start == 0.0
@@ -177,17 +252,7 @@ Second segment
 
     def test_parse_vtt_with_cue_ids(self):
         """Test parsing VTT with cue identifiers."""
-        vtt_content = b"""WEBVTT
-
-1
-00:00:00.000 --> 00:00:05.000
-First segment
-
-2
-00:00:05.000 --> 00:00:10.000
-Second segment
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_CUE_IDS)
 
         assert len(result) == 2
         assert result[0].text == "First segment"
@@ -195,62 +260,43 @@ Second segment
 
     def test_parse_vtt_multiline_text(self):
         """Test parsing VTT with multi-line captions."""
-        vtt_content = b"""WEBVTT
-
-00:00:00.000 --> 00:00:05.000
-First line
-Second line
-Third line
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_MULTILINE)
 
         assert len(result) == 1
         assert result[0].text == "First line Second line Third line"
 
-    def test_parse_vtt_time_formats(self):
-        """Test parsing different time formats."""
-        vtt_content = b"""WEBVTT
+    @pytest.mark.parametrize(
+        "timing,start_ms,end_ms",
+        [
+            pytest.param("00:01:30.500 --> 00:01:35.750", 90500, 95750, id="hours"),
+            pytest.param("01:30.500 --> 01:35.750", 90500, 95750, id="no_hours"),
+            pytest.param("02:00:00.000 --> 02:00:01.001", 7200000, 7201001, id="multi_hour"),
+            pytest.param("00:00:00,500 --> 00:00:05,250", 500, 5250, id="comma_separator"),
+            pytest.param("00:00:05 --> 00:00:06", 5000, 6000, id="no_fraction"),
+            pytest.param("00:00:01.200 --> 00:00:04.800 align:start position:0%", 1200, 4800, id="cue_settings"),
+        ],
+    )
+    def test_parse_vtt_time_formats(self, timing, start_ms, end_ms):
+        """Test parsing different timing line formats."""
+        result = _parse_vtt_to_segments(f"WEBVTT\n\n{timing}\nCaption text\n".encode())
 
-00:01:30.500 --> 00:01:35.750
-Test with hours
+        assert [(s.start_ms, s.end_ms, s.text) for s in result] == [(start_ms, end_ms, "Caption text")]
 
-01:30.500 --> 01:35.750
-Test without hours
-"""
-        result = _parse_vtt_to_segments(vtt_content)
-
-        assert len(result) == 2
-        assert result[0].start == 90.5
-        assert result[0].end == 95.75
-        assert result[1].start == 90.5
-        assert result[1].end == 95.75
+    def test_parse_vtt_without_header(self):
+        """Test the first cue is kept when the WEBVTT header is missing."""
+        result = _parse_vtt_to_segments(_VTT_WITHOUT_HEADER)
 
-    def test_parse_vtt_comma_decimal_separator(self):
-        """Test parsing VTT with comma as decimal separator."""
-        vtt_content = b"""WEBVTT
+        assert [s.text for s in result] == ["First segment", "Second segment"]
 
-00:00:00,500 --> 00:00:05,250
-Test comma separator
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+    def test_parse_vtt_utf8_and_crlf(self):
+        """Test CRLF line endings and multi-byte UTF-8 cue text."""
+        result = _parse_vtt_to_segments(_VTT_UTF8_AND_CRLF)
 
-        assert len(result) == 1
-        assert result[0].start == 0.5
-        assert result[0].end == 5.25
+        assert [(s.start_ms, s.end_ms, s.text) for s in result] == [(0, 1000, "Café naïve")]
 
     def test_parse_vtt_empty_cues_ignored(self):
         """Test empty cues are skipped."""
-        vtt_content = b"""WEBVTT
-
-00:00:00.000 --> 00:00:05.000
-Valid segment
-
-00:00:05.000 --> 00:00:10.000
-
-00:00:10.000 --> 00:00:15.000
-Another valid segment
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_EMPTY_CUES)
 
         assert len(result) == 2
         assert result[0].text == "Valid segment"
@@ -258,18 +304,7 @@ Another valid segment
 
     def test_parse_vtt_malformed_timing_skipped(self):
         """Test malformed timing lines are skipped."""
-        vtt_content = b"""WEBVTT
-
-00:00:00.000 --> 00:00:05.000
-Valid segment
-
-INVALID TIMING
-This should be skipped
-
-00:00:10.000 --> 00:00:15.000
-Another valid segment
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_MALFORMED_TIMING)
 
         assert len(result) == 2
         assert result[0].text == "Valid segment"
@@ -277,52 +312,51 @@ Another valid segment
 
     def test_parse_vtt_with_metadata(self):
         """Test VTT with header metadata."""
-        vtt_content = b"""WEBVTT
-Kind: captions
-Language: en
-
-00:00:00.000 --> 00:00:05.000
-First segment
-"""
-        result = _parse_vtt_to_segments(vtt_content)
+        result = _parse_vtt_to_segments(_VTT_METADATA)
 
         assert len(result) == 1
         assert result[0].text == "First segment"
 
 
+class TestParseJson3ToSegments:
+    """Tests for _parse_json3_to_segments function."""
+
+    def test_skips_events_without_start_or_text(self):
+        """Test events missing tStartMs, segs or non-blank text are dropped."""
+        payload = json.dumps(
+            {
+                "events": [
+                    {"dDurationMs": 100, "segs": [{"utf8": "no start"}]},
+                    {"tStartMs": 100},
+                    {"tStartMs": 200, "segs": [{"utf8": "\n"}, {}]},
+                    {"tStartMs": 300, "segs": [{"utf8": " kept "}]},
+                ]
+            }
+        ).encode()
+
+        assert _parse_json3_to_segments(payload) == [YTSegment(300, 300, "kept")]
+
+    @pytest.mark.parametrize("payload", [b"{}", b"null", b'{"events": null}'])
+    def test_empty_documents(self, payload):
+        """Test documents without events yield no segments."""
+        assert _parse_json3_to_segments(payload) == []
+
+    def test_invalid_payload_raises_fetch_error(self):
+        """Test malformed json3 raises YouTubeCaptionFetchError."""
+        with pytest.raises(YouTubeCaptionFetchError):
+            _parse_json3_to_segments(b"{not json")
+
+
 class TestFetchYoutubeAutoCaptions:
     """Tests for fetch_youtube_auto_captions function."""
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_json3(self, mock_yt_dlp, mock_urlopen):
+    def test_fetch_youtube_auto_captions_json3(self, patched_fetch):
         """Test fetching json3 captions."""
+        mock_yt_dlp, mock_urlopen = patched_fetch
         # Setup yt-dlp response
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}
-        }
+        mock_yt_dlp.return_value = _EN_JSON3_META
 
-        # Setup caption response
-        caption_data = {
-            "events": [
-                {
-                    "tStartMs": 0,
-                    "dDurationMs": 5000,
-                    "segs": [{"utf8": "Hello "}, {"utf8": "world"}],
-                },
-                {
-                    "tStartMs": 5000,
-                    "dDurationMs": 3000,
-                    "segs": [{"utf8": "Test"}],
-                },
-            ]
-        }
-
-        mock_response = Mock()
-        mock_response.read.return_value = json.dumps(caption_data).encode()
-        mock_response.__enter__ = Mock(return_value=mock_response)
-        mock_response.__exit__ = Mock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(_JSON3_PAYLOAD)
 
         result = fetch_youtube_auto_captions("test123")
 
@@ -339,25 +373,12 @@ class TestFetchYoutubeAutoCaptions:
         assert segments[1].end == 8.0
         assert segments[1].text == "Test"
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_vtt(self, mock_yt_dlp, mock_urlopen):
+    def test_fetch_youtube_auto_captions_vtt(self, patched_fetch):
         """Test fetching VTT captions."""
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "vtt", "url": "http://example.com/captions.vtt"}]}
-        }
-
-        vtt_content = b"""WEBVTT
-
-00:00:00.000 --> 00:00:05.000
-Caption text
-"""
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_VTT_META
 
-        mock_response = Mock()
-        mock_response.read.return_value = vtt_content
-        mock_response.__enter__ = Mock(return_value=mock_response)
-        mock_response.__exit__ = Mock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(_VTT_SINGLE_CUE)
 
         result = fetch_youtube_auto_captions("test123")
 
@@ -367,22 +388,19 @@ Caption text
         assert len(segments) == 1
         assert segments[0].text == "Caption text"
 
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_no_captions(self, mock_yt_dlp):
+    def test_fetch_youtube_auto_captions_no_captions(self, patched_fetch):
         """Test returns None when no captions available."""
+        mock_yt_dlp, _ = patched_fetch
         mock_yt_dlp.return_value = {"automatic_captions": {}}
 
         result = fetch_youtube_auto_captions("test123")
 
         assert result is None
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_download_failure(self, mock_yt_dlp, mock_urlopen):
+    def test_fetch_youtube_auto_captions_download_failure(self, patched_fetch):
         """Test returns None when caption download fails."""
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}
-        }
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_JSON3_META
 
         mock_urlopen.side_effect = Exception("Network error")
 
@@ -391,40 +409,96 @@ Caption text
         with pytest.raises(YouTubeCaptionFetchError):
             fetch_youtube_auto_captions("test123")
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_invalid_json3(self, mock_yt_dlp, mock_urlopen):
+    def test_fetch_youtube_auto_captions_invalid_json3(self, patched_fetch):
         """Test returns None when json3 is invalid."""
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}
-        }
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_JSON3_META
 
-        mock_response = Mock()
-        mock_response.read.return_value = b"invalid json"
-        mock_response.__enter__ = Mock(return_value=mock_response)
-        mock_response.__exit__ = Mock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(b"invalid json")
 
         import pytest
 
         with pytest.raises(YouTubeCaptionFetchError):
             fetch_youtube_auto_captions("test123")
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_empty_events(self, mock_yt_dlp, mock_urlopen):
-        """Test handles json3 with empty events."""
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}
-        }
+    def test_fetch_youtube_auto_captions_gzip(self, patched_fetch):
+        """Test gzip-encoded caption responses are requested and decompressed."""
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_JSON3_META
+        mock_urlopen.return_value = FakeResponse(gzip.compress(_JSON3_PAYLOAD), {"Content-Encoding": "gzip"})
+
+        _, segments = fetch_youtube_auto_captions("test123")
+
+        assert [s.text for s in segments] == ["Hello world", "Test"]
+        assert mock_urlopen.call_args.args[0].get_header("Accept-encoding") == "gzip"
+
+    @pytest.mark.parametrize(
+        "ext,payload",
+        [
+            ("json3", _JSON3_PAYLOAD),
+            ("vtt", b"WEBVTT\n\n00:00:00.000 --> 00:00:05.000\nHello world\n\n00:00:05.000 --> 00:00:08.000\nTest\n"),
+        ],
+    )
+    def test_fetch_youtube_auto_captions_raw_table(self, patched_fetch, ext, payload):
+        """Test raw=True returns a SegmentTable matching the default segment list."""
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = {"automatic_captions": {"en": [{"ext": ext, "url": f"http://example.com/c.{ext}"}]}}
+        mock_urlopen.return_value = FakeResponse(payload)
+
+        _, table = fetch_youtube_auto_captions("test123", raw=True)
+        _, segments = fetch_youtube_auto_captions("test123")
+
+        assert isinstance(table, SegmentTable)
+        assert table.start_ms.tolist() == [0, 5000]
+        assert table.end_ms.tolist() == [5000, 8000]
+        assert table.text == ["Hello world", "Test"]
+        assert list(table) == segments
+
+    def test_fetch_youtube_auto_captions_injected_http_and_meta(self):
+        """Test injected http_get/meta callables replace yt-dlp and urlopen."""
+        urls = []
+
+        def http_get(url):
+            urls.append(url)
+            return _JSON3_PAYLOAD
+
+        def meta(url):
+            assert url == "https://www.youtube.com/watch?v=test123"
+            return _EN_JSON3_META
 
-        caption_data = {"events": []}
+        _, segments = fetch_youtube_auto_captions("test123", http_get=http_get, meta=meta)
 
-        mock_response = Mock()
-        mock_response.read.return_value = json.dumps(caption_data).encode()
-        mock_response.__enter__ = Mock(return_value=mock_response)
-        mock_response.__exit__ = Mock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        assert urls == ["http://example.com/captions.json3"]
+        assert [s.text for s in segments] == ["Hello world", "Test"]
+
+    def test_fetch_youtube_auto_captions_injected_http_failure(self):
+        """Test errors from an injected http_get surface as YouTubeCaptionFetchError."""
+
+        def http_get(url):
+            raise OSError("connection reset")
+
+        def meta(url):
+            return {"automatic_captions": {"en": [{"ext": "vtt", "url": "http://example.com/c.vtt"}]}}
+
+        with pytest.raises(YouTubeCaptionFetchError):
+            fetch_youtube_auto_captions("test123", http_get=http_get, meta=meta)
+
+    def test_fetch_youtube_auto_captions_json3_stdlib_fallback(self, patched_fetch, monkeypatch):
+        """Test json3 parsing works with the stdlib json fallback."""
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        monkeypatch.setattr("worker.youtube_captions._json_loads", json.loads)
+        mock_yt_dlp.return_value = _EN_JSON3_META
+        mock_urlopen.return_value = FakeResponse(_JSON3_UTF8_PAYLOAD)
+
+        _, segments = fetch_youtube_auto_captions("test123")
+
+        assert [(s.start, s.end, s.text) for s in segments] == [(1.5, 2.0, "Café")]
+
+    def test_fetch_youtube_auto_captions_empty_events(self, patched_fetch):
+        """Test handles json3 with empty events."""
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_JSON3_META
+        mock_urlopen.return_value = FakeResponse(_JSON3_EMPTY_PAYLOAD)
 
         result = fetch_youtube_auto_captions("test123")
 
@@ -432,27 +506,41 @@ Caption text
         track, segments = result
         assert len(segments) == 0
 
-    @patch("worker.youtube_captions.urlopen")
-    @patch("worker.youtube_captions._yt_dlp_json")
-    def test_fetch_youtube_auto_captions_user_agent(self, mock_yt_dlp, mock_urlopen):
+    def test_fetch_youtube_auto_captions_user_agent(self, patched_fetch):
         """Test request includes User-Agent header."""
-        mock_yt_dlp.return_value = {
-            "automatic_captions": {"en": [{"ext": "json3", "url": "http://example.com/captions.json3"}]}
-        }
+        mock_yt_dlp, mock_urlopen = patched_fetch
+        mock_yt_dlp.return_value = _EN_JSON3_META
 
-        mock_response = Mock()
-        mock_response.read.return_value = b'{"events": []}'
-        mock_response.__enter__ = Mock(return_value=mock_response)
-        mock_response.__exit__ = Mock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = FakeResponse(_JSON3_EMPTY_PAYLOAD)
 
         fetch_youtube_auto_captions("test123")
 
-        # Verify Request was created with User-Agent
-        call_args = mock_urlopen.call_args[0]
-        if call_args:
-            # Request object should have headers
-            pass
+        req = mock_urlopen.call_args.args[0]
+        assert req.full_url == "http://example.com/captions.json3"
+        assert req.get_header("User-agent") == "Mozilla/5.0"
+
+
+class TestFetchYoutubeAutoCaptionsMany:
+    """Tests for fetch_youtube_auto_captions_many function."""
+
+    @patch("worker.youtube_captions.fetch_youtube_auto_captions")
+    def test_isolates_per_video_errors(self, mock_fetch):
+        """Test each video gets its own result or exception."""
+        error = YouTubeCaptionFetchError("boom")
+        results = {"a": ("track-a", []), "b": error, "c": None}
+
+        def fake_fetch(youtube_id):
+            result = results[youtube_id]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        mock_fetch.side_effect = fake_fetch
+
+        out = fetch_youtube_auto_captions_many(["a", "b", "c", "a"], max_workers=2)
+
+        assert out == {"a": ("track-a", []), "b": error, "c": None}
+        assert mock_fetch.call_count == 3
 
 
 class TestYTDataClasses:
@@ -460,12 +548,28 @@ class TestYTDataClasses:
 
     def test_yt_segment_creation(self):
         """Test YTSegment dataclass."""
-        seg = YTSegment(start=1.5, end=5.5, text="Test text")
+        seg = YTSegment(start_ms=1500, end_ms=5500, text="Test text")
 
         assert seg.start == 1.5
         assert seg.end == 5.5
         assert seg.text == "Test text"
 
+    def test_yt_segment_seconds_derived_from_ms(self):
+        """Test start/end seconds are derived from the stored millisecond values."""
+        seg = YTSegment(start_ms=290, end_ms=1290, text="Test text")
+
+        assert (seg.start_ms, seg.end_ms) == (290, 1290)
+        assert seg.start == 0.29
+        assert seg.end == 1.29
+
+    def test_yt_segment_is_slotted_and_frozen(self):
+        """Test YTSegment carries no per-instance __dict__ and is immutable."""
+        seg = YTSegment(start_ms=1500, end_ms=5500, text="Test text")
+
+        assert not hasattr(seg, "__dict__")
+        with pytest.raises(AttributeError):
+            seg.text = "changed"
+
     def test_yt_caption_track_creation(self):
         """Test YTCaptionTrack dataclass."""
         track = YTCaptionTrack(
@@ -490,3 +594,26 @@ class TestYTDataClasses:
         )
 
         assert track.language is None
+
+
+class TestSegmentTable:
+    """Tests for the column-oriented SegmentTable."""
+
+    def test_round_trip_from_segments(self):
+        """Test SegmentTable rows match the YTSegments it was built from."""
+        segments = [YTSegment(0, 1500, "a"), YTSegment(1500, 3250, "b")]
+
+        table = SegmentTable.from_segments(segments)
+
+        assert len(table) == 2
+        assert table.start_ms.dtype == np.int64
+        assert table.end_ms.tolist() == [1500, 3250]
+        assert list(table) == segments
+        assert table[1] == segments[1]
+
+    def test_empty(self):
+        """Test an empty SegmentTable."""
+        table = SegmentTable.from_segments([])
+
+        assert len(table) == 0
+        assert list(table) == []
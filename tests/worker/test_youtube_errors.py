@@ -9,3 +9,8 @@ def test_classify_youtube_error_throttle():
 def test_classify_youtube_error_not_found():
     err = classify_youtube_error("Video unavailable")
     assert err.kind == YouTubeErrorKind.NOT_FOUND
+
+
+def test_classify_youtube_error_geo_blocked_is_not_found():
+    err = classify_youtube_error("The uploader has not made this video available in your country")
+    assert err.kind == YouTubeErrorKind.NOT_FOUND
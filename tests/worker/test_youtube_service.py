@@ -20,7 +20,7 @@ def test_service_fetch_metadata_wraps_existing_helper():
 
 def test_service_fetch_auto_captions_wraps_legacy_result():
     track = YTCaptionTrack(url="https://example.com/captions.json3", language="en", kind="auto", ext="json3")
-    segments = [YTSegment(start=0.0, end=1.0, text="hello")]
+    segments = [YTSegment(start_ms=0, end_ms=1000, text="hello")]
 
     with patch("worker.youtube.service._fetch_legacy_auto_captions", return_value=(track, segments)):
         result = YouTubeService().fetch_auto_captions("abc123")
@@ -1,27 +1,48 @@
+import csv
+import json
 import logging
+import os
 import shlex
+import shutil
 import subprocess
+import threading
 import time
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from app.logging_config import get_logger
 from app.settings import settings
 from worker.po_token_manager import TokenType, get_token_manager
 from worker.token_utils import redact_tokens_from_command
+from worker.youtube_resilience import (
+    ErrorClass,
+    YouTubeAuthError,
+    classify_error,
+    exponential_backoff,
+    get_circuit_breaker,
+    retry_with_backoff,
+)
 
 logger = get_logger(__name__)
 
+# Spawns in this module must not pass preexec_fn, start_new_session or user/group/umask: without
+# them CPython starts children with vfork() instead of fork(), so launching ffmpeg or yt-dlp does
+# not duplicate the page tables of a worker that may also hold Whisper weights.
+
 # Import metrics at module level, but handle gracefully if not available
 try:
     from worker.metrics import (
+        youtube_requests_total,
         ytdlp_operation_attempts_total,
         ytdlp_operation_duration_seconds,
         ytdlp_operation_errors_total,
         ytdlp_token_usage_total,
     )
-    from worker.youtube_resilience import classify_error
 
     _METRICS_AVAILABLE = True
 except ImportError:
@@ -38,17 +59,12 @@ except ImportError:
         def observe(self, *args, **kwargs):
             pass
 
+    youtube_requests_total = _DummyMetric()
     ytdlp_operation_attempts_total = _DummyMetric()
     ytdlp_operation_duration_seconds = _DummyMetric()
     ytdlp_operation_errors_total = _DummyMetric()
     ytdlp_token_usage_total = _DummyMetric()
 
-    # Define classify_error as a no-op if not available
-    def classify_error(*args, **kwargs):
-        from worker.youtube_resilience import ErrorClass
-
-        return ErrorClass.UNKNOWN
-
 
 @dataclass
 class Chunk:
@@ -84,7 +100,24 @@ def _get_user_agent(client: str = "web_safari") -> str:
     return user_agents.get(client, user_agents["web_safari"])
 
 
+# Built strategies keyed by the settings they are derived from (see _strategies_cache_key)
+_strategies_cache: dict[tuple, List[ClientStrategy]] = {}
+
+
+def _strategies_cache_key() -> tuple:
+    return (settings.YTDLP_CLIENT_ORDER, settings.YTDLP_CLIENTS_DISABLED)
+
+
 def _build_client_strategies() -> List[ClientStrategy]:
+    """Return client strategies for the current settings, building them once per distinct configuration."""
+    key = _strategies_cache_key()
+    strategies = _strategies_cache.get(key)
+    if strategies is None:
+        strategies = _strategies_cache[key] = _make_client_strategies()
+    return list(strategies)
+
+
+def _make_client_strategies() -> List[ClientStrategy]:
     """Build list of client strategies based on settings."""
     from worker.ytdlp_client_utils import get_client_extractor_args
 
@@ -184,22 +217,65 @@ def _get_po_tokens() -> dict[str, str]:
     return tokens
 
 
-def _yt_dlp_cmd(base_out: Path, url: str, strategy: Optional[ClientStrategy] = None) -> List[str]:
-    """Build yt-dlp command with optional client strategy and PO tokens."""
-    cmd = [
+@lru_cache(maxsize=8)
+def _parse_extra_args(extra_args: str) -> Tuple[str, ...]:
+    """Split YTDLP_EXTRA_ARGS once per distinct value rather than on every download."""
+    try:
+        return tuple(shlex.split(extra_args))
+    except Exception:
+        # fallback to raw split
+        return tuple(extra_args.split())
+
+
+def _build_base_cmd(base_out: Path) -> Tuple[List[str], List[str]]:
+    """Build the parts of the yt-dlp command that don't change between attempts.
+
+    Returns (head, tail): head holds the binary, format, output and pacing flags; tail holds
+    cookies and YTDLP_EXTRA_ARGS, which stay last so they can override anything before them.
+    Per-attempt strategy and PO token args go between the two.
+    """
+    head = [
         "yt-dlp",
         "-v",
         "-f",
         "bestaudio/best",
         "-o",
         str(base_out),
-        # be nice to YouTube infra
-        "--sleep-requests",
-        "1",
-        # Retry a few times internally (-R is the stable alias for --retries)
-        "-R",
-        "3",
     ]
+    # be nice to YouTube infra
+    if settings.YTDLP_SLEEP_REQUESTS > 0:
+        head.extend(["--sleep-requests", f"{settings.YTDLP_SLEEP_REQUESTS:g}"])
+    # Retry a few times internally (-R is the stable alias for --retries)
+    head.extend(["-R", "3"])
+    tail: List[str] = []
+
+    # Add cookies if configured. Checked once per download rather than cached for the process,
+    # so a cookies file mounted or rotated while the worker runs is picked up.
+    if settings.YTDLP_COOKIES_PATH and Path(settings.YTDLP_COOKIES_PATH).is_file():
+        tail.extend(["--cookies", settings.YTDLP_COOKIES_PATH])
+
+    # Allow user-provided extra args (from settings)
+    if settings.YTDLP_EXTRA_ARGS:
+        tail.extend(_parse_extra_args(settings.YTDLP_EXTRA_ARGS))
+
+    return head, tail
+
+
+def _yt_dlp_cmd(
+    base_out: Path,
+    url: str,
+    strategy: Optional[ClientStrategy] = None,
+    po_tokens: Optional[dict[str, str]] = None,
+    base_cmd: Optional[Tuple[List[str], List[str]]] = None,
+) -> List[str]:
+    """Build yt-dlp command with optional client strategy and PO tokens.
+
+    po_tokens defaults to a fresh lookup via _get_po_tokens(); callers that already fetched
+    the tokens pass them in to avoid querying the token manager twice. base_cmd is a
+    precomputed _build_base_cmd(base_out) for callers that build many commands.
+    """
+    head, tail = base_cmd if base_cmd is not None else _build_base_cmd(base_out)
+    cmd = list(head)
 
     # Add client strategy args
     if strategy:
@@ -207,7 +283,8 @@ def _yt_dlp_cmd(base_out: Path, url: str, strategy: Optional[ClientStrategy] = N
         cmd.extend(strategy.headers)
 
     # Add PO tokens if available
-    po_tokens = _get_po_tokens()
+    if po_tokens is None:
+        po_tokens = _get_po_tokens()
     if po_tokens:
         # Build extractor args for PO tokens
         # Format: --extractor-args "youtube:po_token=player:TOKEN1;po_token=gvs:TOKEN2"
@@ -223,23 +300,77 @@ def _yt_dlp_cmd(base_out: Path, url: str, strategy: Optional[ClientStrategy] = N
                 extra={"token_types": list(po_tokens.keys())}
             )
 
-    # Add cookies if configured
-    if settings.YTDLP_COOKIES_PATH and Path(settings.YTDLP_COOKIES_PATH).exists():
-        cmd.extend(["--cookies", settings.YTDLP_COOKIES_PATH])
-
-    # Allow user-provided extra args (from settings)
-    if settings.YTDLP_EXTRA_ARGS:
-        try:
-            cmd.extend(shlex.split(settings.YTDLP_EXTRA_ARGS))
-        except Exception:
-            # fallback to raw split
-            cmd.extend(settings.YTDLP_EXTRA_ARGS.split())
-
+    cmd.extend(tail)
     cmd.append(url)
     return cmd
 
 
-def _download_with_strategy(url: str, out: Path, strategy: ClientStrategy, attempt: int) -> subprocess.CompletedProcess:
+_pace_lock = threading.Lock()
+_last_launch_monotonic = float("-inf")
+
+
+def _pace_request() -> None:
+    """Wait until YTDLP_MIN_REQUEST_GAP_S has passed since this process last launched yt-dlp.
+
+    Only idle time shorter than the gap is slept off, so launches that follow a long
+    ffmpeg run or a backoff go out immediately. Concurrent callers are spaced in turn.
+    """
+    global _last_launch_monotonic
+    min_gap = settings.YTDLP_MIN_REQUEST_GAP_S
+    if min_gap <= 0:
+        return
+    with _pace_lock:
+        wait = _last_launch_monotonic + min_gap - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_launch_monotonic = time.monotonic()
+
+
+# yt-dlp -v logs every request; only the tail is useful for classification and logs
+_STDERR_TAIL_LINES = 200
+
+
+def _run_with_stderr_tail(cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run cmd keeping only the last _STDERR_TAIL_LINES lines of stderr.
+
+    Behaves like subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout)
+    but stderr is drained line by line into a bounded buffer, so memory stays flat however
+    long the download runs. stdout is discarded. The child is killed on timeout.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+    )
+    tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=tail.extend, args=(proc.stderr,), daemon=True)
+    drain.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        drain.join()
+        proc.stderr.close()
+
+    stderr = "".join(tail)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, output="", stderr=stderr)
+    return subprocess.CompletedProcess(cmd, returncode, "", stderr)
+
+
+def _download_with_strategy(
+    url: str,
+    out: Path,
+    strategy: ClientStrategy,
+    attempt: int,
+    base_cmd: Optional[Tuple[List[str], List[str]]] = None,
+) -> subprocess.CompletedProcess:
     """Execute a single download attempt with a specific client strategy.
 
     Args:
@@ -247,6 +378,7 @@ def _download_with_strategy(url: str, out: Path, strategy: ClientStrategy, attem
         out: Output path for downloaded file
         strategy: Client strategy to use
         attempt: Attempt number for logging
+        base_cmd: Optional precomputed _build_base_cmd(out)
 
     Returns:
         Completed subprocess result
@@ -254,10 +386,9 @@ def _download_with_strategy(url: str, out: Path, strategy: ClientStrategy, attem
     Raises:
         subprocess.CalledProcessError: If download fails
     """
-    cmd = _yt_dlp_cmd(out, url, strategy)
-
-    # Check if PO tokens are present
+    # Look tokens up once per attempt: a failed attempt may invalidate them before the retry
     po_tokens = _get_po_tokens()
+    cmd = _yt_dlp_cmd(out, url, strategy, po_tokens, base_cmd)
     has_token = bool(po_tokens)
 
     logger.info(
@@ -271,15 +402,10 @@ def _download_with_strategy(url: str, out: Path, strategy: ClientStrategy, attem
         },
     )
 
+    _pace_request()
     start_time = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=settings.YTDLP_REQUEST_TIMEOUT,
-        )
+        result = _run_with_stderr_tail(cmd, settings.YTDLP_REQUEST_TIMEOUT)
         duration = time.time() - start_time
 
         # Log success with structured fields
@@ -342,6 +468,45 @@ def _download_with_strategy(url: str, out: Path, strategy: ClientStrategy, attem
         raise
 
 
+# Error classes that no other client strategy can recover from
+_TERMINAL_ERROR_CLASSES = frozenset({ErrorClass.NOT_FOUND})
+
+# Streaming failures that retrying through download_audio would only repeat
+_STREAM_TERMINAL_ERROR_CLASSES = frozenset({ErrorClass.NOT_FOUND, ErrorClass.AUTH, ErrorClass.TOKEN})
+
+_DOWNLOAD_AUTH_ERROR = (
+    "YouTube authentication failed during download. Refresh the mounted cookies.txt "
+    "or disable YTDLP_COOKIES_PATH if cookies are no longer valid."
+)
+
+
+def _classify_download_error(e: Exception) -> ErrorClass:
+    """Classify download error and handle token invalidation."""
+    stderr = getattr(e, "stderr", "") or str(e)
+    returncode = getattr(e, "returncode", 0)
+    error_class = classify_error(returncode, stderr, e)
+
+    # Check if error indicates invalid/expired PO token
+    stderr_lower = stderr.lower()
+    is_token_error = (
+        error_class == ErrorClass.TOKEN
+        or ("po_token" in stderr_lower and ("invalid" in stderr_lower or "expired" in stderr_lower))
+        or (("403" in stderr_lower) and ("token" in stderr_lower or "po_token" in stderr_lower))
+    )
+
+    if is_token_error:
+        token_manager = get_token_manager()
+        # Mark only player and GVS tokens as potentially invalid
+        for token_type in [TokenType.PLAYER, TokenType.GVS]:
+            token_manager.mark_token_invalid(token_type, reason=error_class.value)
+        logger.warning(
+            "Token-related error detected, marking player/gvs tokens invalid",
+            extra={"error_classification": error_class.value, "returncode": returncode}
+        )
+
+    return error_class
+
+
 def download_audio(url: str, dest_dir: Path) -> Path:
     """Download audio from YouTube URL with client fallback strategy.
 
@@ -349,17 +514,10 @@ def download_audio(url: str, dest_dir: Path) -> Path:
     Uses retry with exponential backoff and circuit breaker for resilience.
     Logs structured information about attempts and failures.
     """
-    from worker.metrics import youtube_requests_total
-    from worker.youtube_resilience import (
-        ErrorClass,
-        YouTubeAuthError,
-        classify_error,
-        get_circuit_breaker,
-        retry_with_backoff,
-    )
-
     out = dest_dir / "raw.m4a"
     strategies = _build_client_strategies()
+    # Cookies and extra args are fixed for the whole download; build them once, not per attempt
+    base_cmd = _build_base_cmd(out)
 
     # Get circuit breaker for download operations
     circuit_breaker = None
@@ -385,37 +543,11 @@ def download_audio(url: str, dest_dir: Path) -> Path:
             """Create download attempt function with explicit parameter binding."""
             def download_attempt():
                 """Single download attempt that can be retried."""
-                return _download_with_strategy(url, out, strat, idx + 1)
+                return _download_with_strategy(url, out, strat, idx + 1, base_cmd)
             return download_attempt  # noqa: B023 (false positive - function returned immediately)
 
         download_attempt = make_download_attempt(strategy, strategy_idx)
 
-        def classify_download_error(e: Exception) -> ErrorClass:
-            """Classify download error and handle token invalidation."""
-            stderr = getattr(e, "stderr", "") or str(e)
-            returncode = getattr(e, "returncode", 0)
-            error_class = classify_error(returncode, stderr, e)
-
-            # Check if error indicates invalid/expired PO token
-            stderr_lower = stderr.lower()
-            is_token_error = (
-                error_class == ErrorClass.TOKEN
-                or ("po_token" in stderr_lower and ("invalid" in stderr_lower or "expired" in stderr_lower))
-                or (("403" in stderr_lower) and ("token" in stderr_lower or "po_token" in stderr_lower))
-            )
-
-            if is_token_error:
-                token_manager = get_token_manager()
-                # Mark only player and GVS tokens as potentially invalid
-                for token_type in [TokenType.PLAYER, TokenType.GVS]:
-                    token_manager.mark_token_invalid(token_type, reason=error_class.value)
-                logger.warning(
-                    "Token-related error detected, marking player/gvs tokens invalid",
-                    extra={"error_classification": error_class.value, "returncode": returncode}
-                )
-
-            return error_class
-
         try:
             # Use retry with backoff for each client strategy
             retry_with_backoff(
@@ -424,13 +556,14 @@ def download_audio(url: str, dest_dir: Path) -> Path:
                 base_delay=settings.YTDLP_BACKOFF_BASE_DELAY,
                 max_delay=settings.YTDLP_BACKOFF_MAX_DELAY,
                 circuit_breaker=circuit_breaker,
-                classify_func=classify_download_error,
+                classify_func=_classify_download_error,
             )
 
             logger.info(
                 "Download succeeded",
                 extra={
                     "client": strategy.name,
+                    "strategies_tried": strategy_idx + 1,
                 },
             )
             youtube_requests_total.labels(operation="download", result="success").inc()
@@ -438,7 +571,7 @@ def download_audio(url: str, dest_dir: Path) -> Path:
 
         except subprocess.CalledProcessError as e:
             last_err = e
-            error_class = classify_download_error(e)
+            error_class = _classify_download_error(e)
             logger.warning(
                 "Client strategy failed after retries",
                 extra={
@@ -448,13 +581,21 @@ def download_audio(url: str, dest_dir: Path) -> Path:
                 },
             )
             if error_class == ErrorClass.AUTH:
-                raise YouTubeAuthError(
-                    "YouTube authentication failed during download. Refresh the mounted cookies.txt "
-                    "or disable YTDLP_COOKIES_PATH if cookies are no longer valid."
-                ) from e
+                raise YouTubeAuthError(_DOWNLOAD_AUTH_ERROR) from e
+            if error_class in _TERMINAL_ERROR_CLASSES:
+                # The video itself is gone or private; another client will not change that
+                logger.warning(
+                    "Terminal error, skipping remaining strategies",
+                    extra={
+                        "client": strategy.name,
+                        "error_classification": error_class.value,
+                        "clients_skipped": len(strategies) - strategy_idx - 1,
+                    },
+                )
+                break
         except Exception as e:
             last_err = e
-            error_class = classify_download_error(e)
+            error_class = _classify_download_error(e)
             logger.warning(
                 "Client strategy raised exception",
                 extra={
@@ -475,12 +616,28 @@ def download_audio(url: str, dest_dir: Path) -> Path:
             },
         )
 
-    # All strategies failed
+        if strategy_idx < len(strategies) - 1:
+            # Back off between clients too, so workers that were throttled together do not
+            # hit YouTube again in lockstep with the next client
+            delay = exponential_backoff(
+                strategy_idx,
+                settings.YTDLP_BACKOFF_BASE_DELAY,
+                settings.YTDLP_BACKOFF_MAX_DELAY,
+                jitter=settings.YTDLP_BACKOFF_JITTER,
+            )
+            logger.info(
+                "Backing off before next client",
+                extra={"client": strategy.name, "delay_seconds": round(delay, 2)},
+            )
+            time.sleep(delay)
+
+    # All strategies failed (or a terminal error stopped the fallback early)
+    clients_tried = strategies[: strategy_idx + 1] if strategies else []
     logger.error(
         "All client strategies failed",
         extra={
-            "total_clients_tried": len(strategies),
-            "clients": [s.name for s in strategies],
+            "total_clients_tried": len(clients_tried),
+            "clients": [s.name for s in clients_tried],
             "url": url,
         },
     )
@@ -491,13 +648,82 @@ def download_audio(url: str, dest_dir: Path) -> Path:
     raise RuntimeError("yt-dlp failed with no captured exception")
 
 
+def download_audio_many(items: Iterable[Tuple[str, Path]], max_workers: int = 4) -> List[Path | Exception]:
+    """Download several videos concurrently.
+
+    items are (url, dest_dir) pairs, each run through download_audio with its own client
+    fallback chain on a bounded thread pool. The work happens in yt-dlp child processes,
+    so threads are enough, and they share this process's circuit breaker and request
+    pacing. One failure does not affect the others: the result holds, in input order,
+    either the downloaded path or the exception that download raised.
+    """
+
+    def safe_download(item: Tuple[str, Path]) -> Path | Exception:
+        url, dest_dir = item
+        try:
+            return download_audio(url, dest_dir)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-download") as pool:
+        return list(pool.map(safe_download, items))
+
+
+def _run_ffmpeg(cmd: List[str]) -> None:
+    """Run an ffmpeg command with stdout discarded and stderr kept for the error.
+
+    Commands run at -loglevel error, so stderr only carries diagnostics; on failure they are
+    attached to the raised CalledProcessError instead of going to the worker's stderr.
+    """
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, text=True, errors="replace")
+
+
+def _is_wav_16k_mono(path: Path) -> bool:
+    """Return True if path is a WAV whose audio is already 16 kHz mono pcm_s16le."""
+    cmd = [
+        "ffprobe",
+        "-hide_banner",
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "stream=codec_name,sample_rate,channels:format=format_name",
+        "-of",
+        "json",
+        str(path),
+    ]
+    try:
+        info = json.loads(subprocess.check_output(cmd))
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return False
+    streams = info.get("streams") or [{}]
+    stream = streams[0]
+    return (
+        info.get("format", {}).get("format_name") == "wav"
+        and stream.get("codec_name") == "pcm_s16le"
+        and str(stream.get("sample_rate")) == "16000"
+        and stream.get("channels") == 1
+    )
+
+
 def ensure_wav_16k(src: Path) -> Path:
     wav = src.parent / "audio_16k.wav"
+    # Only WAV sources can already be in the target format, so other inputs skip the probe
+    if settings.FFMPEG_SKIP_IF_COMPLIANT and src.suffix.lower() == ".wav" and _is_wav_16k_mono(src):
+        if src != wav:
+            wav.unlink(missing_ok=True)
+            try:
+                os.link(src, wav)
+            except OSError:
+                shutil.copyfile(src, wav)  # e.g. across filesystems
+        logger.info("Source is already 16 kHz mono PCM WAV, skipping re-encode", extra={"src": str(src)})
+        return wav
     cmd = [
         "ffmpeg",
         "-hide_banner",
         "-loglevel",
-        "info",
+        "error",
         "-y",
         "-i",
         str(src),
@@ -509,58 +735,357 @@ def ensure_wav_16k(src: Path) -> Path:
         "pcm_s16le",
         str(wav),
     ]
-    logger.info("Running ffmpeg command", extra={"command": " ".join(cmd)})
-    subprocess.check_call(cmd)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running ffmpeg command", extra={"command": " ".join(cmd)})
+    _run_ffmpeg(cmd)
     return wav
 
 
+def ensure_wav_16k_chunked(src: Path, chunk_seconds: int) -> Tuple[Path, List[Chunk]]:
+    """Transcode src to audio_16k.wav and cut the transcription chunks in the same ffmpeg run.
+
+    The source is decoded once and written to two outputs, the full WAV (kept for diarization)
+    and the chunk_NNNN.wav segments, instead of ensure_wav_16k followed by chunk_audio reading
+    the WAV back. Returns the WAV and the chunks as chunk_audio would: a single chunk pointing
+    at the WAV itself when the audio fits in one.
+    """
+    if settings.FFMPEG_SKIP_IF_COMPLIANT and src.suffix.lower() == ".wav" and _is_wav_16k_mono(src):
+        # Nothing to decode; chunk_audio's stream copy is already the cheap path
+        wav = ensure_wav_16k(src)
+        return wav, chunk_audio(wav, chunk_seconds)
+    wav = src.parent / "audio_16k.wav"
+    segment_list = src.parent / "chunks.csv"
+    pcm_16k_mono = ["-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le"]
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(src),
+        *pcm_16k_mono,
+        str(wav),
+        *pcm_16k_mono,
+        "-f",
+        "segment",
+        "-segment_time",
+        str(chunk_seconds),
+        "-reset_timestamps",
+        "1",
+        "-segment_list",
+        str(segment_list),
+        "-segment_list_type",
+        "csv",
+        str(src.parent / "chunk_%04d.wav"),
+    ]
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running ffmpeg command", extra={"command": " ".join(cmd)})
+    try:
+        _run_ffmpeg(cmd)
+        with segment_list.open(newline="") as f:
+            chunks = [Chunk(path=src.parent / Path(name).name, offset=float(start)) for name, start, _ in csv.reader(f)]
+    finally:
+        segment_list.unlink(missing_ok=True)
+    if len(chunks) == 1:
+        chunks[0].path.unlink(missing_ok=True)
+        chunks = [Chunk(path=wav, offset=0.0)]
+    return wav, chunks
+
+
+def _pipe_to_wav(ytdlp_cmd: List[str], wav: Path) -> None:
+    """Run yt-dlp writing to stdout and ffmpeg transcoding that stream straight to a 16k mono WAV."""
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        "pipe:0",
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-c:a",
+        "pcm_s16le",
+        str(wav),
+    ]
+    logger.info(
+        "Running streaming yt-dlp | ffmpeg download",
+        extra={"operation": "download", "command": redact_tokens_from_command(ytdlp_cmd)},
+    )
+    # Text mode only affects stderr here; stdout is handed to ffmpeg by file descriptor
+    ytdlp = subprocess.Popen(
+        ytdlp_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+    )
+    try:
+        ffmpeg = subprocess.Popen(
+            ffmpeg_cmd,
+            stdin=ytdlp.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+        )
+    except Exception:
+        ytdlp.kill()
+        ytdlp.wait()
+        raise
+    # Drop the parent's copy so yt-dlp sees a broken pipe if ffmpeg exits early
+    ytdlp.stdout.close()
+
+    # yt-dlp -v and its progress output go to stderr for the whole download; keep only the tail
+    ytdlp_tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=ytdlp_tail.extend, args=(ytdlp.stderr,), daemon=True)
+    drain.start()
+    # One deadline covers both processes so an attempt never outlives YTDLP_REQUEST_TIMEOUT
+    deadline = time.monotonic() + settings.YTDLP_REQUEST_TIMEOUT
+    try:
+        _, ffmpeg_stderr = ffmpeg.communicate(timeout=settings.YTDLP_REQUEST_TIMEOUT)
+        ytdlp.wait(timeout=max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired as e:
+        ffmpeg.kill()
+        ytdlp.kill()
+        ffmpeg.wait()
+        ytdlp.wait()
+        drain.join()
+        # communicate() attaches ffmpeg's partial output as bytes; yt-dlp's tail is what callers classify
+        raise subprocess.TimeoutExpired(e.cmd, e.timeout, stderr="".join(ytdlp_tail)) from e
+    finally:
+        drain.join()
+        ytdlp.stderr.close()
+
+    ytdlp_stderr = "".join(ytdlp_tail)
+    # Check ffmpeg first: when it dies early yt-dlp fails too, but only with a broken pipe
+    if ffmpeg.returncode != 0:
+        stderr = ffmpeg_stderr or ""
+        if ytdlp.returncode != 0:
+            stderr += f"\nyt-dlp exited with status {ytdlp.returncode}:\n{ytdlp_stderr}"
+        raise subprocess.CalledProcessError(ffmpeg.returncode, ffmpeg_cmd, stderr=stderr)
+    if ytdlp.returncode != 0:
+        raise subprocess.CalledProcessError(ytdlp.returncode, ytdlp_cmd, stderr=ytdlp_stderr)
+
+
+def _stream_with_strategy(url: str, wav: Path, strategy: ClientStrategy) -> None:
+    """Run one streaming yt-dlp | ffmpeg attempt, recording the same metrics as _download_with_strategy."""
+    po_tokens = _get_po_tokens()
+    has_token = bool(po_tokens)
+    cmd = _yt_dlp_cmd(Path("-"), url, strategy, po_tokens)
+
+    _pace_request()
+    start_time = time.time()
+    try:
+        _pipe_to_wav(cmd, wav)
+    except subprocess.CalledProcessError as e:
+        duration = time.time() - start_time
+        error_class = classify_error(e.returncode, e.stderr or "", e)
+        ytdlp_operation_duration_seconds.labels(operation="download", client=strategy.name).observe(duration)
+        ytdlp_operation_attempts_total.labels(operation="download", client=strategy.name, result="failure").inc()
+        ytdlp_operation_errors_total.labels(
+            operation="download", client=strategy.name, error_class=error_class.value
+        ).inc()
+        ytdlp_token_usage_total.labels(operation="download", has_token=str(has_token).lower()).inc()
+        raise
+
+    duration = time.time() - start_time
+    logger.info(
+        "Streaming download succeeded",
+        extra={
+            "operation": "download",
+            "client": strategy.name,
+            "duration_seconds": round(duration, 2),
+            "has_token": has_token,
+        },
+    )
+    ytdlp_operation_duration_seconds.labels(operation="download", client=strategy.name).observe(duration)
+    ytdlp_operation_attempts_total.labels(operation="download", client=strategy.name, result="success").inc()
+    ytdlp_token_usage_total.labels(operation="download", has_token=str(has_token).lower()).inc()
+
+
+def download_audio_to_wav(url: str, dest_dir: Path) -> Path:
+    """Download and transcode to 16 kHz mono WAV in one streaming pass.
+
+    yt-dlp writes the audio to stdout and ffmpeg resamples it as it arrives, so the
+    transcode overlaps the download and the intermediate raw.m4a is never written.
+    The attempt goes through the youtube_download circuit breaker. Terminal errors
+    (video unavailable, auth, PO token) are raised; other failures fall back to
+    download_audio + ensure_wav_16k with their full client fallback and retry handling.
+    """
+    wav = dest_dir / "audio_16k.wav"
+    strategy = _build_client_strategies()[0]
+    circuit_breaker = None
+    if settings.YTDLP_CIRCUIT_BREAKER_ENABLED:
+        circuit_breaker = get_circuit_breaker("youtube_download")
+
+    def stream_attempt() -> None:
+        _stream_with_strategy(url, wav, strategy)
+
+    try:
+        # An open breaker raises here without touching YouTube, and is not retried below
+        if circuit_breaker:
+            circuit_breaker.call(stream_attempt)
+        else:
+            stream_attempt()
+        youtube_requests_total.labels(operation="download", result="success").inc()
+        return wav
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        wav.unlink(missing_ok=True)
+        error_class = _classify_download_error(e)
+        if error_class in _STREAM_TERMINAL_ERROR_CLASSES:
+            logger.warning(
+                "Streaming download hit a terminal error, not falling back",
+                extra={"operation": "download", "client": strategy.name, "error_classification": error_class.value},
+            )
+            youtube_requests_total.labels(operation="download", result="failure").inc()
+            if error_class == ErrorClass.AUTH:
+                raise YouTubeAuthError(_DOWNLOAD_AUTH_ERROR) from e
+            raise
+        logger.warning(
+            "Streaming download failed, falling back to download then transcode",
+            extra={
+                "operation": "download",
+                "client": strategy.name,
+                "error_type": type(e).__name__,
+                "error_classification": error_class.value,
+                "stderr_snippet": (getattr(e, "stderr", None) or "")[:200],
+            },
+        )
+    return ensure_wav_16k(download_audio(url, dest_dir))
+
+
+# Probed durations are stored on the file (or next to it) with the mtime and size they were
+# measured at, so retries and job restarts skip ffprobe until the file is rewritten.
+_DURATION_XATTR = "user.duration_s"
+
+
+def duration_sidecar(path: Path) -> Path:
+    return path.with_name(path.name + ".duration")
+
+
+def _read_cached_duration(path: Path, stamp: str) -> Optional[float]:
+    try:
+        raw = os.getxattr(path, _DURATION_XATTR)
+    except (AttributeError, OSError):
+        try:
+            raw = duration_sidecar(path).read_bytes()
+        except OSError:
+            return None
+    cached_stamp, _, value = raw.decode(errors="replace").rpartition(" ")
+    if cached_stamp != stamp:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _write_cached_duration(path: Path, stamp: str, duration: float) -> None:
+    raw = f"{stamp} {duration!r}".encode()
+    try:
+        os.setxattr(path, _DURATION_XATTR, raw)
+        return
+    except (AttributeError, OSError):
+        pass  # no xattr support (e.g. macOS, tmpfs without user xattrs)
+    try:
+        duration_sidecar(path).write_bytes(raw)
+    except OSError as e:
+        logger.debug("Could not cache duration for %s: %s", path, e)
+
+
+def _wav_header_duration(path: Path, size: int) -> Optional[float]:
+    """Duration of a PCM WAV from its header, or None when the header can't be trusted.
+
+    Covers the WAVs ffmpeg writes for the pipeline without spawning ffprobe. Formats the
+    stdlib reader doesn't handle, and headers whose data size overruns the file (e.g. a
+    WAV written to a pipe), are left to ffprobe.
+    """
+    try:
+        with wave.open(str(path), "rb") as wf:
+            frames = wf.getnframes()
+            rate = wf.getframerate()
+            frame_bytes = wf.getsampwidth() * wf.getnchannels()
+    except (wave.Error, EOFError, OSError):
+        return None
+    if rate <= 0 or frames * frame_bytes > size:
+        return None
+    return frames / rate
+
+
 def get_duration_seconds(path: Path) -> float:
+    st = os.stat(path)
+    stamp = f"{st.st_mtime_ns} {st.st_size}"
+    cached = _read_cached_duration(path, stamp)
+    if cached is not None:
+        return cached
+    duration = _wav_header_duration(path, st.st_size) if path.suffix.lower() == ".wav" else None
+    if duration is not None:
+        _write_cached_duration(path, stamp, duration)
+        return duration
     cmd = [
         "ffprobe",
         "-hide_banner",
         "-v",
-        "info",
+        "error",
+        # The duration comes from the container header; don't analyse the stream contents
+        "-probesize",
+        "32768",
+        "-analyzeduration",
+        "0",
         "-show_entries",
         "format=duration",
         "-of",
         "default=noprint_wrappers=1:nokey=1",
         str(path),
     ]
-    logging.info("Running: %s", " ".join(cmd))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running: %s", " ".join(cmd))
     out = subprocess.check_output(cmd).decode().strip()
-    return float(out)
+    duration = float(out)
+    _write_cached_duration(path, stamp, duration)
+    return duration
 
 
 def chunk_audio(wav: Path, chunk_seconds: int):
     dur = get_duration_seconds(wav)
     if dur <= chunk_seconds:
-        logging.info("Duration %.2fs <= chunk size %ss, using single chunk", dur, chunk_seconds)
+        logger.info("Duration %.2fs <= chunk size %ss, using single chunk", dur, chunk_seconds)
         return [Chunk(path=wav, offset=0.0)]
-    chunks = []
-    idx = 0
-    start = 0.0
-    while start < dur:
-        end = min(start + chunk_seconds, dur)
-        chunk_path = wav.parent / f"chunk_{idx:04d}.wav"
-        cmd = [
-            "ffmpeg",
-            "-hide_banner",
-            "-loglevel",
-            "info",
-            "-y",
-            "-i",
-            str(wav),
-            "-ss",
-            f"{start}",
-            "-to",
-            f"{end}",
-            "-c",
-            "copy",
-            str(chunk_path),
-        ]
-        logging.info("Running: %s", " ".join(cmd))
-        subprocess.check_call(cmd)
-        chunks.append(Chunk(path=chunk_path, offset=start))
-        start = end
-        idx += 1
-    return chunks
+    # One segmenting pass writes every chunk; the CSV segment list reports which files were
+    # written and where each one starts, so stale chunks from an earlier run are never picked up.
+    segment_list = wav.parent / "chunks.csv"
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(wav),
+        "-f",
+        "segment",
+        "-segment_time",
+        str(chunk_seconds),
+        "-reset_timestamps",
+        "1",
+        "-segment_list",
+        str(segment_list),
+        "-segment_list_type",
+        "csv",
+        "-c",
+        "copy",
+        str(wav.parent / "chunk_%04d.wav"),
+    ]
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running: %s", " ".join(cmd))
+    try:
+        _run_ffmpeg(cmd)
+        with segment_list.open(newline="") as f:
+            return [Chunk(path=wav.parent / Path(name).name, offset=float(start)) for name, start, _ in csv.reader(f)]
+    finally:
+        segment_list.unlink(missing_ok=True)
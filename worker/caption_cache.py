@@ -0,0 +1,91 @@
+"""On-disk cache for downloaded YouTube caption payloads.
+
+Entries are keyed by YouTube video id and hold the selected track plus the raw caption bytes, so
+retries and backfills of the same video skip both the yt-dlp metadata probe and the download and
+only re-parse. The cache is disabled unless CAPTION_CACHE_DIR is set, and is bounded by
+CAPTION_CACHE_MAX_MB (least recently used entries are evicted first).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.logging_config import get_logger
+from app.settings import settings
+
+logger = get_logger(__name__)
+
+_SUFFIX = ".caption"
+
+
+def _cache_dir() -> Optional[Path]:
+    return Path(settings.CAPTION_CACHE_DIR) if settings.CAPTION_CACHE_DIR else None
+
+
+def _entry_path(cache_dir: Path, youtube_id: str) -> Path:
+    return cache_dir / (hashlib.sha256(youtube_id.encode()).hexdigest()[:32] + _SUFFIX)
+
+
+def get(youtube_id: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Return (track fields, payload) for a cached video, or None on a miss."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    path = _entry_path(cache_dir, youtube_id)
+    try:
+        raw = path.read_bytes()
+        header, _, payload = raw.partition(b"\n")
+        track = json.loads(header)
+        os.utime(path)  # refresh recency for eviction
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Discarding unreadable caption cache entry", extra={"youtube_id": youtube_id, "error": str(e)})
+        path.unlink(missing_ok=True)
+        return None
+    return track, payload
+
+
+def put(youtube_id: str, track: Dict[str, Any], payload: bytes) -> None:
+    """Store a downloaded caption payload; failures are logged and otherwise ignored."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return
+    tmp = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(track).encode() + b"\n" + payload)
+        os.replace(tmp, _entry_path(cache_dir, youtube_id))
+        tmp = None
+        _evict(cache_dir, settings.CAPTION_CACHE_MAX_MB * 1024 * 1024)
+    except OSError as e:
+        logger.warning("Failed to write caption cache entry", extra={"youtube_id": youtube_id, "error": str(e)})
+    finally:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def _evict(cache_dir: Path, max_bytes: int) -> None:
+    entries = []
+    total = 0
+    for path in cache_dir.glob(f"*{_SUFFIX}"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= max_bytes:
+            break
@@ -126,7 +126,7 @@ def _ingest_available_captions_impl(
                     VALUES (:t, :s, :e, :txt)
                 """
                     ),
-                    {"t": yt_tr_id, "s": int(s.start * 1000), "e": int(s.end * 1000), "txt": s.text},
+                    {"t": yt_tr_id, "s": s.start_ms, "e": s.end_ms, "txt": s.text},
                 )
             logger.info("Persisted %d YouTube caption segments for %s", len(segs), yid)
             video_repo.mark_caption_completed(str(vid))
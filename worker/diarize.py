@@ -1,4 +1,8 @@
+import contextlib
 import os
+import wave
+
+import numpy as np
 
 from app.logging_config import get_logger
 from app.settings import settings
@@ -6,11 +10,12 @@ from app.settings import settings
 logger = get_logger(__name__)
 
 _pipeline = None
+_pipeline_device = None
 _pyannote_import_error = None
 
 
 def _get_pipeline():
-    global _pipeline
+    global _pipeline, _pipeline_device
     if _pipeline is None:
         if not settings.ENABLE_DIARIZATION:
             logger.info("Diarization disabled; returning Whisper segments")
@@ -40,17 +45,21 @@ def _get_pipeline():
                 _pipeline = None
         if _pipeline is not None:
             device = settings.DIARIZATION_DEVICE.strip().lower()
-            if device and device != "auto":
+            if device:
                 try:
                     import torch
 
+                    if device == "auto":
+                        # Use the GPU when there is one; otherwise keep pyannote's default device
+                        device = "cuda" if torch.cuda.is_available() else ""
                     if device == "cuda" and not torch.cuda.is_available():
                         logger.warning(
                             "DIARIZATION_DEVICE=cuda requested but CUDA is not available; "
                             "leaving pyannote device unchanged"
                         )
-                    elif hasattr(_pipeline, "to"):
+                    elif device and hasattr(_pipeline, "to"):
                         _pipeline.to(torch.device(device))
+                        _pipeline_device = device
                         logger.info("Diarization pipeline moved to device", extra={"device": device})
                 except Exception as e:
                     logger.warning(
@@ -60,6 +69,35 @@ def _get_pipeline():
     return _pipeline
 
 
+def _inference_context():
+    """Autocast pyannote inference to float16 when DIARIZATION_FP16 is set and the pipeline is on CUDA."""
+    if not settings.DIARIZATION_FP16 or _pipeline_device != "cuda":
+        return contextlib.nullcontext()
+    import torch
+
+    return torch.autocast("cuda", dtype=torch.float16)
+
+
+def _read_pcm16_wav(wav_path):
+    """Decode a 16-bit PCM WAV to a float32 (channels, samples) array, or None for other formats.
+
+    This is what ensure_wav_16k produces, so the common case needs only the stdlib wave reader
+    and one numpy conversion, with no audio backend dispatch. Scaling matches torchaudio.load.
+    """
+    try:
+        with wave.open(str(wav_path), "rb") as wf:
+            if wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
+                return None
+            channels = wf.getnchannels()
+            sample_rate = wf.getframerate()
+            frames = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels).T.astype(np.float32, order="C")
+    samples /= 32768.0
+    return samples, sample_rate
+
+
 def _build_audio_input(wav_path):
     """Build pyannote input while avoiding torchcodec path decoding when possible.
 
@@ -70,6 +108,13 @@ def _build_audio_input(wav_path):
     the worker.
     """
     try:
+        pcm = _read_pcm16_wav(wav_path)
+        if pcm is not None:
+            import torch
+
+            samples, sample_rate = pcm
+            return {"waveform": torch.from_numpy(samples), "sample_rate": sample_rate}
+
         import torchaudio  # type: ignore
 
         waveform, sample_rate = torchaudio.load(str(wav_path))
@@ -94,7 +139,8 @@ def run_diarization(wav_path):
         raise RuntimeError("Diarization pipeline not available")
     logger.info("Running diarization", extra={"wav_path": str(wav_path)})
     diar_input = _build_audio_input(wav_path)
-    diar_output = pipe(diar_input) if callable(pipe) else pipe(str(wav_path))
+    with _inference_context():
+        diar_output = pipe(diar_input) if callable(pipe) else pipe(str(wav_path))
     diar = getattr(diar_output, "speaker_diarization", diar_output)
     diar_list = []
     label_first_time = {}
@@ -108,6 +154,27 @@ def run_diarization(wav_path):
     return diar_list, friendly
 
 
+def _match_turns(diar_list, times):
+    """Index into diar_list of the earliest-starting turn containing each time, or -1.
+
+    Bounds are inclusive. Turns are sorted by start once; for each time, the turns that
+    have started form a prefix, and the first of them still running is found by binary
+    search on the running maximum of their ends, so the lookup is O((N + M) log M)
+    instead of a scan of every turn per segment.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if not diar_list or times.size == 0:
+        return np.full(times.shape, -1, dtype=np.intp)
+    turns = np.asarray([(d[0], d[1]) for d in diar_list], dtype=np.float64)
+    order = np.argsort(turns[:, 0], kind="stable")
+    starts = turns[order, 0]
+    ends_max = np.maximum.accumulate(turns[order, 1])
+    started = np.searchsorted(starts, times, side="right")
+    first_running = np.searchsorted(ends_max, times, side="left")
+    found = first_running < started
+    return np.where(found, order[np.minimum(first_running, len(order) - 1)], -1)
+
+
 def diarize_and_align(wav_path, whisper_segments):
     try:
         pipe = _get_pipeline()
@@ -115,17 +182,17 @@ def diarize_and_align(wav_path, whisper_segments):
             logger.info("Diarization pipeline not available; returning whisper segments as-is")
             return whisper_segments
         diar_list, friendly = run_diarization(wav_path)
+        mids = [(w["start"] + w["end"]) / 2.0 for w in whisper_segments]
+        matches = _match_turns(diar_list, mids).tolist()
+        # map raw labels (e.g., SPEAKER_00) to friendly names once per turn, not per segment
+        turn_speakers = [friendly.get(d[2], d[2]) for d in diar_list]
         diar_segments = []
         speakers_assigned = 0
-        for w in whisper_segments:
-            w_mid = (w["start"] + w["end"]) / 2.0
+        for w, idx in zip(whisper_segments, matches, strict=True):
             speaker = None
-            for ds in diar_list:
-                if w_mid >= ds[0] and w_mid <= ds[1]:
-                    # map raw label (e.g., SPEAKER_00) to friendly name
-                    speaker = friendly.get(ds[2], ds[2])
-                    speakers_assigned += 1
-                    break
+            if idx >= 0:
+                speaker = turn_speakers[idx]
+                speakers_assigned += 1
             # Persist as both 'speaker' (raw) and 'speaker_label' (API/DB expected field)
             w["speaker"] = speaker
             w["speaker_label"] = speaker
@@ -7,7 +7,9 @@ and speaker formatting for transcript segments.
 
 import re
 import unicodedata
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
 
 from app.logging_config import get_logger
 from app.settings import settings
@@ -42,10 +44,55 @@ HALLUCINATION_PATTERNS = [
     r"^Thanks for watching\.$",
 ]
 
+# Tab, newline and Unicode space characters (including U+2000..U+200B) normalized to a plain space
+_WS_CHARS = "\t\r\n\u00a0\u202f\u205f\u3000" + "".join(map(chr, range(0x2000, 0x200C)))
+_WS_TABLE = str.maketrans(dict.fromkeys(_WS_CHARS, " "))
+
+# Patterns used on every segment, compiled once at import
+_RE_MULTISPACE = re.compile(r" {2,}")
+_RE_CONJ = re.compile(r"\b(and|but|so|yet)\s+(?!,)")
+_RE_INTRO = re.compile(r"^(however|therefore|thus|meanwhile|furthermore)\s+(?![,;:\-])", re.IGNORECASE)
+_RE_CAP_AFTER = re.compile(r"([.!?]\s+)([a-z])")
+_RE_SENT_SPLIT = re.compile(r"([.!?]+\s+)")
+_RE_SOUND_EVENTS = re.compile("|".join(re.escape(token) for token in SOUND_EVENT_TOKENS))
+_RE_GIBBERISH_STRIP = re.compile(r"[\s\.\,\!\?\uFFFD]+")
+_HALLUC_RES = [re.compile(p, re.IGNORECASE) for p in HALLUCINATION_PATTERNS]
+
+
+def _upper_after_boundary(match: re.Match) -> str:
+    return match.group(1) + match.group(2).upper()
+
+
+def _trie_alternation(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation for words, factored into a prefix trie.
+
+    Each branch is selected by its next character, so a failed match costs one character test per
+    trie level instead of one attempt per word. Longer words are tried before their prefixes, the
+    same preference as a longest-first alternation.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
 
 def _is_repetitive_gibberish(text: str) -> bool:
     """Detect repeated-character/syllable artifacts produced during music or silence."""
-    normalized = re.sub(r"[\s\.\,\!\?\uFFFD]+", "", text.strip())
+    normalized = _RE_GIBBERISH_STRIP.sub("", text.strip())
     if len(normalized) < 24:
         return False
 
@@ -53,51 +100,37 @@ def _is_repetitive_gibberish(text: str) -> bool:
     if len(unique_chars) <= 3:
         return True
 
-    most_common_count = max(normalized.count(char) for char in unique_chars)
-    if most_common_count / len(normalized) >= 0.70:
+    length = len(normalized)
+    if max(map(normalized.count, unique_chars)) / length >= 0.70:
         return True
 
+    # Text made of at most two distinct fixed-width units (at least 8 of them, trailing partial
+    # unit ignored). Ordinary speech shows a third distinct unit within the first few, so stop there.
     for width in range(1, 7):
-        units = [normalized[i : i + width] for i in range(0, len(normalized), width)]
-        full_units = [unit for unit in units if len(unit) == width]
-        if len(full_units) >= 8 and len(set(full_units)) <= 2:
+        full_end = length - length % width
+        if full_end // width < 8:
+            break
+        units = set()
+        for i in range(0, full_end, width):
+            units.add(normalized[i : i + width])
+            if len(units) > 2:
+                break
+        else:
             return True
 
     return False
 
 
-class TranscriptFormatter:
+@lru_cache(maxsize=1)
+def _default_config() -> Mapping[str, Any]:
     """
-    Format transcript segments with configurable transformations.
+    Formatter configuration from app settings, read once per process.
 
-    Supports:
-    - Unicode normalization
-    - Whitespace cleanup
-    - Special token removal
-    - Filler word removal
-    - Punctuation restoration
-    - Capitalization
-    - Sentence segmentation
-    - Speaker label formatting
+    Settings are fixed for the life of the process, so each formatter copies this
+    read-only mapping instead of reading every cleanup setting again.
     """
-
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        """
-        Initialize formatter with configuration.
-
-        Args:
-            config: Optional dict to override settings. If None, uses app settings.
-        """
-        # Load defaults first
-        self.config = self._load_default_config()
-
-        # Override with provided config if any
-        if config:
-            self.config.update(config)
-
-    def _load_default_config(self) -> Dict[str, Any]:
-        """Load configuration from app settings."""
-        return {
+    return MappingProxyType(
+        {
             "enabled": settings.CLEANUP_ENABLED,
             # Normalization
             "normalize_unicode": settings.CLEANUP_NORMALIZE_UNICODE,
@@ -124,6 +157,40 @@ class TranscriptFormatter:
             "detect_hallucinations": settings.CLEANUP_DETECT_HALLUCINATIONS,
             "language_specific_rules": settings.CLEANUP_LANGUAGE_SPECIFIC_RULES,
         }
+    )
+
+
+class TranscriptFormatter:
+    """
+    Format transcript segments with configurable transformations.
+
+    Supports:
+    - Unicode normalization
+    - Whitespace cleanup
+    - Special token removal
+    - Filler word removal
+    - Punctuation restoration
+    - Capitalization
+    - Sentence segmentation
+    - Speaker label formatting
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize formatter with configuration.
+
+        Args:
+            config: Optional dict to override settings. If None, uses app settings.
+        """
+        # Load defaults first
+        self.config = dict(_default_config())
+
+        # Override with provided config if any
+        if config:
+            self.config.update(config)
+
+        # Compiled filler patterns keyed by filler_level
+        self._filler_re_cache: Dict[int, re.Pattern] = {}
 
     def format_segments(self, segments: List[Dict[str, Any]], language: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -141,45 +208,52 @@ class TranscriptFormatter:
 
         logger.debug(f"Formatting {len(segments)} segments", extra={"language": language})
 
+        # Resolve the enabled transformations once, in application order. Steps before the
+        # hallucination check see the normalized text; the rest only run on kept segments.
+        config = self.config
+        pre_steps: List[Callable[[str], str]] = []
+        if config["normalize_unicode"]:
+            pre_steps.append(self._normalize_unicode)
+        if config["normalize_whitespace"]:
+            pre_steps.append(self._normalize_whitespace)
+        if config["remove_special_tokens"]:
+            pre_steps.append(self._remove_special_tokens)
+
+        post_steps: List[Callable[[str], str]] = []
+        if config["remove_fillers"]:
+            post_steps.append(self._remove_fillers)
+        if config["fix_all_caps"]:
+            post_steps.append(self._fix_all_caps)
+        # Punctuation and capitalization
+        if config["punctuation_mode"] == "rule-based":
+            if config["add_sentence_punctuation"]:
+                post_steps.append(self._add_sentence_punctuation)
+            if config["add_internal_punctuation"]:
+                post_steps.append(self._add_internal_punctuation)
+        if config["capitalize_sentences"]:
+            post_steps.append(self._capitalize_sentences)
+
+        detect_hallucinations = config["detect_hallucinations"]
+        is_hallucination = self._is_hallucination
+
         # Apply text transformations to each segment
         formatted = []
         for seg in segments:
-            formatted_seg = seg.copy()
             text = seg.get("text", "")
+            for step in pre_steps:
+                text = step(text)
 
-            # Apply transformations in order
-            if self.config["normalize_unicode"]:
-                text = self._normalize_unicode(text)
-
-            if self.config["normalize_whitespace"]:
-                text = self._normalize_whitespace(text)
-
-            if self.config["remove_special_tokens"]:
-                text = self._remove_special_tokens(text)
-
-            if self.config["detect_hallucinations"]:
-                if self._is_hallucination(text):
-                    logger.debug(f"Detected hallucination, skipping segment: {text[:50]}")
-                    continue
-
-            if self.config["remove_fillers"]:
-                text = self._remove_fillers(text)
-
-            if self.config["fix_all_caps"]:
-                text = self._fix_all_caps(text)
-
-            # Punctuation and capitalization
-            if self.config["punctuation_mode"] == "rule-based":
-                if self.config["add_sentence_punctuation"]:
-                    text = self._add_sentence_punctuation(text)
-                if self.config["add_internal_punctuation"]:
-                    text = self._add_internal_punctuation(text)
+            if detect_hallucinations and is_hallucination(text):
+                logger.debug(f"Detected hallucination, skipping segment: {text[:50]}")
+                continue
 
-            if self.config["capitalize_sentences"]:
-                text = self._capitalize_sentences(text)
+            for step in post_steps:
+                text = step(text)
 
-            formatted_seg["text"] = text.strip()
-            if formatted_seg["text"]:  # Only include non-empty segments
+            text = text.strip()
+            if text:  # Only include non-empty segments
+                formatted_seg = seg.copy()
+                formatted_seg["text"] = text
                 formatted.append(formatted_seg)
 
         # Apply segmentation transformations
@@ -207,9 +281,9 @@ class TranscriptFormatter:
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace characters."""
         # Replace various whitespace chars with regular space
-        text = re.sub(r"[\t\r\n\u00a0\u2000-\u200b\u202f\u205f\u3000]+", " ", text)
+        text = text.translate(_WS_TABLE)
         # Collapse multiple spaces
-        text = re.sub(r" {2,}", " ", text)
+        text = _RE_MULTISPACE.sub(" ", text)
         return text.strip()
 
     def _remove_special_tokens(self, text: str) -> str:
@@ -217,10 +291,7 @@ class TranscriptFormatter:
         if self.config["preserve_sound_events"]:
             return text
 
-        for token in SOUND_EVENT_TOKENS:
-            text = text.replace(token, "")
-
-        return text.strip()
+        return _RE_SOUND_EVENTS.sub("", text).strip()
 
     def _is_hallucination(self, text: str) -> bool:
         """Detect if text is likely a Whisper hallucination."""
@@ -231,8 +302,8 @@ class TranscriptFormatter:
             return True
 
         # Match known patterns
-        for pattern in HALLUCINATION_PATTERNS:
-            if re.match(pattern, text, re.IGNORECASE):
+        for pattern in _HALLUC_RES:
+            if pattern.match(text):
                 return True
 
         if _is_repetitive_gibberish(text):
@@ -246,17 +317,20 @@ class TranscriptFormatter:
         if level == 0:
             return text
 
-        # Collect all fillers up to the specified level
-        fillers_to_remove = set()
-        for i in range(1, min(level + 1, 4)):
-            fillers_to_remove.update(FILLER_WORDS.get(i, set()))
+        pattern = self._filler_re_cache.get(level)
+        if pattern is None:
+            # Collect all fillers up to the specified level
+            fillers_to_remove = set()
+            for i in range(1, min(level + 1, 4)):
+                fillers_to_remove.update(FILLER_WORDS.get(i, set()))
 
-        # Build pattern for word boundaries
-        pattern = r"\b(" + "|".join(re.escape(f) for f in fillers_to_remove) + r")\b"
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+            # Build pattern for word boundaries
+            pattern = re.compile(r"\b(" + _trie_alternation(fillers_to_remove) + r")\b", re.IGNORECASE)
+            self._filler_re_cache[level] = pattern
+        text = pattern.sub("", text)
 
         # Clean up extra spaces
-        text = re.sub(r" {2,}", " ", text)
+        text = _RE_MULTISPACE.sub(" ", text)
         return text.strip()
 
     def _fix_all_caps(self, text: str) -> str:
@@ -303,15 +377,10 @@ class TranscriptFormatter:
     def _add_internal_punctuation(self, text: str) -> str:
         """Add commas and internal punctuation (simple heuristics)."""
         # Add comma after common conjunctions if missing
-        text = re.sub(r"\b(and|but|so|yet)\s+(?!,)", r"\1, ", text)
+        text = _RE_CONJ.sub(r"\1, ", text)
 
         # Add comma after introductory phrases, but only if not already followed by punctuation
-        text = re.sub(
-            r"^(however|therefore|thus|meanwhile|furthermore)\s+(?![,;:\-])",
-            r"\1, ",
-            text,
-            flags=re.IGNORECASE,
-        )
+        text = _RE_INTRO.sub(r"\1, ", text)
 
         return text
 
@@ -324,8 +393,11 @@ class TranscriptFormatter:
         if text[0].islower():
             text = text[0].upper() + text[1:]
 
-        # Capitalize after sentence endings
-        text = re.sub(r"([.!?]\s+)([a-z])", lambda m: m.group(1) + m.group(2).upper(), text)
+        # Capitalize after sentence endings. Most segments hold one sentence, so skip the regex
+        # unless a mark appears before the last character (a boundary needs whitespace after it).
+        last = len(text) - 1
+        if text.find(".", 0, last) >= 0 or text.find("!", 0, last) >= 0 or text.find("?", 0, last) >= 0:
+            text = _RE_CAP_AFTER.sub(_upper_after_boundary, text)
 
         return text
 
@@ -336,35 +408,25 @@ class TranscriptFormatter:
         for seg in segments:
             text = seg["text"]
 
-            # Simple sentence boundary detection
-            sentences = re.split(r"([.!?]+\s+)", text)
+            # Simple sentence boundary detection: each sentence runs through its terminal
+            # punctuation and trailing whitespace, and is sliced straight out of the text
+            ends = [m.end() for m in _RE_SENT_SPLIT.finditer(text)]
 
-            if len(sentences) <= 1:
+            if not ends:
                 result.append(seg)
                 continue
+            ends.append(len(text))
 
             # Calculate time per character for proportional splitting
             duration_ms = seg["end"] - seg["start"]
-            chars_total = len(text)
-            if chars_total == 0:
-                result.append(seg)
-                continue
-
-            ms_per_char = duration_ms / chars_total
+            ms_per_char = duration_ms / len(text)
             current_start = seg["start"]
 
-            # Reconstruct sentences and create segments
-            i = 0
-            while i < len(sentences):
-                sentence = sentences[i]
-                # Always append the punctuation (and whitespace) if present
-                if i + 1 < len(sentences):
-                    sentence += sentences[i + 1]
-                    i += 2
-                else:
-                    i += 1
-
-                sentence = sentence.strip()
+            # Create a segment per sentence
+            prev = 0
+            for end in ends:
+                sentence = text[prev:end].strip()
+                prev = end
                 if not sentence:
                     continue
 
@@ -393,14 +455,25 @@ class TranscriptFormatter:
         max_gap = self.config["max_gap_for_merge_ms"]
 
         result = []
-        current = segments[0].copy()
-
-        for i in range(1, len(segments)):
-            next_seg = segments[i]
+        # The run being built: its first segment, the texts merged into it so far and its end time.
+        # Segments are only copied when something was merged into them.
+        current = segments[0]
+        parts = [current["text"]]
+        current_end = current["end"]
+
+        def commit() -> None:
+            if len(parts) == 1:
+                result.append(current)
+            else:
+                merged = current.copy()
+                merged["text"] = " ".join(parts)
+                merged["end"] = current_end
+                result.append(merged)
 
+        for next_seg in segments[1:]:
             # Check if should merge
-            duration = current["end"] - current["start"]
-            gap = next_seg["start"] - current["end"]
+            duration = current_end - current["start"]
+            gap = next_seg["start"] - current_end
 
             # Check speaker compatibility (don't merge different speakers)
             same_speaker = current.get("speaker") == next_seg.get("speaker")
@@ -416,13 +489,15 @@ class TranscriptFormatter:
 
             if should_merge:
                 # Merge segments
-                current["text"] = current["text"] + " " + next_seg["text"]
-                current["end"] = next_seg["end"]
+                parts.append(next_seg["text"])
+                current_end = next_seg["end"]
             else:
-                result.append(current)
-                current = next_seg.copy()
+                commit()
+                current = next_seg
+                parts = [current["text"]]
+                current_end = current["end"]
 
-        result.append(current)
+        commit()
         return result
 
     def _format_speakers(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -13,9 +13,17 @@ from app.logging_config import get_logger
 from app.settings import settings
 from app.transcripts.blocks import build_transcript_blocks
 from app.transcripts.types import TranscriptSegment
-from worker.audio import Chunk, chunk_audio, download_audio, ensure_wav_16k
+from worker.audio import (
+    Chunk,
+    chunk_audio,
+    download_audio,
+    download_audio_to_wav,
+    duration_sidecar,
+    ensure_wav_16k,
+    ensure_wav_16k_chunked,
+)
 from worker.diarize import diarize_and_align
-from worker.whisper_runner import transcribe_chunk
+from worker.whisper_runner import transcribe_chunk, transcribe_chunks
 from worker.youtube.service import get_youtube_service
 
 
@@ -30,8 +38,11 @@ class NativePipelineDependencies:
     logger: Any = logger
     download_audio: Callable[[str, Path], Path] = download_audio
     ensure_wav_16k: Callable[[Path], Path] = ensure_wav_16k
+    ensure_wav_16k_chunked: Callable[[Path, int], tuple[Path, list[Chunk]]] = ensure_wav_16k_chunked
+    download_audio_to_wav: Callable[[str, Path], Path] = download_audio_to_wav
     chunk_audio: Callable[[Path, int], list[Chunk]] = chunk_audio
     transcribe_chunk: Callable[..., tuple[list[dict[str, Any]], dict[str, Any] | None]] = transcribe_chunk
+    transcribe_chunks: Callable[..., list[tuple[list[dict[str, Any]], dict[str, Any] | None]]] = transcribe_chunks
     diarize_and_align: Callable[[Path, list[dict[str, Any]]], list[dict[str, Any]]] = diarize_and_align
     replace_transcript_blocks: Callable[[Any, Any, list[Any]], Any] = crud.replace_transcript_blocks
     refresh_job_state: Callable[[Any, Any], None] | None = None
@@ -160,6 +171,10 @@ def _load_job_meta_and_quality_settings(ctx: VideoPipelineContext, deps: NativeP
 def _download_and_transcode(ctx: VideoPipelineContext, deps: NativePipelineDependencies) -> None:
     from worker.metrics import download_duration_seconds, transcode_duration_seconds
 
+    if getattr(deps.settings, "AUDIO_STREAMING_DOWNLOAD", False):
+        _stream_download_to_wav(ctx, deps)
+        return
+
     deps.logger.info("Downloading audio", extra={"youtube_id": ctx.youtube_id, "stage": "downloading"})
     download_start = time.time()
     raw_path = deps.download_audio(f"https://www.youtube.com/watch?v={ctx.youtube_id}", ctx.work_dir)
@@ -176,7 +191,11 @@ def _download_and_transcode(ctx: VideoPipelineContext, deps: NativePipelineDepen
 
     deps.logger.info("Converting to wav 16k", extra={"stage": "transcoding"})
     transcode_start = time.time()
-    wav_path = deps.ensure_wav_16k(raw_path)
+    if getattr(deps.settings, "FFMPEG_FUSED_CHUNKING", False):
+        # Cut the transcription chunks in the same ffmpeg pass; _transcribe_chunks reuses them
+        wav_path, ctx.chunks = deps.ensure_wav_16k_chunked(raw_path, deps.settings.CHUNK_SECONDS)
+    else:
+        wav_path = deps.ensure_wav_16k(raw_path)
     ctx.wav_path = wav_path
     transcode_duration = time.time() - transcode_start
     transcode_duration_seconds.observe(transcode_duration)
@@ -189,6 +208,26 @@ def _download_and_transcode(ctx: VideoPipelineContext, deps: NativePipelineDepen
         )
 
 
+def _stream_download_to_wav(ctx: VideoPipelineContext, deps: NativePipelineDependencies) -> None:
+    from worker.metrics import download_duration_seconds
+
+    deps.logger.info("Downloading and transcoding audio", extra={"youtube_id": ctx.youtube_id, "stage": "downloading"})
+    download_start = time.time()
+    wav_path = deps.download_audio_to_wav(f"https://www.youtube.com/watch?v={ctx.youtube_id}", ctx.work_dir)
+    ctx.wav_path = wav_path
+    # Only written if the streaming attempt fell back to download-then-transcode; cleanup checks it exists
+    ctx.raw_path = ctx.work_dir / "raw.m4a"
+    download_duration = time.time() - download_start
+    download_duration_seconds.observe(download_duration)
+    deps.logger.info("Download and transcode completed", extra={"duration_seconds": round(download_duration, 2)})
+
+    with ctx.engine.begin() as conn:
+        conn.execute(
+            text("UPDATE videos SET wav_path=:p, state='transcribing', updated_at=now() WHERE id=:i"),
+            {"p": str(wav_path), "i": ctx.video_id},
+        )
+
+
 def _quality_setting(ctx: VideoPipelineContext, key: str, default: Any) -> Any:
     value = ctx.quality_settings.get(key)
     return default if value is None else value
@@ -198,11 +237,12 @@ def _transcribe_chunks(ctx: VideoPipelineContext, deps: NativePipelineDependenci
     if ctx.wav_path is None:
         raise RuntimeError("Audio has not been transcoded yet")
 
-    deps.logger.info(
-        "Chunking audio",
-        extra={"max_chunk_seconds": deps.settings.CHUNK_SECONDS, "stage": "transcribing"},
-    )
-    ctx.chunks = deps.chunk_audio(ctx.wav_path, deps.settings.CHUNK_SECONDS)
+    if not ctx.chunks:
+        deps.logger.info(
+            "Chunking audio",
+            extra={"max_chunk_seconds": deps.settings.CHUNK_SECONDS, "stage": "transcribing"},
+        )
+        ctx.chunks = deps.chunk_audio(ctx.wav_path, deps.settings.CHUNK_SECONDS)
     deps.logger.info("Audio chunks created", extra={"chunk_count": len(ctx.chunks)})
 
     from worker.metrics import (
@@ -221,51 +261,85 @@ def _transcribe_chunks(ctx: VideoPipelineContext, deps: NativePipelineDependenci
 
     transcription_start = time.time()
     ctx.all_segments = []
-
-    for c in ctx.chunks:
-        ct0 = time.time()
-        deps.logger.info("Transcribing chunk", extra={"chunk_file": c.path.name, "offset_seconds": c.offset})
-        segs, lang_info = deps.transcribe_chunk(
-            c.path,
-            language=language,
-            beam_size=beam_size,
-            temperature=temperature,
-            word_timestamps=word_timestamps,
-            vad_filter=vad_filter,
-        )
-
-        if ctx.detected_language is None and lang_info:
-            ctx.detected_language = lang_info.get("language")
-            ctx.language_probability = lang_info.get("language_probability")
+    options = {
+        "language": language,
+        "beam_size": beam_size,
+        "temperature": temperature,
+        "word_timestamps": word_timestamps,
+        "vad_filter": vad_filter,
+    }
+
+    batch_chunks = getattr(deps.settings, "WHISPER_BATCH_CHUNKS", False)
+    if batch_chunks and not language:
+        # transcribe_chunks detects one language for the whole batch; keep per-chunk detection
+        deps.logger.info("Language not set, transcribing chunks one at a time", extra={"chunk_count": len(ctx.chunks)})
+        batch_chunks = False
+
+    if batch_chunks:
+        # One batched decoder pass over every chunk instead of a forward pass sequence per chunk
+        deps.logger.info("Batch transcribing chunks", extra={"chunk_count": len(ctx.chunks)})
+        bt0 = time.time()
+        results = deps.transcribe_chunks([c.path for c in ctx.chunks], **options)
+        # Chunks share one decoder pass, so each is attributed an equal share of its time
+        chunk_duration = (time.time() - bt0) / max(len(ctx.chunks), 1)
+        for c, (segs, lang_info) in zip(ctx.chunks, results, strict=True):
+            _add_chunk_segments(ctx, deps, c, segs, lang_info)
+            whisper_chunk_transcription_seconds.labels(model=deps.settings.WHISPER_MODEL).observe(chunk_duration)
             deps.logger.info(
-                "Language detected",
-                extra={"language": ctx.detected_language, "probability": ctx.language_probability},
+                "Chunk transcription complete",
+                extra={
+                    "chunk_file": c.path.name,
+                    "segment_count": len(segs),
+                    "duration_seconds": round(chunk_duration, 2),
+                },
+            )
+    else:
+        for c in ctx.chunks:
+            ct0 = time.time()
+            deps.logger.info("Transcribing chunk", extra={"chunk_file": c.path.name, "offset_seconds": c.offset})
+            segs, lang_info = deps.transcribe_chunk(c.path, **options)
+            _add_chunk_segments(ctx, deps, c, segs, lang_info)
+            chunk_duration = time.time() - ct0
+            whisper_chunk_transcription_seconds.labels(model=deps.settings.WHISPER_MODEL).observe(chunk_duration)
+            deps.logger.info(
+                "Chunk transcription complete",
+                extra={
+                    "chunk_file": c.path.name,
+                    "segment_count": len(segs),
+                    "duration_seconds": round(chunk_duration, 2),
+                },
             )
-
-        for s in segs:
-            s["start"] += c.offset
-            s["end"] += c.offset
-            if "words" in s:
-                for w in s["words"]:
-                    w["start"] += c.offset
-                    w["end"] += c.offset
-        ctx.all_segments.extend(segs)
-        chunk_duration = time.time() - ct0
-        whisper_chunk_transcription_seconds.labels(model=deps.settings.WHISPER_MODEL).observe(chunk_duration)
-        deps.logger.info(
-            "Chunk transcription complete",
-            extra={
-                "chunk_file": c.path.name,
-                "segment_count": len(segs),
-                "duration_seconds": round(chunk_duration, 2),
-            },
-        )
 
     total_transcription_duration = time.time() - transcription_start
     transcription_duration_seconds.labels(model=deps.settings.WHISPER_MODEL).observe(total_transcription_duration)
     deps.logger.info("All chunks transcribed", extra={"duration_seconds": round(total_transcription_duration, 2)})
 
 
+def _add_chunk_segments(
+    ctx: VideoPipelineContext,
+    deps: NativePipelineDependencies,
+    chunk: Chunk,
+    segs: list[dict[str, Any]],
+    lang_info: dict[str, Any] | None,
+) -> None:
+    if ctx.detected_language is None and lang_info:
+        ctx.detected_language = lang_info.get("language")
+        ctx.language_probability = lang_info.get("language_probability")
+        deps.logger.info(
+            "Language detected",
+            extra={"language": ctx.detected_language, "probability": ctx.language_probability},
+        )
+
+    for s in segs:
+        s["start"] += chunk.offset
+        s["end"] += chunk.offset
+        if "words" in s:
+            for w in s["words"]:
+                w["start"] += chunk.offset
+                w["end"] += chunk.offset
+    ctx.all_segments.extend(segs)
+
+
 def _apply_diarization(ctx: VideoPipelineContext, deps: NativePipelineDependencies) -> None:
     ctx.diar_segments = ctx.all_segments
     if deps.settings.ENABLE_DIARIZATION and deps.settings.DIARIZATION_INLINE:
@@ -447,6 +521,8 @@ def _cleanup(ctx: VideoPipelineContext, deps: NativePipelineDependencies) -> Non
         if getattr(deps.settings, "CLEANUP_DELETE_WAV", False) and not preserve_wav_for_diarization and ctx.wav_path and ctx.wav_path.exists():
             ctx.wav_path.unlink(missing_ok=True)
             removed.append(Path(ctx.wav_path).name)
+            # get_duration_seconds leaves a sidecar next to the wav where xattrs are unsupported
+            duration_sidecar(ctx.wav_path).unlink(missing_ok=True)
         if getattr(deps.settings, "CLEANUP_DELETE_RAW", False) and ctx.raw_path and ctx.raw_path.exists():
             ctx.raw_path.unlink(missing_ok=True)
             removed.append(Path(ctx.raw_path).name)
@@ -13,12 +13,12 @@ from app.logging_config import get_logger
 from app.settings import settings
 from app.transcripts.blocks import build_transcript_blocks
 from app.transcripts.types import TranscriptSegment
-from worker.audio import chunk_audio, download_audio, ensure_wav_16k
+from worker.audio import chunk_audio, download_audio, download_audio_to_wav, ensure_wav_16k, ensure_wav_16k_chunked
 from worker.caption_ingest import ingest_captions_for_unprocessed_videos
 from worker.diarize import diarize_and_align
 from worker.native_pipeline import NativePipelineDependencies, process_video as process_native_video
 from worker.state_model import ACTIVE_VIDEO_STATES, OPEN_CAPTION_INGEST_STATES, TERMINAL_VIDEO_STATES, sql_string_list
-from worker.whisper_runner import transcribe_chunk
+from worker.whisper_runner import transcribe_chunk, transcribe_chunks
 from worker.youtube.service import get_youtube_service
 
 WORKDIR = Path("/data")  # mount volume externally
@@ -500,8 +500,11 @@ def process_video(engine, video_id):
         logger=logger,
         download_audio=download_audio,
         ensure_wav_16k=ensure_wav_16k,
+        ensure_wav_16k_chunked=ensure_wav_16k_chunked,
+        download_audio_to_wav=download_audio_to_wav,
         chunk_audio=chunk_audio,
         transcribe_chunk=transcribe_chunk,
+        transcribe_chunks=transcribe_chunks,
         diarize_and_align=diarize_and_align,
         replace_transcript_blocks=crud.replace_transcript_blocks,
         refresh_job_state=refresh_job_state,
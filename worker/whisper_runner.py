@@ -1,7 +1,13 @@
+import bisect
+import functools
 import os
+import re
+import threading
+import time
 import warnings
-from typing import Any, Optional
+from typing import Any, NotRequired, Optional, TypedDict
 
+import numpy as np
 import torch
 
 from app.logging_config import get_logger
@@ -13,12 +19,19 @@ warnings.filterwarnings("ignore", category=FutureWarning, module="whisper")
 
 logger = get_logger(__name__)
 
+SAMPLE_RATE = 16000
+# Whisper decodes fixed 30s windows
+WINDOW_SECONDS = 30
+
 _ct2: Optional[Any] = None
 _torch_whisper: Optional[Any] = None
 
-_model: Optional[Any] = None
+_model_lock = threading.Lock()
 _fallback_ct2_model: Optional[Any] = None
 
+# Known ROCm fault signatures that trigger the CT2 fallback in the PyTorch backend
+_ROCM_FAULT_RE = re.compile(r"Memory access fault|hipError|HSA_STATUS_ERROR")
+
 
 def _lazy_imports():
     global _ct2, _torch_whisper
@@ -65,81 +78,107 @@ def _try_load_torch(model_name: str, force_gpu: bool):
     # Suppress weights_only FutureWarning for trusted OpenAI models
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", category=FutureWarning, message=".*torch.load.*weights_only.*")
-        return _torch_whisper.load_model(model_name, device=str(device))
+        model = _torch_whisper.load_model(model_name, device=str(device))
+    if settings.WHISPER_TORCH_COMPILE:
+        # The encoder always sees fixed 30s mel windows, so it compiles once; the decoder's
+        # growing kv-cache shapes would keep recompiling and is left eager.
+        logger.info("Compiling openai-whisper encoder with torch.compile")
+        model.encoder = torch.compile(model.encoder)
+    return model
+
+
+def _load_ct2_force_gpu(model_name: str):
+    """Try every configured GPU device/model/compute type until one loads."""
+    devices = [d.strip() for d in settings.GPU_DEVICE_PREFERENCE.split(",") if d.strip()]
+    compute_types = [c.strip() for c in settings.GPU_COMPUTE_TYPES.split(",") if c.strip()]
+    models = [m.strip() for m in settings.GPU_MODEL_FALLBACKS.split(",") if m.strip()]
+    if model_name not in models:
+        models.insert(0, model_name)
+    else:
+        models = [model_name] + [m for m in models if m != model_name]
+
+    last_err = None
+    for dev in devices:
+        for fallback_model in models:
+            for ctype in compute_types:
+                try:
+                    logger.info(
+                        "FORCE_GPU enabled - trying configuration",
+                        extra={"device": dev, "model": fallback_model, "compute_type": ctype},
+                    )
+                    model = _try_load_ct2(fallback_model, device=dev, compute_type=ctype)
+                    logger.info(
+                        "Model loaded on GPU successfully",
+                        extra={"device": dev, "model": fallback_model, "compute_type": ctype},
+                    )
+                    return model
+                except Exception as e:
+                    last_err = e
+                    logger.warning(
+                        "GPU load failed",
+                        extra={
+                            "device": dev,
+                            "model": fallback_model,
+                            "compute_type": ctype,
+                            "error": str(e),
+                        },
+                    )
+                    continue
+    raise RuntimeError(f"FORCE_GPU is true but no GPU configuration succeeded: {last_err}")
+
+
+@functools.cache
+def _get_model_cached(backend: str, model_name: str, force_gpu: bool):
+    """Load the Whisper model once per (backend, model, force_gpu); failures are not cached."""
+    from worker.metrics import whisper_model_load_seconds
+
+    load_start = time.time()
+    # Checked in order of how deployments are configured: the default faster-whisper on
+    # device=auto needs no GPU_* parsing, so it goes first.
+    if backend != "whisper" and not force_gpu:
+        # Device auto, try half then float32
+        try:
+            model = _try_load_ct2(model_name, device="auto", compute_type="float16")
+        except Exception:
+            logger.warning("Half precision failed; retrying with float32 on device=auto")
+            model = _try_load_ct2(model_name, device="auto", compute_type="float32")
+    elif backend != "whisper":
+        # faster-whisper (CTranslate2) path with FORCE_GPU device/model/compute-type search
+        model = _load_ct2_force_gpu(model_name)
+    else:
+        # PyTorch Whisper path (ROCm-compatible when torch is ROCm build)
+        model = _try_load_torch(model_name, force_gpu)
+
+    load_duration = time.time() - load_start
+    whisper_model_load_seconds.labels(model=model_name, backend=backend).observe(load_duration)
+    logger.info("Model loaded", extra={"duration_seconds": round(load_duration, 2)})
+    return model
 
 
 def _get_model():
-    import time
+    # functools.cache alone would let two threads load a multi-GB model concurrently on first use
+    with _model_lock:
+        return _get_model_cached(settings.WHISPER_BACKEND, settings.WHISPER_MODEL, settings.FORCE_GPU)
 
-    from worker.metrics import whisper_model_load_seconds
 
-    global _model
-    if _model is None:
-        load_start = time.time()
-        if settings.WHISPER_BACKEND == "whisper":
-            # PyTorch Whisper path (ROCm-compatible when torch is ROCm build)
-            _model = _try_load_torch(settings.WHISPER_MODEL, settings.FORCE_GPU)
-        else:
-            # faster-whisper (CTranslate2) path
-            if settings.FORCE_GPU:
-                devices = [d.strip() for d in settings.GPU_DEVICE_PREFERENCE.split(",") if d.strip()]
-                compute_types = [c.strip() for c in settings.GPU_COMPUTE_TYPES.split(",") if c.strip()]
-                models = [m.strip() for m in settings.GPU_MODEL_FALLBACKS.split(",") if m.strip()]
-                if settings.WHISPER_MODEL not in models:
-                    models.insert(0, settings.WHISPER_MODEL)
-                else:
-                    models = [settings.WHISPER_MODEL] + [m for m in models if m != settings.WHISPER_MODEL]
-
-                last_err = None
-                for dev in devices:
-                    for model_name in models:
-                        for ctype in compute_types:
-                            try:
-                                logger.info(
-                                    "FORCE_GPU enabled - trying configuration",
-                                    extra={"device": dev, "model": model_name, "compute_type": ctype},
-                                )
-                                _model = _try_load_ct2(model_name, device=dev, compute_type=ctype)
-                                logger.info(
-                                    "Model loaded on GPU successfully",
-                                    extra={"device": dev, "model": model_name, "compute_type": ctype},
-                                )
-                                # Removed duplicate metric observation to prevent double counting.
-                                return _model
-                            except Exception as e:
-                                last_err = e
-                                logger.warning(
-                                    "GPU load failed",
-                                    extra={
-                                        "device": dev,
-                                        "model": model_name,
-                                        "compute_type": ctype,
-                                        "error": str(e),
-                                    },
-                                )
-                                continue
-                raise RuntimeError(f"FORCE_GPU is true but no GPU configuration succeeded: {last_err}")
-            else:
-                # Device auto, try half then float32
-                try:
-                    _model = _try_load_ct2(settings.WHISPER_MODEL, device="auto", compute_type="float16")
-                except Exception:
-                    logger.warning("Half precision failed; retrying with float32 on device=auto")
-                    _model = _try_load_ct2(settings.WHISPER_MODEL, device="auto", compute_type="float32")
-
-        load_duration = time.time() - load_start
-        whisper_model_load_seconds.labels(model=settings.WHISPER_MODEL, backend=settings.WHISPER_BACKEND).observe(
-            load_duration
-        )
-        logger.info("Model loaded", extra={"duration_seconds": round(load_duration, 2)})
-    return _model
+def _ct2_cuda_device_count() -> int:
+    """Number of GPUs visible to CTranslate2 (CUDA or HIP builds), 0 if unavailable."""
+    try:
+        import ctranslate2
+
+        return ctranslate2.get_cuda_device_count()
+    except Exception:
+        return 0
 
 
 def _get_ct2_fallback_model():
     """Load a ROCm HIP CTranslate2 model as a fallback when PyTorch whisper crashes on ROCm."""
     global _fallback_ct2_model
     if _fallback_ct2_model is None:
+        # int8 weights roughly halve memory traffic versus float32 at negligible accuracy cost
+        quantized = "int8_float16" if _ct2_cuda_device_count() > 0 else "int8"
         try_order = [
+            (settings.WHISPER_MODEL, "auto", quantized),
             (settings.WHISPER_MODEL, "auto", "float32"),
             # If the exact model fails, try stepping down once for stability
             ("medium", "auto", "float32"),
@@ -158,6 +197,198 @@ def _get_ct2_fallback_model():
     return _fallback_ct2_model
 
 
+class Segment(TypedDict):
+    """Transcribed segment as returned by ``transcribe_chunk``.
+
+    Kept as a plain dict: the pipeline shifts ``start``/``end`` in place by the
+    chunk offset and persists segments as JSON.
+    """
+
+    start: float
+    end: float
+    text: str
+    avg_logprob: Optional[float]
+    temperature: Optional[float]
+    token_count: int
+    confidence: Optional[float]
+    words: NotRequired[list[dict[str, Any]]]
+
+
+def _make_segment(start, end, text, avg_logprob, temperature, token_count, confidence) -> Segment:
+    return {
+        "start": start,
+        "end": end,
+        "text": text,
+        "avg_logprob": avg_logprob,
+        "temperature": temperature,
+        "token_count": token_count,
+        "confidence": confidence,
+    }
+
+
+def _format_ct2_segments(segments, word_timestamps) -> list[Segment]:
+    """Convert faster-whisper segments into the worker's segment dicts."""
+    out = []
+    for s in segments:
+        seg_dict = _make_segment(
+            s.start,
+            s.end,
+            s.text.strip(),
+            s.avg_logprob,
+            s.temperature,
+            len(s.tokens),
+            getattr(s, "no_speech_prob", None),
+        )
+        if word_timestamps and hasattr(s, "words"):
+            seg_dict["words"] = [
+                {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability} for w in s.words
+            ]
+        out.append(seg_dict)
+    return out
+
+
+def _ct2_lang_info(info):
+    return {
+        "language": getattr(info, "language", None),
+        "language_probability": getattr(info, "language_probability", None),
+    }
+
+
+def _sdp_context(fused: bool):
+    """Return a factory for the SDPA kernel-selection context, or None if unsupported.
+
+    openai-whisper's attention already calls ``F.scaled_dot_product_attention``; this only
+    decides which kernels it may dispatch to.
+    """
+    # Use new PyTorch API (torch.nn.attention.sdpa_kernel) with fallback for older versions
+    try:
+        from torch.nn.attention import SDPBackend, sdpa_kernel
+
+        if fused:
+            # MATH stays as a last resort for shapes/dtypes the fused kernels reject
+            backends = [SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION, SDPBackend.MATH]
+        else:
+            # Use MATH backend only (equivalent to enable_math=True, others=False)
+            backends = [SDPBackend.MATH]
+
+        def new_sdp_ctx():
+            return sdpa_kernel(backends)
+
+        return new_sdp_ctx
+    except ImportError:
+        # Fallback to deprecated API for older PyTorch versions
+        sdp_ctx_func = getattr(getattr(torch.backends, "cuda", object()), "sdp_kernel", None)
+        if callable(sdp_ctx_func):
+
+            def old_sdp_ctx():
+                return sdp_ctx_func(enable_flash=fused, enable_mem_efficient=fused, enable_math=True)
+
+            return old_sdp_ctx
+        return None
+
+
+def _transcribe_torch(model, wav_path, language, beam_size, temperature, word_timestamps, vad_filter):
+    """Transcribe with openai-whisper, falling back to CT2 on known ROCm faults."""
+    # openai-whisper returns dict with 'segments' list
+    fused = settings.WHISPER_TORCH_FUSED_ATTENTION
+    if not fused:
+        # On ROCm, some optimized attention kernels can cause faults on certain drivers/GPUs.
+        # Force fp32 and disable flash/mem-efficient attention so math kernels are used.
+        # Best-effort: use runtime toggles; also set env fallbacks for future imports.
+        os.environ.setdefault("PYTORCH_SDP_DISABLE_FLASH_ATTENTION", "1")
+        os.environ.setdefault("PYTORCH_SDP_DISABLE_MEM_EFFICIENT_ATTENTION", "1")
+        os.environ.setdefault("PYTORCH_SDP_DISABLE_FUSED_ATTENTION", "1")
+    sdp_ctx = _sdp_context(fused)
+
+    try:
+        transcribe_kwargs = {
+            "fp16": False,
+            "beam_size": beam_size,
+            "temperature": temperature,
+        }
+        if language:
+            transcribe_kwargs["language"] = language
+        if word_timestamps:
+            transcribe_kwargs["word_timestamps"] = True
+
+        if sdp_ctx:
+            with sdp_ctx():
+                result = model.transcribe(str(wav_path), **transcribe_kwargs)
+        else:
+            result = model.transcribe(str(wav_path), **transcribe_kwargs)
+
+        detected_language = result.get("language")
+
+    except Exception as e:
+        msg = str(e)
+        if _ROCM_FAULT_RE.search(msg):
+            logger.error("PyTorch whisper on ROCm crashed (%s). Falling back to CT2 HIP backend.", msg)
+            ct2 = _get_ct2_fallback_model()
+            ct2_kwargs = {"beam_size": beam_size}
+            if language:
+                ct2_kwargs["language"] = language
+            if word_timestamps:
+                ct2_kwargs["word_timestamps"] = True
+            segments, info = ct2.transcribe(str(wav_path), **ct2_kwargs)
+            return _format_ct2_segments(segments, word_timestamps), _ct2_lang_info(info)
+        else:
+            raise
+    out = []
+    for seg in result.get("segments", []):
+        seg_dict = _make_segment(
+            float(seg.get("start", 0)),
+            float(seg.get("end", 0)),
+            (seg.get("text") or "").strip(),
+            seg.get("avg_logprob"),
+            seg.get("temperature"),
+            len(seg.get("tokens") or []),
+            None,
+        )
+        if word_timestamps and "words" in seg:
+            seg_dict["words"] = seg["words"]
+        out.append(seg_dict)
+    lang_info = {"language": detected_language, "language_probability": None}
+    return out, lang_info
+
+
+def _transcribe_ct2(model, wav_path, language, beam_size, temperature, word_timestamps, vad_filter):
+    """Transcribe with faster-whisper (CTranslate2)."""
+    ct2_kwargs = {"beam_size": beam_size, "temperature": temperature}
+    if language:
+        ct2_kwargs["language"] = language
+    if word_timestamps:
+        ct2_kwargs["word_timestamps"] = True
+    if vad_filter:
+        ct2_kwargs["vad_filter"] = True
+
+    segments, info = model.transcribe(str(wav_path), **ct2_kwargs)
+    logger.debug("Transcribe info: %s", info)
+
+    return _format_ct2_segments(segments, word_timestamps), _ct2_lang_info(info)
+
+
+# WHISPER_BACKEND -> transcription function; any other value uses faster-whisper.
+_BACKENDS = {
+    "whisper": _transcribe_torch,
+    "faster-whisper": _transcribe_ct2,
+}
+
+
+def _resolve_options(language, beam_size, temperature, word_timestamps, vad_filter):
+    # Use settings defaults if not specified
+    if beam_size is None:
+        beam_size = getattr(settings, "WHISPER_BEAM_SIZE", 5)
+    if temperature is None:
+        temperature = getattr(settings, "WHISPER_TEMPERATURE", 0.0)
+    if word_timestamps is None:
+        word_timestamps = getattr(settings, "WHISPER_WORD_TIMESTAMPS", True)
+    if language is None:
+        language = getattr(settings, "WHISPER_LANGUAGE", None) or None
+    if vad_filter is None:
+        vad_filter = getattr(settings, "WHISPER_VAD_FILTER", False)
+    return language, beam_size, temperature, word_timestamps, vad_filter
+
+
 def transcribe_chunk(wav_path, language=None, beam_size=None, temperature=None, word_timestamps=None, vad_filter=None):
     """Transcribe audio chunk with Whisper.
 
@@ -174,17 +405,9 @@ def transcribe_chunk(wav_path, language=None, beam_size=None, temperature=None,
     """
     model = _get_model()
 
-    # Use settings defaults if not specified
-    if beam_size is None:
-        beam_size = getattr(settings, "WHISPER_BEAM_SIZE", 5)
-    if temperature is None:
-        temperature = getattr(settings, "WHISPER_TEMPERATURE", 0.0)
-    if word_timestamps is None:
-        word_timestamps = getattr(settings, "WHISPER_WORD_TIMESTAMPS", True)
-    if language is None:
-        language = getattr(settings, "WHISPER_LANGUAGE", None) or None
-    if vad_filter is None:
-        vad_filter = getattr(settings, "WHISPER_VAD_FILTER", False)
+    language, beam_size, temperature, word_timestamps, vad_filter = _resolve_options(
+        language, beam_size, temperature, word_timestamps, vad_filter
+    )
 
     logger.info(
         "Transcribing %s (lang=%s, beam=%d, temp=%.1f, word_ts=%s, vad=%s)",
@@ -196,147 +419,117 @@ def transcribe_chunk(wav_path, language=None, beam_size=None, temperature=None,
         vad_filter,
     )
 
-    detected_language = None
-    language_probability = None
+    backend = _BACKENDS.get(settings.WHISPER_BACKEND, _transcribe_ct2)
+    return backend(model, wav_path, language, beam_size, temperature, word_timestamps, vad_filter)
 
-    if settings.WHISPER_BACKEND == "whisper":
-        # openai-whisper returns dict with 'segments' list
-        # On ROCm, some optimized attention kernels can cause faults on certain drivers/GPUs.
-        # Force fp32 and disable flash/mem-efficient attention so math kernels are used.
-        # Best-effort: use runtime toggles; also set env fallbacks for future imports.
-        os.environ.setdefault("PYTORCH_SDP_DISABLE_FLASH_ATTENTION", "1")
-        os.environ.setdefault("PYTORCH_SDP_DISABLE_MEM_EFFICIENT_ATTENTION", "1")
-        os.environ.setdefault("PYTORCH_SDP_DISABLE_FUSED_ATTENTION", "1")
 
-        # Use new PyTorch API (torch.nn.attention.sdpa_kernel) with fallback for older versions
-        try:
-            from torch.nn.attention import SDPBackend, sdpa_kernel
+def _decode_audio(wav_path):
+    from faster_whisper import decode_audio
 
-            # Use MATH backend only (equivalent to enable_math=True, others=False)
-            def new_sdp_ctx():
-                return sdpa_kernel([SDPBackend.MATH])
+    return decode_audio(str(wav_path), sampling_rate=SAMPLE_RATE)
 
-            sdp_ctx = new_sdp_ctx
-        except ImportError:
-            # Fallback to deprecated API for older PyTorch versions
-            sdp_ctx_func = getattr(getattr(torch.backends, "cuda", object()), "sdp_kernel", None)
-            if callable(sdp_ctx_func):
 
-                def old_sdp_ctx():
-                    return sdp_ctx_func(enable_flash=False, enable_mem_efficient=False, enable_math=True)
+def _batched_pipeline(model):
+    from faster_whisper import BatchedInferencePipeline
 
-                sdp_ctx = old_sdp_ctx
-            else:
-                sdp_ctx = None
+    return BatchedInferencePipeline(model)
 
-        try:
-            transcribe_kwargs = {
-                "fp16": False,
-                "beam_size": beam_size,
-                "temperature": temperature,
-            }
-            if language:
-                transcribe_kwargs["language"] = language
-            if word_timestamps:
-                transcribe_kwargs["word_timestamps"] = True
 
-            if sdp_ctx:
-                with sdp_ctx():
-                    result = model.transcribe(str(wav_path), **transcribe_kwargs)
-            else:
-                result = model.transcribe(str(wav_path), **transcribe_kwargs)
+def _clip_timestamps(audio, offset, vad_filter):
+    """Regions (in seconds, shifted by ``offset``) of one chunk to feed the batched decoder."""
+    if vad_filter:
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
 
-            detected_language = result.get("language")
-
-        except Exception as e:
-            # Known ROCm fault signatures
-            msg = str(e)
-            if "Memory access fault" in msg or "hipError" in msg or "HSA_STATUS_ERROR" in msg:
-                logger.error("PyTorch whisper on ROCm crashed (%s). Falling back to CT2 HIP backend.", msg)
-                ct2 = _get_ct2_fallback_model()
-                ct2_kwargs = {"beam_size": beam_size}
-                if language:
-                    ct2_kwargs["language"] = language
-                if word_timestamps:
-                    ct2_kwargs["word_timestamps"] = True
-                segments, info = ct2.transcribe(str(wav_path), **ct2_kwargs)
-                detected_language = info.language if hasattr(info, "language") else None
-                language_probability = info.language_probability if hasattr(info, "language_probability") else None
-                out = []
-                for s in segments:
-                    seg_dict = {
-                        "start": s.start,
-                        "end": s.end,
-                        "text": s.text.strip(),
-                        "avg_logprob": s.avg_logprob,
-                        "temperature": s.temperature,
-                        "token_count": len(s.tokens),
-                        "confidence": getattr(s, "no_speech_prob", None),
-                    }
-                    if word_timestamps and hasattr(s, "words"):
-                        seg_dict["words"] = [
-                            {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
-                            for w in s.words
-                        ]
-                    out.append(seg_dict)
-                lang_info = {
-                    "language": detected_language,
-                    "language_probability": language_probability,
-                }
-                return out, lang_info
-            else:
-                raise
-        out = []
-        for seg in result.get("segments", []):
-            seg_dict = {
-                "start": float(seg.get("start", 0)),
-                "end": float(seg.get("end", 0)),
-                "text": (seg.get("text") or "").strip(),
-                "avg_logprob": seg.get("avg_logprob"),
-                "temperature": seg.get("temperature"),
-                "token_count": len(seg.get("tokens") or []),
-                "confidence": None,
-            }
-            if word_timestamps and "words" in seg:
-                seg_dict["words"] = seg["words"]
-            out.append(seg_dict)
-        lang_info = {"language": detected_language, "language_probability": None}
-        return out, lang_info
-    else:
-        # faster-whisper backend
-        ct2_kwargs = {"beam_size": beam_size, "temperature": temperature}
-        if language:
-            ct2_kwargs["language"] = language
-        if word_timestamps:
-            ct2_kwargs["word_timestamps"] = True
-        if vad_filter:
-            ct2_kwargs["vad_filter"] = True
-
-        segments, info = model.transcribe(str(wav_path), **ct2_kwargs)
-        logger.debug("Transcribe info: %s", info)
-
-        detected_language = info.language if hasattr(info, "language") else None
-        language_probability = info.language_probability if hasattr(info, "language_probability") else None
-
-        out = []
-        for s in segments:
-            seg_dict = {
-                "start": s.start,
-                "end": s.end,
-                "text": s.text.strip(),
-                "avg_logprob": s.avg_logprob,
-                "temperature": s.temperature,
-                "token_count": len(s.tokens),
-                "confidence": getattr(s, "no_speech_prob", None),
-            }
-            if word_timestamps and hasattr(s, "words"):
-                seg_dict["words"] = [
-                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability} for w in s.words
-                ]
-            out.append(seg_dict)
-
-        lang_info = {
-            "language": detected_language,
-            "language_probability": language_probability,
-        }
-        return out, lang_info
+        # Same VAD options BatchedInferencePipeline uses when it runs VAD itself
+        vad_options = VadOptions(max_speech_duration_s=WINDOW_SECONDS, min_silence_duration_ms=160)
+        return [
+            {"start": offset + ts["start"] / SAMPLE_RATE, "end": offset + ts["end"] / SAMPLE_RATE}
+            for ts in get_speech_timestamps(audio, vad_options)
+        ]
+    duration = audio.shape[0] / SAMPLE_RATE
+    clips = []
+    start = 0.0
+    while start < duration:
+        end = min(start + WINDOW_SECONDS, duration)
+        clips.append({"start": offset + start, "end": offset + end})
+        start = end
+    return clips
+
+
+def transcribe_chunks(
+    wav_paths, language=None, beam_size=None, temperature=None, word_timestamps=None, vad_filter=None, batch_size=None
+):
+    """Transcribe several audio chunks with one batched decoder pass.
+
+    faster-whisper only: the chunks are concatenated and split into 30s windows (or VAD
+    speech regions) that ``BatchedInferencePipeline`` decodes ``batch_size`` at a time, so
+    windows from different chunks share forward passes. Other backends fall back to
+    calling ``transcribe_chunk`` per path.
+
+    Args:
+        wav_paths: Paths to 16 kHz audio chunks
+        batch_size: Windows per forward pass (default: from settings or 8)
+        Remaining arguments as for ``transcribe_chunk``.
+
+    Returns:
+        List of (segments_list, language_info_dict) tuples, one per path, with segment
+        times relative to the start of each chunk.
+    """
+    wav_paths = list(wav_paths)
+    if settings.WHISPER_BACKEND == "whisper":
+        # openai-whisper has no batched decode API
+        return [transcribe_chunk(p, language, beam_size, temperature, word_timestamps, vad_filter) for p in wav_paths]
+    if not wav_paths:
+        return []
+
+    model = _get_model()
+    language, beam_size, temperature, word_timestamps, vad_filter = _resolve_options(
+        language, beam_size, temperature, word_timestamps, vad_filter
+    )
+    if batch_size is None:
+        batch_size = getattr(settings, "WHISPER_BATCH_SIZE", 8)
+
+    audios = [_decode_audio(p) for p in wav_paths]
+    offsets = []
+    durations = []
+    clips = []
+    position = 0.0
+    for audio in audios:
+        offsets.append(position)
+        durations.append(audio.shape[0] / SAMPLE_RATE)
+        clips.extend(_clip_timestamps(audio, position, vad_filter))
+        position += durations[-1]
+
+    empty_lang_info = {"language": language, "language_probability": None}
+    if not clips:
+        return [([], empty_lang_info) for _ in wav_paths]
+
+    logger.info(
+        "Batch transcribing %d chunks (lang=%s, beam=%d, windows=%d, batch_size=%d)",
+        len(wav_paths),
+        language or "auto",
+        beam_size,
+        len(clips),
+        batch_size,
+    )
+
+    ct2_kwargs = {"beam_size": beam_size, "temperature": temperature, "batch_size": batch_size}
+    if language:
+        ct2_kwargs["language"] = language
+    if word_timestamps:
+        ct2_kwargs["word_timestamps"] = True
+
+    segments, info = _batched_pipeline(model).transcribe(np.concatenate(audios), clip_timestamps=clips, **ct2_kwargs)
+    lang_info = _ct2_lang_info(info)
+
+    results = [[] for _ in wav_paths]
+    for seg in _format_ct2_segments(segments, word_timestamps):
+        idx = max(bisect.bisect_right(offsets, seg["start"]) - 1, 0)
+        offset = offsets[idx]
+        seg["start"] -= offset
+        seg["end"] = min(seg["end"] - offset, durations[idx])
+        for w in seg.get("words", ()):
+            w["start"] -= offset
+            w["end"] -= offset
+        results[idx].append(seg)
+    return [(segs, lang_info) for segs in results]
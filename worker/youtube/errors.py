@@ -25,7 +25,12 @@ class YouTubeError:
 
 
 def classify_youtube_error(stderr: str = "", *, returncode: int | None = None) -> YouTubeError:
-    text = (stderr or "").lower()
+    kind = classify_youtube_error_kind((stderr or "").lower())
+    return YouTubeError(kind=kind, message=stderr or kind.value, returncode=returncode, stderr=stderr or "")
+
+
+def classify_youtube_error_kind(text: str) -> YouTubeErrorKind:
+    """Classify already-lowercased stderr, for callers that need the lowercased text themselves."""
     if (
         "429" in text
         or "too many requests" in text
@@ -35,10 +40,10 @@ def classify_youtube_error(stderr: str = "", *, returncode: int | None = None) -
         or ("up to an hour" in text and "youtube" in text)
         or "throttl" in text
     ):
-        kind = YouTubeErrorKind.THROTTLE
-    elif "po_token" in text or "po token" in text or "gvs po" in text:
-        kind = YouTubeErrorKind.TOKEN
-    elif (
+        return YouTubeErrorKind.THROTTLE
+    if "po_token" in text or "po token" in text or "gvs po" in text:
+        return YouTubeErrorKind.TOKEN
+    if (
         "403" in text
         or "forbidden" in text
         or "sign in" in text
@@ -48,13 +53,17 @@ def classify_youtube_error(stderr: str = "", *, returncode: int | None = None) -
             and ("expired" in text or "invalid" in text or "rotated" in text or "authentication" in text)
         )
     ):
-        kind = YouTubeErrorKind.AUTH
-    elif "404" in text or "not found" in text or "unavailable" in text or "private" in text:
-        kind = YouTubeErrorKind.NOT_FOUND
-    elif "timeout" in text or "timed out" in text:
-        kind = YouTubeErrorKind.TIMEOUT
-    elif "network" in text or "connection" in text:
-        kind = YouTubeErrorKind.NETWORK
-    else:
-        kind = YouTubeErrorKind.UNKNOWN
-    return YouTubeError(kind=kind, message=stderr or kind.value, returncode=returncode, stderr=stderr or "")
+        return YouTubeErrorKind.AUTH
+    if (
+        "404" in text
+        or "not found" in text
+        or "unavailable" in text
+        or "private" in text
+        or "available in your country" in text  # geo-blocked; no client or retry gets past it
+    ):
+        return YouTubeErrorKind.NOT_FOUND
+    if "timeout" in text or "timed out" in text:
+        return YouTubeErrorKind.TIMEOUT
+    if "network" in text or "connection" in text:
+        return YouTubeErrorKind.NETWORK
+    return YouTubeErrorKind.UNKNOWN
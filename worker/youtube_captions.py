@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import gzip
 import json
 import logging
+import re
 import shlex
 import subprocess
 import tempfile
 import time
-from dataclasses import dataclass
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+import numpy as np
+
 from app.logging_config import get_logger
 from app.settings import settings
+from worker import caption_cache
 from worker.po_token_manager import TokenType, get_token_manager
 from worker.token_utils import redact_tokens_from_command
 from worker.youtube.errors import YouTubeErrorKind, classify_youtube_error
@@ -50,15 +57,82 @@ except ImportError:
     ytdlp_operation_errors_total = _DummyMetric()
     ytdlp_token_usage_total = _DummyMetric()
 
+# orjson parses bytes directly and is several times faster on large json3 payloads
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# HH:MM:SS.mmm or MM:SS.mmm ("," also accepted as decimal separator); cue settings may follow the end time
+# (only the first three fractional digits are captured, so they convert straight to milliseconds)
+_VTT_TS = rb"(?:(\d+):)?(\d+):(\d+)(?:[.,](\d{1,3})\d*)?"
+_VTT_TIMING_RE = re.compile(rb"\s*" + _VTT_TS + rb"\s*-->\s*" + _VTT_TS + rb"(?:\s.*)?")
+
+# Parsed caption columns: start_ms, end_ms (int64 'q' arrays) and text
+_Columns = Tuple[array, array, List[str]]
+
+# Caption track preference: extension first (json3, then vtt), then English variants
+_CAPTION_EXT_RANK = {"json3": 0, "vtt": 1}
+_CAPTION_LANG_RANK = {"en": 0, "en-US": 1, "en-GB": 2}
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class YTSegment:
-    start: float
-    end: float
+    start_ms: int
+    end_ms: int
     text: str
 
+    @property
+    def start(self) -> float:
+        return self.start_ms / 1000.0
+
+    @property
+    def end(self) -> float:
+        return self.end_ms / 1000.0
+
+
+@dataclass(slots=True)
+class SegmentTable:
+    """Caption segments stored column-wise: int64 start/end millisecond arrays plus a text list.
+
+    Timing-only consumers (offset shifts, overlap checks) can work on the numpy columns directly;
+    iterating or indexing still yields YTSegment rows for code written against List[YTSegment].
+    """
+
+    start_ms: np.ndarray
+    end_ms: np.ndarray
+    text: List[str]
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[YTSegment]) -> SegmentTable:
+        rows = [(s.start_ms, s.end_ms, s.text) for s in segments]
+        return cls(
+            start_ms=np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+            end_ms=np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows)),
+            text=[r[2] for r in rows],
+        )
+
+    @classmethod
+    def from_columns(cls, start_ms: array, end_ms: array, text: List[str]) -> SegmentTable:
+        """Wrap int64 ('q') arrays as numpy columns without copying."""
+        return cls(
+            start_ms=np.frombuffer(start_ms, dtype=np.int64),
+            end_ms=np.frombuffer(end_ms, dtype=np.int64),
+            text=text,
+        )
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __getitem__(self, i: int) -> YTSegment:
+        return YTSegment(int(self.start_ms[i]), int(self.end_ms[i]), self.text[i])
 
-@dataclass
+    def __iter__(self) -> Iterator[YTSegment]:
+        for start_ms, end_ms, text in zip(self.start_ms.tolist(), self.end_ms.tolist(), self.text, strict=True):
+            yield YTSegment(start_ms, end_ms, text)
+
+
+@dataclass(slots=True, frozen=True)
 class YTCaptionTrack:
     url: str
     language: Optional[str]
@@ -337,40 +411,30 @@ def _pick_auto_caption(data: dict) -> Optional[YTCaptionTrack]:
     """Select an auto-generated caption track if available.
 
     yt-dlp JSON typically contains `automatic_captions` keyed by language code.
-    We prefer English variants first, otherwise pick the first available.
+    We prefer json3 over vtt, then English variants, otherwise the first available.
     """
     auto = data.get("automatic_captions") or {}
     if not auto:
         return None
-    # Preferred order of language keys
-    prefs = ["en", "en-US", "en-GB"]
-    # Prefer json3, then vtt
-    prefer_ext_order = ["json3", "vtt"]
     candidates: List[Tuple[str, str, str]] = []  # (lang, url, ext)
     saw_caption_track = False
     for lang, tracks in auto.items():
         for t in tracks:
-            if t.get("url"):
-                saw_caption_track = True
+            url = t.get("url")
+            if not url:
+                continue
+            saw_caption_track = True
             ext = t.get("ext")
-            if ext in ("json3", "vtt") and t.get("url"):
-                candidates.append((lang, t.get("url"), ext))
+            if ext in _CAPTION_EXT_RANK:
+                candidates.append((lang, url, ext))
     if not candidates:
         if saw_caption_track:
             raise YouTubeCaptionFetchError("Caption tracks found, but none use supported json3/vtt formats")
         return None
-    # choose preferred language and preferred ext
-    for ext in prefer_ext_order:
-        for p in prefs:
-            for lang, u, e in candidates:
-                if lang == p and e == ext:
-                    return YTCaptionTrack(url=u, language=lang, kind="auto", ext=e)
-        # fallback to any language for this ext
-        for lang, u, e in candidates:
-            if e == ext:
-                return YTCaptionTrack(url=u, language=lang, kind="auto", ext=e)
-    # else pick first
-    lang, u, e = candidates[0]
+    # min() keeps the first of equally ranked candidates, i.e. yt-dlp's own ordering
+    lang, u, e = min(
+        candidates, key=lambda c: (_CAPTION_EXT_RANK[c[2]], _CAPTION_LANG_RANK.get(c[0], len(_CAPTION_LANG_RANK)))
+    )
     return YTCaptionTrack(url=u, language=lang, kind="auto", ext=e)
 
 
@@ -454,76 +518,102 @@ def _download_caption_with_ytdlp(url: str, youtube_id: str, track: YTCaptionTrac
         return payload
 
 
-def _parse_vtt_to_segments(vtt_bytes: bytes) -> List[YTSegment]:
-    def parse_ts(ts: str) -> float:
-        # HH:MM:SS.mmm or MM:SS.mmm
-        ts = ts.strip()
-        parts = ts.split(":")
-        if len(parts) == 3:
-            h, m, s = parts
-            sec, ms = (s.replace(",", ".").split(".") + ["0"])[:2]
-            return int(h) * 3600 + int(m) * 60 + int(sec) + int(ms[:3]) / 1000.0
-        elif len(parts) == 2:
-            m, s = parts
-            sec, ms = (s.replace(",", ".").split(".") + ["0"])[:2]
-            return int(m) * 60 + int(sec) + int(ms[:3]) / 1000.0
-        return 0.0
-
-    text = vtt_bytes.decode(errors="ignore").splitlines()
-    segs: List[YTSegment] = []
-    i = 0
-    # Skip WEBVTT header if present
-    if i < len(text) and text[i].strip().upper().startswith("WEBVTT"):
-        i += 1
-    # Skip optional header metadata lines until blank
-    while i < len(text) and text[i].strip() != "":
-        i += 1
-    # Consume blank
-    while i < len(text) and text[i].strip() == "":
-        i += 1
-    while i < len(text):
-        # Optional cue id
-        if i < len(text) and text[i].strip() and "-->" not in text[i]:
-            i += 1
-        if i >= len(text):
-            break
-        if "-->" not in text[i]:
-            i += 1
+def _json3_columns(payload: bytes) -> _Columns:
+    try:
+        events = (_json_loads(payload) or {}).get("events") or []
+    except Exception as e:
+        logging.warning("Invalid json3 payload: %s", e)
+        raise YouTubeCaptionFetchError(f"Invalid json3 caption payload: {e}") from e
+    # json3 structure has 'events' with 'tStartMs' and 'dDurationMs'; text in 'segs'
+    starts, ends, texts = array("q"), array("q"), []
+    for ev in events:
+        start_ms = ev.get("tStartMs")
+        segs = ev.get("segs")
+        if start_ms is None or not segs:
             continue
-        timing = text[i].strip()
-        i += 1
-        try:
-            left, right = timing.split("-->")
-            start = parse_ts(left)
-            end = parse_ts(right)
-        except Exception:
-            # Malformed timing line, skip block
-            while i < len(text) and text[i].strip() != "":
-                i += 1
-            while i < len(text) and text[i].strip() == "":
-                i += 1
+        text_joined = "".join([s["utf8"] for s in segs if s.get("utf8")]).strip()
+        if not text_joined:
             continue
-        lines = []
-        while i < len(text) and text[i].strip() != "":
-            lines.append(text[i].strip())
-            i += 1
-        # consume blank
-        while i < len(text) and text[i].strip() == "":
-            i += 1
-        cue = " ".join(lines).strip()
-        if cue:
-            segs.append(YTSegment(start=start, end=end, text=cue))
-    return segs
-
-
-def _fetch_youtube_auto_captions_impl(youtube_id: str) -> Optional[tuple[YTCaptionTrack, List[YTSegment]]]:
-    """Fetch auto captions (json3) for a given YouTube video id and parse to segments.
+        starts.append(start_ms)
+        ends.append(start_ms + (ev.get("dDurationMs") or 0))
+        texts.append(text_joined)
+    return starts, ends, texts
+
+
+def _parse_json3_to_segments(payload: bytes) -> List[YTSegment]:
+    return list(map(YTSegment, *_json3_columns(payload)))
+
+
+def _vtt_columns(vtt_bytes: bytes) -> _Columns:
+    # Single pass over the raw byte lines with three states: looking for a timing line, collecting cue
+    # text, or skipping the rest of a block (header metadata or a malformed timing line). Only the
+    # joined text of each cue is decoded.
+    seek, cue, skip = 0, 1, 2
+    lines = vtt_bytes.splitlines()
+    state = skip if lines and lines[0].strip().upper().startswith(b"WEBVTT") else seek
+    starts, ends, texts = array("q"), array("q"), []
+    start_ms = end_ms = 0
+    cue_lines: List[bytes] = []
+    for line in lines:
+        stripped = line.strip()
+        if state == cue:
+            if stripped:
+                cue_lines.append(stripped)
+                continue
+            text = b" ".join(cue_lines).decode("utf-8", "ignore").strip()
+            if text:
+                starts.append(start_ms)
+                ends.append(end_ms)
+                texts.append(text)
+            state = seek
+        elif state == skip:
+            if not stripped:
+                state = seek
+        elif b"-->" in line:
+            match = _VTT_TIMING_RE.fullmatch(line)
+            if match is None:
+                state = skip
+                continue
+            h1, m1, s1, f1, h2, m2, s2, f2 = match.groups()
+            start_ms = (int(m1) * 60 + int(s1)) * 1000 + (int(f1) if f1 else 0)
+            end_ms = (int(m2) * 60 + int(s2)) * 1000 + (int(f2) if f2 else 0)
+            if h1:
+                start_ms += int(h1) * 3_600_000
+            if h2:
+                end_ms += int(h2) * 3_600_000
+            cue_lines = []
+            state = cue
+        # any other line while seeking is a cue identifier or stray text
+    if state == cue:
+        text = b" ".join(cue_lines).decode("utf-8", "ignore").strip()
+        if text:
+            starts.append(start_ms)
+            ends.append(end_ms)
+            texts.append(text)
+    return starts, ends, texts
 
-    Returns (track, segments) or None if unavailable.
-    """
+
+def _parse_vtt_to_segments(vtt_bytes: bytes) -> List[YTSegment]:
+    return list(map(YTSegment, *_vtt_columns(vtt_bytes)))
+
+
+def _http_get(url: str) -> bytes:
+    """Download a caption URL via stdlib (no extra deps); caption text compresses well, so ask for gzip."""
+    req = Request(url, headers={"User-Agent": "Mozilla/5.0", "Accept-Encoding": "gzip"})
+    with urlopen(req, timeout=20) as resp:
+        payload = resp.read()
+        if resp.headers.get("Content-Encoding") == "gzip":
+            payload = gzip.decompress(payload)
+    return payload
+
+
+def _fetch_caption_payload(
+    youtube_id: str, http_get: Callable[[str], bytes], meta: Callable[[str], Dict[str, Any]]
+) -> Optional[tuple[YTCaptionTrack, bytes]]:
+    """Pick an auto caption track from video metadata and download its raw payload."""
     url = f"https://www.youtube.com/watch?v={youtube_id}"
     logger.info("Probing yt-dlp metadata for captions", extra={"youtube_id": youtube_id, "url": url})
-    data = _yt_dlp_json(url)
+    data = meta(url)
     track = _pick_auto_caption(data)
     if not track:
         logger.info("No auto captions found", extra={"youtube_id": youtube_id})
@@ -537,12 +627,9 @@ def _fetch_youtube_auto_captions_impl(youtube_id: str) -> Optional[tuple[YTCapti
             "ext": track.ext,
         },
     )
-    # Download via stdlib (no extra deps)
     start_time = time.time()
     try:
-        req = Request(track.url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=20) as resp:
-            payload = resp.read()
+        payload = http_get(track.url)
         duration = time.time() - start_time
 
         logger.info(
@@ -599,44 +686,83 @@ def _fetch_youtube_auto_captions_impl(youtube_id: str) -> Optional[tuple[YTCapti
             ytdlp_operation_attempts_total.labels(operation="captions", client="yt-dlp", result="success").inc()
         else:
             raise YouTubeCaptionFetchError(f"Caption download failed: {e}") from e
+    return track, payload
+
+
+def _fetch_youtube_auto_captions_impl(
+    youtube_id: str,
+    raw: bool = False,
+    http_get: Optional[Callable[[str], bytes]] = None,
+    meta: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> Optional[tuple[YTCaptionTrack, List[YTSegment] | SegmentTable]]:
+    """Fetch auto captions (json3) for a given YouTube video id and parse to segments.
+
+    Returns (track, segments) or None if unavailable. With raw=True the segments come back as a
+    SegmentTable built straight from the parsed columns, without a YTSegment per cue.
+    """
+    cached = caption_cache.get(youtube_id)
+    if cached is not None:
+        track_fields, payload = cached
+        track = YTCaptionTrack(**track_fields)
+        logger.info(
+            "Using cached captions",
+            extra={"operation": "captions", "youtube_id": youtube_id, "language": track.language, "ext": track.ext},
+        )
+    else:
+        fetched = _fetch_caption_payload(youtube_id, http_get or _http_get, meta or _yt_dlp_json)
+        if fetched is None:
+            return None
+        track, payload = fetched
 
-    segments: List[YTSegment] = []
     if track.ext == "json3":
-        try:
-            j = json.loads(payload)
-        except Exception as e:
-            logging.warning("Invalid json3 payload: %s", e)
-            raise YouTubeCaptionFetchError(f"Invalid json3 caption payload: {e}") from e
-        # json3 structure has 'events' with 'tStartMs' and 'dDurationMs'; text in 'segs'
-        for ev in j.get("events", []) or []:
-            start_ms = ev.get("tStartMs")
-            dur_ms = ev.get("dDurationMs") or 0
-            segs = ev.get("segs") or []
-            if start_ms is None or not segs:
-                continue
-            text_parts = []
-            for s in segs:
-                t = s.get("utf8")
-                if not t:
-                    continue
-                text_parts.append(t)
-            text_joined = ("".join(text_parts)).strip()
-            if not text_joined:
-                continue
-            start = float(start_ms) / 1000.0
-            end = start + (float(dur_ms) / 1000.0 if dur_ms else 0.0)
-            segments.append(YTSegment(start=start, end=end, text=text_joined))
+        columns = _json3_columns(payload)
     elif track.ext == "vtt":
         try:
-            segments = _parse_vtt_to_segments(payload)
+            columns = _vtt_columns(payload)
         except Exception as e:
             logging.warning("Failed to parse VTT: %s", e)
             raise YouTubeCaptionFetchError(f"Failed to parse VTT captions: {e}") from e
     else:
         logging.info("Unsupported caption ext: %s", track.ext)
         raise YouTubeCaptionFetchError(f"Unsupported caption ext: {track.ext}")
-    return track, segments
+    if cached is None:
+        # Only cache payloads that parsed, so a corrupt download is retried rather than replayed
+        caption_cache.put(youtube_id, asdict(track), payload)
+    if raw:
+        return track, SegmentTable.from_columns(*columns)
+    return track, list(map(YTSegment, *columns))
+
+
+def fetch_youtube_auto_captions(
+    youtube_id: str,
+    *,
+    raw: bool = False,
+    http_get: Optional[Callable[[str], bytes]] = None,
+    meta: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> Optional[tuple[YTCaptionTrack, List[YTSegment] | SegmentTable]]:
+    """Fetch and parse auto captions for a video.
+
+    http_get (caption URL -> payload bytes) and meta (watch URL -> yt-dlp metadata dict) default to
+    the stdlib downloader and _yt_dlp_json; callers may inject their own, e.g. a pooled HTTP client.
+    """
+    return _fetch_youtube_auto_captions_impl(youtube_id, raw=raw, http_get=http_get, meta=meta)
+
 
+def fetch_youtube_auto_captions_many(
+    youtube_ids: Iterable[str], max_workers: int = 4
+) -> Dict[str, Optional[tuple[YTCaptionTrack, List[YTSegment]]] | Exception]:
+    """Fetch auto captions for several videos concurrently.
+
+    Each video is fetched independently on a bounded thread pool, so one failure does not affect
+    the others: the result maps every youtube_id to either its fetch result or the exception it raised.
+    """
+
+    def safe_fetch(youtube_id: str):
+        try:
+            return fetch_youtube_auto_captions(youtube_id)
+        except Exception as e:
+            return e
 
-def fetch_youtube_auto_captions(youtube_id: str) -> Optional[tuple[YTCaptionTrack, List[YTSegment]]]:
-    return _fetch_youtube_auto_captions_impl(youtube_id)
+    ids = list(dict.fromkeys(youtube_ids))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="captions") as pool:
+        return dict(zip(ids, pool.map(safe_fetch, ids), strict=True))
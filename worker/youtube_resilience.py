@@ -11,12 +11,14 @@ import random
 import time
 from dataclasses import dataclass
 from enum import Enum
-from threading import Lock
+from threading import Event, Lock
 from typing import Callable, Optional, TypeVar
 
+import numpy as np
+
 from app.logging_config import get_logger
 from app.settings import settings
-from worker.youtube.errors import YouTubeErrorKind, classify_youtube_error
+from worker.youtube.errors import YouTubeErrorKind, classify_youtube_error_kind
 
 logger = get_logger(__name__)
 
@@ -64,9 +66,9 @@ def classify_error(returncode: int, stderr: str = "", exception: Optional[Except
     Returns:
         ErrorClass enum value
     """
+    # Lowercase once and share the copy with the normalizer; yt-dlp stderr can run to megabytes.
     stderr_lower = stderr.lower() if stderr else ""
-    normalized = classify_youtube_error(stderr, returncode=returncode)
-    mapped = error_class_from_youtube_kind(normalized.kind)
+    mapped = error_class_from_youtube_kind(classify_youtube_error_kind(stderr_lower))
     if mapped != ErrorClass.UNKNOWN:
         return mapped
 
@@ -82,50 +84,13 @@ def classify_error(returncode: int, stderr: str = "", exception: Optional[Except
         if "connection" in exc_name or "network" in exc_name:
             return ErrorClass.NETWORK
 
-    # Token-related errors
-    if "po_token" in stderr_lower and ("invalid" in stderr_lower or "expired" in stderr_lower):
-        return ErrorClass.TOKEN
+    # The normalizer already checked throttle, PO token, 403/sign-in, cookie, not-found,
+    # timeout and network markers; only the looser markers it doesn't know are left.
     if "token" in stderr_lower and ("expired" in stderr_lower or "invalid" in stderr_lower):
         return ErrorClass.TOKEN
-
-    # Throttling errors
-    if "429" in stderr_lower or "too many requests" in stderr_lower:
-        return ErrorClass.THROTTLE
-    if "throttl" in stderr_lower:
-        return ErrorClass.THROTTLE
-    if "rate-limited" in stderr_lower or "rate limited" in stderr_lower:
-        return ErrorClass.THROTTLE
-    if "current session has been rate" in stderr_lower:
-        return ErrorClass.THROTTLE
-    if "up to an hour" in stderr_lower and "youtube" in stderr_lower:
-        return ErrorClass.THROTTLE
-
-    # Authentication / authorization errors
-    if "403" in stderr_lower or "forbidden" in stderr_lower:
-        return ErrorClass.AUTH
-    if "sign in" in stderr_lower or "bot" in stderr_lower:
-        return ErrorClass.AUTH
-    if "cookies" in stderr_lower and (
-        "expired" in stderr_lower
-        or "invalid" in stderr_lower
-        or "rotated" in stderr_lower
-        or "no longer" in stderr_lower
-        or "authentication" in stderr_lower
-    ):
+    if "bot" in stderr_lower or ("cookies" in stderr_lower and "no longer" in stderr_lower):
         return ErrorClass.AUTH
 
-    # Not found / unavailable
-    if "404" in stderr_lower or "not found" in stderr_lower:
-        return ErrorClass.NOT_FOUND
-    if "unavailable" in stderr_lower or "private" in stderr_lower:
-        return ErrorClass.NOT_FOUND
-
-    # Network errors
-    if "network" in stderr_lower or "connection" in stderr_lower:
-        return ErrorClass.NETWORK
-    if "timeout" in stderr_lower or "timed out" in stderr_lower:
-        return ErrorClass.TIMEOUT
-
     return ErrorClass.UNKNOWN
 
 
@@ -179,6 +144,21 @@ def exponential_backoff(
     return delay
 
 
+def exponential_backoff_vec(attempts, base_delay: float = 1.0, max_delay: float = 60.0) -> np.ndarray:
+    """Vectorized, jitter-free exponential_backoff for planning many retries at once.
+
+    Args:
+        attempts: Array-like of retry attempt numbers (0-indexed)
+        base_delay: Initial delay in seconds
+        max_delay: Maximum delay cap in seconds
+
+    Returns:
+        Float array of delays in seconds, same shape as attempts
+    """
+    # exp2 stays in floating point, so large attempt numbers saturate at max_delay instead of overflowing
+    return np.minimum(base_delay * np.exp2(np.asarray(attempts, dtype=np.float64)), max_delay)
+
+
 @dataclass
 class CircuitBreakerStats:
     """Statistics for circuit breaker state."""
@@ -227,6 +207,10 @@ class CircuitBreaker:
 
         self._state = CircuitBreakerState.CLOSED
         self._stats = CircuitBreakerStats(state_changed_at=time.time())
+        # Cooldown is measured on the monotonic clock so wall-clock adjustments can't stall or skip it
+        self._state_changed_monotonic = time.monotonic()
+        # Set while a half-open probe is running; other callers are rejected until it finishes
+        self._half_open_probe = False
         self._lock = Lock()
 
         logger.info(
@@ -282,25 +266,31 @@ class CircuitBreaker:
         Raises:
             Exception: If circuit is open or function fails
         """
-        with self._lock:
-            current_state = self._state
-
-            # Check if circuit is open
-            if current_state == CircuitBreakerState.OPEN:
-                time_since_open = time.time() - self._stats.state_changed_at
-                if time_since_open >= self.cooldown_seconds:
-                    # Transition to half-open
-                    self._transition_to(CircuitBreakerState.HALF_OPEN)
-                    logger.info(
-                        f"Circuit breaker '{self.name}' entering half-open state",
-                        extra={"cooldown_elapsed": round(time_since_open, 2)},
-                    )
-                else:
-                    # Circuit still open
-                    raise RuntimeError(
-                        f"Circuit breaker '{self.name}' is open. "
-                        f"Cooldown remaining: {self.cooldown_seconds - time_since_open:.1f}s"
-                    )
+        # Only open/half-open circuits need the lock; closed calls go straight through.
+        # The unlocked read is a single attribute load and is re-checked under the lock.
+        probing = False
+        if self._state is not CircuitBreakerState.CLOSED:
+            with self._lock:
+                if self._state is CircuitBreakerState.OPEN:
+                    time_since_open = time.monotonic() - self._state_changed_monotonic
+                    if time_since_open >= self.cooldown_seconds:
+                        # Transition to half-open
+                        self._transition_to(CircuitBreakerState.HALF_OPEN)
+                        logger.info(
+                            f"Circuit breaker '{self.name}' entering half-open state",
+                            extra={"cooldown_elapsed": round(time_since_open, 2)},
+                        )
+                    else:
+                        # Circuit still open
+                        raise RuntimeError(
+                            f"Circuit breaker '{self.name}' is open. "
+                            f"Cooldown remaining: {self.cooldown_seconds - time_since_open:.1f}s"
+                        )
+                if self._state is CircuitBreakerState.HALF_OPEN:
+                    # Let one probe through at a time so a recovering service isn't hit by every waiter
+                    if self._half_open_probe:
+                        raise RuntimeError(f"Circuit breaker '{self.name}' is half-open with a probe in flight")
+                    self._half_open_probe = probing = True
 
         # Execute function
         try:
@@ -315,6 +305,10 @@ class CircuitBreaker:
             err_class = error_class or classify_error(getattr(e, "returncode", 0), stderr, e)
             self._record_failure(err_class)
             raise
+        finally:
+            if probing:
+                with self._lock:
+                    self._half_open_probe = False
 
     def _record_success(self):
         """Record successful operation."""
@@ -376,6 +370,7 @@ class CircuitBreaker:
         old_state = self._state
         self._state = new_state
         self._stats.state_changed_at = time.time()
+        self._state_changed_monotonic = time.monotonic()
 
         # Reset counters on state transition
         if new_state == CircuitBreakerState.CLOSED:
@@ -408,6 +403,8 @@ class CircuitBreaker:
         with self._lock:
             self._state = CircuitBreakerState.CLOSED
             self._stats = CircuitBreakerStats(state_changed_at=time.time())
+            self._state_changed_monotonic = time.monotonic()
+            self._half_open_probe = False
             logger.info(f"Circuit breaker '{self.name}' manually reset")
 
 
@@ -444,6 +441,7 @@ def retry_with_backoff(
     timeout_per_attempt: Optional[float] = None,
     circuit_breaker: Optional[CircuitBreaker] = None,
     classify_func: Optional[Callable[[Exception], ErrorClass]] = None,
+    cancel_event: Optional[Event] = None,
 ) -> T:
     """Retry function with exponential backoff and optional circuit breaker.
 
@@ -455,12 +453,13 @@ def retry_with_backoff(
         timeout_per_attempt: Optional timeout for each attempt
         circuit_breaker: Optional circuit breaker to use
         classify_func: Optional function to classify exceptions
+        cancel_event: Optional event that, once set, cuts a backoff short and stops retrying
 
     Returns:
         Function result
 
     Raises:
-        Last exception if all attempts fail
+        Last exception if all attempts fail or retrying is cancelled
     """
     last_exception: Optional[Exception] = None
     last_error_class: ErrorClass
@@ -511,7 +510,11 @@ def retry_with_backoff(
                         "next_attempt": attempt + 2,
                     },
                 )
-                time.sleep(delay)
+                if cancel_event is None:
+                    cancel_event = Event()
+                if cancel_event.wait(delay):
+                    logger.info("Retry cancelled during backoff", extra={"attempt": attempt + 1})
+                    raise
             else:
                 logger.error(
                     "All retry attempts exhausted",